@@ -0,0 +1,162 @@
+# allDifferent.py
+
+from constraint import Constraint
+
+
+def alldifferent_supports(domains):
+    """
+    Values of each variable that belong to some assignment giving every variable a different value.
+
+    A maximum matching between variables and values is found first; the puzzle fails if it does not
+    cover every variable. With matched edges pointing from variable to value and the other edges from
+    value to variable, an edge is kept if it is matched, if both ends are in the same strongly connected
+    component (an even alternating cycle), or if a free value reaches it (an even alternating path).
+    All other values are ruled out; these are exactly the values a Hall set (k variables sharing only k
+    values) or a Hall interval takes away from the variables outside it.
+
+    :param domains: Dictionary variable -> values still possible.
+    :return: Dictionary variable -> set of supported values, or None if no such assignment exists.
+    """
+    variables = list(domains)
+    doms = [list(domains[var]) for var in variables]
+    num_vars = len(variables)
+    value_ids = {}
+    for dom in doms:
+        for value in dom:
+            value_ids.setdefault(value, num_vars + len(value_ids))
+    match_var = [None] * num_vars
+    match_value = {}
+
+    def augment(x, seen):
+        for value in doms[x]:
+            if value not in seen:
+                seen.add(value)
+                if value not in match_value or augment(match_value[value], seen):
+                    match_value[value] = x
+                    match_var[x] = value
+                    return True
+        return False
+
+    for x in range(num_vars):
+        if not augment(x, set()):
+            return None
+
+    # Matched edges variable -> value, the others value -> variable
+    edges = [[] for _ in range(num_vars + len(value_ids))]
+    for x, dom in enumerate(doms):
+        for value in dom:
+            if match_var[x] == value:
+                edges[x].append(value_ids[value])
+            else:
+                edges[value_ids[value]].append(x)
+    reached = [False] * len(edges)
+    stack = [value_ids[value] for value in value_ids if value not in match_value]
+    for node in stack:
+        reached[node] = True
+    while stack:
+        for following in edges[stack.pop()]:
+            if not reached[following]:
+                reached[following] = True
+                stack.append(following)
+    component = _strong_components(edges)
+    supports = {}
+    for x, dom in enumerate(doms):
+        supports[variables[x]] = {value for value in dom if match_var[x] == value or reached[value_ids[value]]
+                                  or component[x] == component[value_ids[value]]}
+    return supports
+
+
+def _strong_components(edges):
+    """ Strongly connected component number of every node (Tarjan's algorithm, without recursion). """
+    count = len(edges)
+    index = [None] * count
+    low = [0] * count
+    component = [-1] * count
+    on_stack = [False] * count
+    stack = []
+    counter = components = 0
+    for root in range(count):
+        if index[root] is not None:
+            continue
+        index[root] = low[root] = counter
+        counter += 1
+        stack.append(root)
+        on_stack[root] = True
+        work = [(root, 0)]
+        while work:
+            node, i = work[-1]
+            if i < len(edges[node]):
+                work[-1] = (node, i + 1)
+                following = edges[node][i]
+                if index[following] is None:
+                    index[following] = low[following] = counter
+                    counter += 1
+                    stack.append(following)
+                    on_stack[following] = True
+                    work.append((following, 0))
+                elif on_stack[following]:
+                    low[node] = min(low[node], index[following])
+                continue
+            work.pop()
+            if work:
+                parent = work[-1][0]
+                low[parent] = min(low[parent], low[node])
+            if low[node] == index[node]:
+                while True:
+                    member = stack.pop()
+                    on_stack[member] = False
+                    component[member] = components
+                    if member == node:
+                        break
+                components += 1
+    return component
+
+
+class GACAllDifferentConstraint(Constraint):
+    """
+    python-constraint AllDifferent constraint that keeps generalized arc consistency.
+
+    AllDifferentConstraint only removes the values already assigned from the other variables; this
+    one removes every value that cannot be part of any assignment of distinct values (see
+    alldifferent_supports), so Hall sets are detected before the search has to stumble into them.
+    It is a drop-in replacement, used the same way with problem.addConstraint.
+    """
+
+    def preProcess(self, variables, domains, constraints, vconstraints):
+        Constraint.preProcess(self, variables, domains, constraints, vconstraints)
+        # Problem resets the domains only after preprocessing; values an earlier search left hidden must count here
+        for var in variables:
+            domains[var].resetState()
+        supports = alldifferent_supports({var: domains[var] for var in variables})
+        for var in variables:
+            domain = domains[var]
+            for value in domain[:]:
+                if supports is None or value not in supports[var]:
+                    domain.remove(value)
+
+    def __call__(self, variables, domains, assignments, forwardcheck=False):
+        unassigned = [var for var in variables if var not in assignments]
+        if len(unassigned) < 2:
+            # Nothing left to match: the assigned values only have to differ, and be missing from the last domain
+            assigned = [assignments[var] for var in variables if var in assignments]
+            if len(set(assigned)) < len(assigned):
+                return False
+            if unassigned and forwardcheck:
+                domain = domains[unassigned[0]]
+                for value in assigned:
+                    if value in domain:
+                        domain.hideValue(value)
+                return bool(domain)
+            return True
+        supports = alldifferent_supports({var: [assignments[var]] if var in assignments else domains[var]
+                                          for var in variables})
+        if supports is None:
+            return False
+        if forwardcheck:
+            for var in variables:
+                if var not in assignments:
+                    domain = domains[var]
+                    for value in domain[:]:
+                        if value not in supports[var]:
+                            domain.hideValue(value)
+        return True
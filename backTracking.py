@@ -2,9 +2,17 @@
 
 import constraint
 from collections import defaultdict
+from searchTrace import TracingBacktrackingSolver
+from domainReduction import reduce_domains, house_domains
+from searchBudget import SearchBudget, BudgetConstraint, BudgetExpired
+from constraintPropagation import CompiledPuzzle, constraint_kind
+from solutionCounting import count_solutions
+from allDifferent import GACAllDifferentConstraint
+from checkerCodegen import generated_checkers, clue_key
 
 class ZebraPuzzleSolver:
-    def __init__(self, attributes, clues, debug=False, forwardcheck=True):
+    def __init__(self, attributes, clues, debug=False, forwardcheck=True, trace=None, presolve=True, gac=True,
+                 codegen=False):
         """
         Initialize the ZebraPuzzleSolver with attributes and clues.
 
@@ -25,35 +33,68 @@ class ZebraPuzzleSolver:
                           ...
                       ]
         :param debug: Boolean flag to enable debug mode for verbose output.
+        :param trace: Optional SearchTrace; when given, the search records its assign/prune/backtrack events into it.
+        :param presolve: Narrow the variable domains with the recognised clues (see domainReduction.py)
+                         before the search starts, instead of leaving every value possible in every house.
+        :param gac: Enforce each attribute's AllDifferent with GACAllDifferentConstraint (see allDifferent.py),
+                    which also prunes the values no assignment of distinct values can use, rather than
+                    only the values already assigned.
+        :param codegen: Check the clues with functions generated and compiled for this puzzle (see
+                        checkerCodegen.py) instead of the generic closures.
         """
         self.attributes = attributes
         self.clues = clues
         self.debug = debug
         self.forwardcheck = forwardcheck
-        self.problem = constraint.Problem()
+        self.trace = trace
+        self.gac = gac
+        self.codegen = codegen
+        if trace is not None:
+            self.problem = constraint.Problem(TracingBacktrackingSolver(trace, self._trace_cell, forwardcheck))
+        else:
+            self.problem = constraint.Problem()
 
         self.num_houses = 5
         self.houses = list(range(1, self.num_houses + 1))  # House 1 to House 5 .. i.e. 6-1=5 total 
+        # The recognised clues as constraint dictionaries (same format as the random puzzles, plus 'in_house'),
+        # each tagged with the 'clue_id' it came from. Used by the propagation-based tools such as hints.
+        self.constraints = []
+        # Set when solve() ran out of budget: values still possible for each variable of the partial answer
+        self.expired = False
+        self.remaining = None
 
-        self.setup_variables()
+        # Clues are parsed first so the pre-solve pass can narrow the domains the variables start with
         self.setup_constraints()
+        if codegen:
+            self.setup_generated_constraints()
+        self.setup_variables(self._presolve() if presolve else None)
+        # Enforces the budget of solve(); added last so it only records assignments the clues accepted
+        self.budget_constraint = BudgetConstraint()
+        self.problem.addConstraint(self.budget_constraint)
 
-    def setup_variables(self):
+    def setup_variables(self, domains=None):
         """
         Define variables and their domains for the CSP problem.
         Each attribute for each house is treated as a separate variable.
         Additionally, enforce that each attribute's values are all different across houses.
+
+        :param domains: Optional dictionary attr -> per-house lists of allowed values (default is every value).
         """
         for attr, values in self.attributes.items():
             var_names = [f"{attr}_{house}" for house in self.houses]
-            self.problem.addVariables(var_names, values)
+            if domains is None:
+                self.problem.addVariables(var_names, values)
+            else:
+                for var_name, house_values in zip(var_names, domains[attr]):
+                    self.problem.addVariable(var_name, house_values)
             if self.debug:
                 print(f"Added variables for attribute '{attr}': {var_names}")
 
         # Enforce AllDifferent constraint for each attribute across houses
         for attr in self.attributes:
             var_names = [f"{attr}_{house}" for house in self.houses]
-            self.problem.addConstraint(constraint.AllDifferentConstraint(), var_names)
+            all_different = GACAllDifferentConstraint() if self.gac else constraint.AllDifferentConstraint()
+            self.problem.addConstraint(all_different, var_names)
             if self.debug:
                 print(f"Added AllDifferent constraint for attribute '{attr}'")
 
@@ -64,6 +105,7 @@ class ZebraPuzzleSolver:
         """
         for clue in self.clues:
             description = clue["description"].lower()
+            first_constraint = len(self.constraints)
             if self.debug:
                 print(f"Processing clue {clue['id']}: {clue['description']}")
 
@@ -83,11 +125,15 @@ class ZebraPuzzleSolver:
                 self._add_same_attribute_constraint("cigarette", "Kools", "color", "yellow")
             elif ("milk is drunk in the center house" in description) or ("milk is drunk in the middle house" in description) or (("center house" in description or "middle house" in description) and "milk" in description):
                 center_house = 3
-                self.problem.addConstraint(lambda beverage: beverage == "milk", [f"beverage_{center_house}"])
+                if not self.codegen:
+                    self.problem.addConstraint(lambda beverage: beverage == "milk", [f"beverage_{center_house}"])
+                self.constraints.append({'in_house': [("beverage", "milk")], 'houses': [center_house]})
                 if self.debug:
                     print("Added constraint: Milk is drunk in the center/middle house.")
             elif "norwegian" in description and "first house" in description:
-                self.problem.addConstraint(lambda nationality: nationality == "Norwegian", ["nationality_1"])
+                if not self.codegen:
+                    self.problem.addConstraint(lambda nationality: nationality == "Norwegian", ["nationality_1"])
+                self.constraints.append({'in_house': [("nationality", "Norwegian")], 'houses': [1]})
                 if self.debug:
                     print("Added constraint: The Norwegian lives in the first house.")
             elif "chesterfields" in description and "next to the man with the fox" in description:
@@ -110,6 +156,61 @@ class ZebraPuzzleSolver:
                 if self.debug:
                     print(f"Clue {clue['id']} not recognized or not implemented.")
 
+            for constraint in self.constraints[first_constraint:]:
+                constraint['clue_id'] = clue['id']
+
+    def setup_generated_constraints(self):
+        """
+        Add the recognised clues (self.constraints) with checkers generated for this puzzle.
+
+        Each clue gets one Constraint class of unrolled comparisons with its values inlined, so a check
+        does not slice, loop or build lists; the compiled classes are cached by puzzle fingerprint.
+        """
+        checkers = generated_checkers(self.attributes, self.constraints, self.num_houses)
+        for constraint_dict in self.constraints:
+            kind = constraint_kind(constraint_dict)
+            check = checkers[clue_key(constraint_dict)]
+            if kind == 'in_house':
+                (attr, value), = constraint_dict[kind]
+                self.problem.addConstraint(check, [f"{attr}_{house}" for house in constraint_dict['houses']])
+            elif kind == 'same_house':
+                (attr1, value1), (attr2, value2) = constraint_dict[kind]
+                for house in self.houses:
+                    self.problem.addConstraint(check, (f"{attr1}_{house}", f"{attr2}_{house}"))
+            else:
+                (attr1, value1), (attr2, value2) = constraint_dict[kind]
+                self.problem.addConstraint(check, [f"{attr1}_{house}" for house in self.houses] +
+                                           [f"{attr2}_{house}" for house in self.houses])
+        if self.debug:
+            print(f"Added {len(self.constraints)} generated clue checkers.")
+
+    def _presolve(self):
+        """
+        Apply the recognised clues to the house domains before the Problem is searched.
+
+        :return: Dictionary attr -> per-house lists of allowed values, or None to keep the full domains
+                 (when the clues contradict each other the search reports it).
+        """
+        value_houses = reduce_domains(self.attributes, self.constraints, self.num_houses)
+        if value_houses is None:
+            if self.debug:
+                print("Pre-solve found the clues contradictory; keeping full domains.")
+            return None
+        domains = house_domains(self.attributes, value_houses, self.num_houses)
+        if self.debug:
+            remaining = sum(len(values) for houses in domains.values() for values in houses)
+            print(f"Pre-solve left {remaining} of {len(self.attributes) * self.num_houses ** 2} house values.")
+        return domains
+
+    def _trace_cell(self, variable, value):
+        """
+        Map a CSP variable and value to the grid cell it fills, for search traces.
+
+        :return: Tuple (house number, attribute type, value).
+        """
+        attr, house_num = variable.rsplit('_', 1)
+        return int(house_num), attr, value
+
     def _add_same_attribute_constraint(self, attr1, value1, attr2, value2):
         """
         Add a constraint that attr1=value1 implies attr2=value2 for the same house.
@@ -120,12 +221,14 @@ class ZebraPuzzleSolver:
         :param value2: Value for the second attribute (e.g., 'red')
         """
         for house in self.houses:
-            self.problem.addConstraint(
-                lambda a1, a2: (a1 != value1) or (a2 == value2),
-                (f"{attr1}_{house}", f"{attr2}_{house}")
-            )
+            if not self.codegen:
+                self.problem.addConstraint(
+                    lambda a1, a2: (a1 != value1) or (a2 == value2),
+                    (f"{attr1}_{house}", f"{attr2}_{house}")
+                )
             if self.debug:
                 print(f"Added constraint: If {attr1}_{house} == {value1} then {attr2}_{house} == {value2}")
+        self.constraints.append({'same_house': [(attr1, value1), (attr2, value2)]})
 
     def _add_relative_position_constraint(self, attr1, value1, attr2, value2, direction="right"):
         """
@@ -153,7 +256,12 @@ class ZebraPuzzleSolver:
                         return True
             return False
 
-        self.problem.addConstraint(relative_position_constraint, vars_attr1 + vars_attr2)
+        if not self.codegen:
+            self.problem.addConstraint(relative_position_constraint, vars_attr1 + vars_attr2)
+        if direction == "right":
+            self.constraints.append({'left_of': [(attr1, value1), (attr2, value2)]})
+        else:
+            self.constraints.append({'left_of': [(attr2, value2), (attr1, value1)]})
         if self.debug:
             print(f"Added constraint: The {attr2} house is immediately to the {direction} of the {attr1} house.")
 
@@ -185,14 +293,22 @@ class ZebraPuzzleSolver:
                         return True
             return False
 
-        self.problem.addConstraint(next_to_constraint, vars_attr1 + vars_attr2)
+        if not self.codegen:
+            self.problem.addConstraint(next_to_constraint, vars_attr1 + vars_attr2)
+        self.constraints.append({'next_to': [(attr1, value1), (attr2, value2)]})
         if self.debug:
             print(f"Added constraint: {attr1}={value1} is next to {attr2}={value2}.")
 
-    def solve(self):
+    def solve(self, deadline=None, max_nodes=None):
         """
         Solve the CSP problem and return the solution.
 
+        With a deadline or node limit the search stops when the budget runs out and the best partial
+        assignment found so far is returned instead: only its assigned cells are filled in, self.expired
+        is set and self.remaining maps every variable (e.g. 'color_3') to the values it may still take.
+
+        :param deadline: time.monotonic() value by which to return (default is no deadline).
+        :param max_nodes: Maximum number of search nodes (default is no limit).
         :return: List of dictionaries where each dictionary represents a house with its attributes.
                  Example:
                  [
@@ -202,7 +318,26 @@ class ZebraPuzzleSolver:
                  ]
                  Returns None if no solution is found.
         """
-        solutions = self.problem.getSolutions() #Automatic Python library to get backtracking w/ forward checking result
+        self.expired = False
+        self.remaining = None
+        budget = None
+        if deadline is not None or max_nodes is not None:
+            budget = SearchBudget(deadline, max_nodes)
+        self.budget_constraint.budget = budget
+        try:
+            if budget is None:
+                solutions = self.problem.getSolutions() #Automatic Python library to get backtracking w/ forward checking result
+            else:
+                solution = self.problem.getSolution()
+                solutions = [solution] if solution is not None else []
+        except BudgetExpired:
+            assignments, self.remaining = budget.best or ({}, {})
+            self.expired = True
+            if self.debug:
+                print(f"Search budget ran out after {budget.nodes - 1} nodes; returning the best partial assignment.")
+            return self._format_houses(assignments)
+        finally:
+            self.budget_constraint.budget = None
         if self.debug:
             print(f"Number of solutions found: {len(solutions)}")
 
@@ -213,22 +348,40 @@ class ZebraPuzzleSolver:
                 print("Solution:")
                 for var, val in solution.items():
                     print(f"  {var} = {val}")
-
-            # Transform the solution into a list of house dictionaries
-            houses_solution = defaultdict(dict)
-            for var, val in solution.items():
-                attr, house_num = var.rsplit('_', 1)
-                houses_solution[int(house_num)][attr] = val
-
-            # Convert defaultdict to a sorted list based on house number
-            sorted_houses = []
-            for house_num in sorted(houses_solution.keys()):
-                house_attrs = houses_solution[house_num]
-                house_attrs["number"] = str(house_num)
-                sorted_houses.append(house_attrs)
-
-            return sorted_houses
+            return self._format_houses(solution)
         else:
             if self.debug:
                 print("No solution found.")
-            return None
\ No newline at end of file
+            return None
+
+    def count_solutions(self):
+        """
+        Count the solutions of the recognised clues exactly, without listing them (see solutionCounting.py).
+
+        :return: Number of solutions.
+        """
+        stats = {}
+        count = count_solutions(CompiledPuzzle(self.attributes, self.constraints, self.num_houses), stats)
+        if self.debug:
+            print(f"Counted {count} solutions ({stats['nodes']} nodes, {stats['cache_hits']} cache hits).")
+        return count
+
+    def _format_houses(self, solution):
+        """
+        Transform an assignment of CSP variables into a list of house dictionaries sorted by house number.
+
+        :param solution: Dictionary variable ('attr_house') -> value.
+        """
+        houses_solution = defaultdict(dict)
+        for var, val in solution.items():
+            attr, house_num = var.rsplit('_', 1)
+            houses_solution[int(house_num)][attr] = val
+
+        # Convert defaultdict to a sorted list based on house number (houses of a partial answer may be empty)
+        sorted_houses = []
+        for house_num in self.houses:
+            house_attrs = houses_solution[house_num]
+            house_attrs["number"] = str(house_num)
+            sorted_houses.append(house_attrs)
+
+        return sorted_houses
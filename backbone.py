@@ -0,0 +1,106 @@
+# backbone.py
+
+from constraintPropagation import CompiledPuzzle, propagate, single_house, mask_houses
+from propagationSearch import solve_domains
+
+
+class Backbone:
+    def __init__(self, cells, ambiguous, values):
+        """
+        The cells every solution agrees on, and the cells that differ between solutions.
+
+        :param cells: Dictionary (house number, attribute) -> value found there in every solution.
+        :param ambiguous: Dictionary (house number, attribute) -> values found there in the solutions
+                          examined (at least two, or one value that is not always there).
+        :param values: Dictionary (attr, value) -> list of houses it was found in; one house for backbone values.
+        """
+        self.cells = cells
+        self.ambiguous = ambiguous
+        self.values = values
+
+    def is_unique(self):
+        """ True if the puzzle has a single solution. """
+        return not self.ambiguous
+
+    def __str__(self):
+        fixed = ", ".join(f"{val} ({attr}) in house {house}" for (house, attr), val in sorted(self.cells.items()))
+        open_cells = ", ".join(f"house {house} {attr}: {'/'.join(vals)}"
+                               for (house, attr), vals in sorted(self.ambiguous.items()))
+        return f"Fixed: {fixed or 'none'}\nAmbiguous: {open_cells or 'none'}"
+
+
+def backbone_domains(puzzle, stats=None):
+    """
+    Find the values placed in the same house by every solution, without enumerating solutions.
+
+    Starting from one solution, each value still in the same house in every solution found so far
+    is tested by forbidding that house: if no solution remains, the value is in the backbone and is
+    fixed in the working domains, which makes the later tests cheaper. Otherwise the new solution
+    rules out every value it places elsewhere. So each test either fixes a value or usually
+    eliminates many candidates at once.
+
+    :param puzzle: CompiledPuzzle.
+    :param stats: Optional dictionary updated with 'checks' (solver calls) and 'solutions' (solutions found).
+    :return: List per variable of the houses it was found in (bitmask); a single house for backbone
+             values. None if the puzzle has no solution.
+    """
+    domains = puzzle.initial_domains()
+    if not propagate(puzzle, domains):
+        return None
+    solution = solve_domains(puzzle, domains)
+    if solution is None:
+        return None
+    seen = list(solution)
+    checks = solutions = 1
+    # Values with fewest remaining houses first: they are the most likely to be fixed
+    for var in sorted(range(len(seen)), key=lambda v: bin(domains[v]).count('1')):
+        if seen[var] & (seen[var] - 1) or domains[var] == seen[var]:
+            continue
+        trial = list(domains)
+        trial[var] &= ~seen[var]
+        checks += 1
+        solution = solve_domains(puzzle, trial)
+        if solution is None:
+            domains[var] = seen[var]
+            propagate(puzzle, domains, [var])
+        else:
+            solutions += 1
+            for other, bit in enumerate(solution):
+                seen[other] |= bit
+    if stats is not None:
+        stats['checks'] = checks
+        stats['solutions'] = solutions
+    return seen
+
+
+def find_backbone(attributes, constraints, num_houses=5, stats=None):
+    """
+    Split the grid of a puzzle into fixed and ambiguous cells.
+
+    Useful for under-constrained puzzles such as those of generate_constraints_from_solution:
+    each ambiguous cell needs another clue before the puzzle has a single solution.
+
+    :param attributes: Dictionary of attribute types and their possible values.
+    :param constraints: List of constraint dictionaries.
+    :param num_houses: The number of houses in the puzzle (default is 5).
+    :param stats: Optional dictionary, see backbone_domains.
+    :return: Backbone, or None if the puzzle has no solution.
+    """
+    puzzle = CompiledPuzzle(attributes, constraints, num_houses)
+    seen = backbone_domains(puzzle, stats)
+    if seen is None:
+        return None
+    cells = {}
+    ambiguous = {}
+    values = {}
+    for var, (attr, val) in enumerate(puzzle.variables):
+        values[(attr, val)] = mask_houses(seen[var])
+        house = single_house(seen[var])
+        if house:
+            cells[(house, attr)] = val
+    for var, (attr, val) in enumerate(puzzle.variables):
+        if single_house(seen[var]):
+            continue
+        for house in mask_houses(seen[var]):
+            ambiguous.setdefault((house, attr), []).append(val)
+    return Backbone(cells, ambiguous, values)
@@ -2,56 +2,292 @@
 
 from constraint import Problem, AllDifferentConstraint
 import copy
+from searchTrace import TracingBacktrackingSolver
+from puzzleSymmetry import break_symmetries
+from constraintPropagation import CompiledPuzzle, single_house, mask_houses
+from conflictSearch import solve_cbj
+from satSolver import solve_sat
+from localSearch import solve_local
+from parallelSearch import solve_parallel
+from houseSweep import solve_sweep
+from solutionCounting import count_solutions
+from backbone import find_backbone
+from domainReduction import reduce_domains, same_house_classes
+from searchBudget import SearchBudget, BudgetExpired
+from problemDecomposition import ProblemGraph
+from allDifferent import GACAllDifferentConstraint
 
 class ZebraRandomSolver:
-    def __init__(self, attributes, constraints, num_houses=5):
+    def __init__(self, attributes, constraints, num_houses=5, trace=None, break_symmetry=False, method='constraint',
+                 presolve=True, gac=True):
         """
         Initialize the ZebraRandomSolver with attributes and dynamically generated constraints.
 
         :param attributes: A dictionary where keys are attribute names (e.g., 'color') and values are lists of possible values.
         :param constraints: A list of dynamically generated constraints.
         :param num_houses: The number of houses in the puzzle (default is 5).
+        :param trace: Optional SearchTrace; when given, the search records its assign/prune/backtrack events into it.
+        :param break_symmetry: Add ordering constraints between interchangeable values so symmetric
+                               subtrees are searched once. Only one of each group of mirrored solutions is kept.
+        :param method: Search engine: 'constraint' (python-constraint backtracking, the default), 'cbj'
+                       (conflict-directed backjumping with nogood learning, see conflictSearch.py), 'sat'
+                       (CNF encoding solved by the bundled CDCL solver, see satSolver.py; not traced) or
+                       'local' (min-conflicts local search for large grids, see localSearch.py; finds any
+                       consistent grid, not traced) or 'parallel' (subtree splitting over a process pool,
+                       see parallelSearch.py; not traced) or 'sweep' (dynamic programming
+                       over the houses from left to right, see houseSweep.py; not traced).
+        :param presolve: For the 'constraint' method, narrow the house domains with the clues and merge
+                         values tied by same_house clues into one variable before the Problem is built.
+        :param gac: For the 'constraint' method, enforce each attribute's AllDifferent with
+                    GACAllDifferentConstraint (see allDifferent.py), which also prunes the houses no
+                    assignment of distinct houses can use, rather than only the houses already taken.
         """
         self.attributes = copy.deepcopy(attributes)
         self.constraints = copy.deepcopy(constraints)
+        if break_symmetry:
+            self.constraints = break_symmetries(self.attributes, self.constraints)
         self.num_houses = num_houses
+        self.trace = trace
+        self.method = method
+        self.presolve = presolve
+        self.gac = gac
+        self.stats = {}
         self.solution = None
+        # Set when solve() ran out of budget: houses still possible for each value of the partial answer
+        self.expired = False
+        self.remaining = None
+        # Variable that stands for each value in the Problem (values merged by the pre-solve pass share one)
+        self.representative = {}
+        # Attribute type of each value, used to place traced events in the grid
+        self.value_attributes = {val: attr for attr, values in self.attributes.items() for val in values}
 
-    def solve(self):
+    def solve(self, deadline=None, max_nodes=None):
         """
         Solve the Zebra Puzzle using the python-constraint library.
 
+        With a deadline or node limit the search stops when the budget runs out and the best partial
+        assignment found so far is returned instead: only its placed values are filled in, self.expired
+        is set and self.remaining maps every value to the houses it may still occupy.
+
+        :param deadline: time.monotonic() value by which to return (default is no deadline).
+        :param max_nodes: Maximum number of search nodes (default is no limit).
         :return: A list of dictionaries representing each house's attributes if a solution is found; otherwise, False.
         """
-        problem = Problem()
+        self.expired = False
+        self.remaining = None
+        budget = None
+        if deadline is not None or max_nodes is not None:
+            budget = SearchBudget(deadline, max_nodes)
+        if self.method == 'cbj':
+            return self._solve_cbj(budget)
+        if self.method == 'sat':
+            return self._solve_sat(budget)
+        if self.method == 'local':
+            return self._solve_local(budget)
+        if self.method == 'parallel':
+            return self._solve_parallel(budget)
+        if self.method == 'sweep':
+            return self._solve_sweep(budget)
+        if self.method != 'constraint':
+            print(f"ZebraRandomSolver: Unknown method '{self.method}', using 'constraint'.")
+
+        domains = {}
+        self.representative = {val: val for val in self.value_attributes}
+        if self.presolve:
+            domains = self._presolve()
+            if domains is None:
+                print("ZebraRandomSolver: No solution found with the given constraints.")
+                return False
+
+        # Collect the CSP first, so values only linked through their own attribute are solved separately
+        graph = ProblemGraph()
 
         # Define variables: Each attribute value is a variable with domain as house numbers 1 to 5
         for attr, values in self.attributes.items():
-            problem.addVariables(values, range(1, self.num_houses + 1))
+            for val in values:
+                if self.representative[val] == val:
+                    graph.addVariable(val, domains.get(val, range(1, self.num_houses + 1)))
 
         # Add AllDifferent constraints for each attribute type to ensure uniqueness 
         for attr, values in self.attributes.items():
-            problem.addConstraint(AllDifferentConstraint(), values)
+            all_different = GACAllDifferentConstraint() if self.gac else AllDifferentConstraint()
+            graph.addConstraint(all_different, [self.representative[val] for val in values])
 
         # Map dynamic constraints to CSP constraints
-        self._map_constraints(problem)
+        self._map_constraints(graph)
 
-        # Get all solutions (ideally one unique solution)
-        solutions = problem.getSolutions()
+        # Get all solutions of each component (ideally one unique solution); under a budget only the first is looked for
+        try:
+            # A trace replays a single search, so traced solves keep the whole Problem together
+            solution = graph.solve(self._new_problem, budget, first_only=budget is not None,
+                                   split=self.trace is None)
+        except BudgetExpired:
+            assignments, remaining = budget.best or ({}, {})
+            assignments = {**graph.solution, **assignments}
+            houses = {val: remaining.get(rep, [assignments[rep]] if rep in assignments else graph.domains[rep])
+                      for val, rep in self.representative.items()}
+            placed = {val: assignments[rep] for val, rep in self.representative.items() if rep in assignments}
+            return self._partial_result(houses, placed)
+        finally:
+            self.stats.update(graph.stats)
 
-        if not solutions:
+        if solution is None:
             print("ZebraRandomSolver: No solution found with the given constraints.")
             return False
 
         # Assuming a unique solution, take the first one
-        self.solution = solutions[0]
+        self.solution = {val: solution[rep] for val, rep in self.representative.items()}
         return self._format_solution()
 
+    def count_solutions(self):
+        """
+        Count the puzzle's solutions exactly without listing them (see solutionCounting.py).
+
+        With break_symmetry only one of each group of mirrored solutions is counted.
+
+        :return: Number of solutions.
+        """
+        puzzle = CompiledPuzzle(self.attributes, self.constraints, self.num_houses)
+        return count_solutions(puzzle, self.stats)
+
+    def backbone(self):
+        """
+        Split the grid into the cells every solution agrees on and the ambiguous ones (see backbone.py).
+
+        With break_symmetry the symmetry-breaking clues can make mirrored cells look fixed.
+
+        :return: Backbone, or None if the puzzle has no solution.
+        """
+        return find_backbone(self.attributes, self.constraints, self.num_houses, self.stats)
+
+    def _presolve(self):
+        """
+        Pre-solve pass: apply the clues to the house domains and merge values tied by same_house clues.
+
+        Sets self.representative; each class of merged values gets the intersection of their domains.
+
+        :return: Dictionary representative value -> list of houses, or None if the clues contradict.
+        """
+        value_houses = reduce_domains(self.attributes, self.constraints, self.num_houses)
+        if value_houses is None:
+            return None
+        classes = same_house_classes(self.attributes, self.constraints)
+        self.representative = {pair[1]: rep[1] for pair, rep in classes.items()}
+        domains = {}
+        for (attr, val), houses in value_houses.items():
+            rep = self.representative[val]
+            domains[rep] = [h for h in domains.get(rep, houses) if h in houses]
+        return domains
+
+    def _solve_cbj(self, budget=None):
+        """
+        Solve with conflict-directed backjumping and nogood learning instead of python-constraint.
+
+        :return: Same as solve().
+        """
+        puzzle = CompiledPuzzle(self.attributes, self.constraints, self.num_houses)
+        domains = solve_cbj(puzzle, self.trace, self.stats, budget)
+        if domains is None:
+            return self._no_solution(puzzle, budget, "No solution found with the given constraints.")
+        self.solution = {val: single_house(domains[var]) for var, (attr, val) in enumerate(puzzle.variables)}
+        return self._format_solution()
+
+    def _solve_sat(self, budget=None):
+        """
+        Solve by encoding the puzzle as CNF for the CDCL solver in satSolver.py.
+
+        :return: Same as solve().
+        """
+        puzzle = CompiledPuzzle(self.attributes, self.constraints, self.num_houses)
+        domains = solve_sat(puzzle, self.stats, budget)
+        if domains is None:
+            return self._no_solution(puzzle, budget, "No solution found with the given constraints.")
+        self.solution = {val: single_house(domains[var]) for var, (attr, val) in enumerate(puzzle.variables)}
+        return self._format_solution()
+
+    def _solve_local(self, budget=None):
+        """
+        Solve with min-conflicts local search; fails if no consistent grid is found within its time budget.
+
+        :return: Same as solve().
+        """
+        puzzle = CompiledPuzzle(self.attributes, self.constraints, self.num_houses)
+        domains = solve_local(puzzle, stats=self.stats, budget=budget)
+        if domains is None:
+            return self._no_solution(puzzle, budget, "Local search found no consistent grid within its time budget.")
+        self.solution = {val: single_house(domains[var]) for var, (attr, val) in enumerate(puzzle.variables)}
+        return self._format_solution()
+
+    def _solve_parallel(self, budget=None):
+        """
+        Solve by splitting the search tree into work units searched on a process pool.
+
+        :return: Same as solve().
+        """
+        puzzle = CompiledPuzzle(self.attributes, self.constraints, self.num_houses)
+        domains = solve_parallel(self.attributes, self.constraints, self.num_houses, stats=self.stats, budget=budget)
+        if domains is None:
+            return self._no_solution(puzzle, budget, "No solution found with the given constraints.")
+        self.solution = {val: single_house(domains[var]) for var, (attr, val) in enumerate(puzzle.variables)}
+        return self._format_solution()
+
+    def _solve_sweep(self, budget=None):
+        """
+        Solve with the left-to-right dynamic programming sweep over the houses.
+
+        :return: Same as solve().
+        """
+        puzzle = CompiledPuzzle(self.attributes, self.constraints, self.num_houses)
+        domains = solve_sweep(puzzle, self.stats, budget)
+        if domains is None:
+            return self._no_solution(puzzle, budget, "No solution found with the given constraints.")
+        self.solution = {val: single_house(domains[var]) for var, (attr, val) in enumerate(puzzle.variables)}
+        return self._format_solution()
+
+    def _no_solution(self, puzzle, budget, message):
+        """
+        Result of an engine that returned no solution: a partial answer if its budget ran out, otherwise False.
+        """
+        if budget is not None and budget.expired:
+            best = budget.best or puzzle.initial_domains()
+            houses = {val: mask_houses(best[var]) for var, (attr, val) in enumerate(puzzle.variables)}
+            return self._partial_result(houses, {val: options[0] for val, options in houses.items() if len(options) == 1})
+        print(f"ZebraRandomSolver: {message}")
+        return False
+
+    def _partial_result(self, houses, placed):
+        """
+        Return the best partial assignment of an expired search.
+
+        :param houses: Dictionary value -> list of houses it may still occupy.
+        :param placed: Dictionary value -> house of the values the search had placed.
+        :return: House dictionaries holding only the placed values.
+        """
+        print("ZebraRandomSolver: Search budget ran out; returning the best partial assignment.")
+        self.expired = True
+        self.remaining = houses
+        self.solution = placed
+        return self._format_solution()
+
+    def _new_problem(self):
+        """ Empty Problem for one search, recording into self.trace when there is one. """
+        if self.trace is not None:
+            return Problem(TracingBacktrackingSolver(self.trace, self._trace_cell))
+        return Problem()
+
+    def _trace_cell(self, variable, house_num):
+        """
+        Map a CSP variable (an attribute value) and its house to a grid cell, for search traces.
+
+        :return: Tuple (house number, attribute type, value).
+        """
+        return house_num, self.value_attributes[variable], variable
+
     def _map_constraints(self, problem):
         """
         Translate dynamic constraints into CSP constraints.
 
-        :param problem: The CSP problem instance.
+        :param problem: The CSP problem instance (a Problem or a ProblemGraph).
         """
         for constraint_dict in self.constraints:
             if 'same_house' in constraint_dict:
@@ -60,7 +296,9 @@ class ZebraRandomSolver:
                     # Both pairs must be assigned to the same house
                     attr1, val1 = pairs[0]
                     attr2, val2 = pairs[1]
-                    problem.addConstraint(lambda a, b: a == b, (val1, val2))
+                    var1, var2 = self.representative[val1], self.representative[val2]
+                    if var1 != var2:  # Values merged by the pre-solve pass already share a variable
+                        problem.addConstraint(lambda a, b: a == b, (var1, var2))
                 else:
                     print(f"ZebraRandomSolver: Unsupported 'same_house' constraint format: {constraint_dict}")
             elif 'next_to' in constraint_dict:
@@ -69,7 +307,7 @@ class ZebraRandomSolver:
                     attr1, val1 = pairs[0]
                     attr2, val2 = pairs[1]
                     # Add constraint that val1 is next to val2
-                    problem.addConstraint(lambda a, b: abs(a - b) == 1, (val1, val2))
+                    self._add_binary(problem, lambda a, b: abs(a - b) == 1, val1, val2)
                 else:
                     print(f"ZebraRandomSolver: Unsupported 'next_to' constraint format: {constraint_dict}")
             elif 'left_of' in constraint_dict:
@@ -78,12 +316,38 @@ class ZebraRandomSolver:
                     attr1, val1 = pairs[0]
                     attr2, val2 = pairs[1]
                     # Add constraint that val1 is immediately to the left of val2
-                    problem.addConstraint(lambda a, b: a + 1 == b, (val1, val2))
+                    self._add_binary(problem, lambda a, b: a + 1 == b, val1, val2)
                 else:
                     print(f"ZebraRandomSolver: Unsupported 'left_of' constraint format: {constraint_dict}")
+            elif 'before' in constraint_dict:
+                pairs = constraint_dict['before']
+                if len(pairs) == 2:
+                    attr1, val1 = pairs[0]
+                    attr2, val2 = pairs[1]
+                    # Symmetry breaking: val1 is in a lower-numbered house than val2
+                    self._add_binary(problem, lambda a, b: a < b, val1, val2)
+                else:
+                    print(f"ZebraRandomSolver: Unsupported 'before' constraint format: {constraint_dict}")
+            elif 'in_house' in constraint_dict:
+                (attr1, val1), = constraint_dict['in_house']
+                houses = tuple(constraint_dict['houses'])
+                # Positional clue: val1 is in one of the listed houses
+                problem.addConstraint(lambda a, houses=houses: a in houses, (self.representative[val1],))
             else:
                 print(f"ZebraRandomSolver: Unknown constraint type: {constraint_dict}")
 
+    def _add_binary(self, problem, check, val1, val2):
+        """
+        Add a two-value clue over the Problem variables standing for the values.
+
+        A clue between two values merged into one variable is checked as a unary constraint on it.
+        """
+        var1, var2 = self.representative[val1], self.representative[val2]
+        if var1 == var2:
+            problem.addConstraint(lambda a: check(a, a), (var1,))
+        else:
+            problem.addConstraint(check, (var1, var2))
+
     def _format_solution(self):
         """
         Format the CSP solution into a list of house attribute dictionaries.
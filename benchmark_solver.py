@@ -1,29 +1,26 @@
 import json
+import puzzleAssets
 from backTracking import ZebraPuzzleSolver
 
 def load_clues(file_path):
     """Loads clues from a JSON file."""
     try:
-        with open(file_path, 'r') as file:
-            return json.load(file)['clues']
+        return puzzleAssets.load_clues(file_path)
     except FileNotFoundError:
         print(f"Error: {file_path} not found.")
         return []
     except json.JSONDecodeError:
         print(f"Error: JSON decoding failed for {file_path}.")
         return []
+    except ValueError as e:
+        print(f"Error: {e}")
+        return []
 
 def benchmark_solvers():
     """Benchmarks and compares solver execution times for the Zebra Puzzle."""
 
-    # Define the puzzle's domains (attributes and their possible values)
-    domains = {
-        'color': ['red', 'green', 'ivory', 'yellow', 'blue'],
-        'nationality': ['Englishman', 'Spaniard', 'Ukrainian', 'Norwegian', 'Japanese'],
-        'beverage': ['coffee', 'tea', 'milk', 'orange juice', 'water'],
-        'cigarette': ['Old Gold', 'Kools', 'Chesterfields', 'Lucky Strike', 'Parliaments'],
-        'pet': ['dog', 'snails', 'fox', 'horse', 'zebra']
-    }
+    # The puzzle's domains (attributes and their possible values) from attributes.json
+    domains = puzzleAssets.load_attributes()
     
     # Load clues from a JSON file
     clues = load_clues('clues.json')
@@ -0,0 +1,126 @@
+# checkerCodegen.py
+
+from collections import OrderedDict
+from constraintPropagation import CompiledPuzzle, constraint_kind
+
+# Most generated checker sets kept; the least recently used are dropped beyond this
+CACHE_SIZE = 64
+
+_cache = OrderedDict()
+
+
+def clue_key(constraint):
+    """ Hashable identity of a clue: its type, its values and, for positional clues, its houses. """
+    kind = constraint_kind(constraint)
+    pairs = tuple(tuple(pair) for pair in constraint[kind])
+    return kind, pairs, tuple(constraint['houses']) if kind == 'in_house' else None
+
+
+def _any(terms):
+    return terms[0] if len(terms) == 1 else "(" + " or ".join(terms) + ")"
+
+
+def _checker_body(kind, pairs, houses, num_houses):
+    """
+    Arguments and return expression of the checker of one clue, for per-house variables.
+
+    Binary clues take the first value's attribute in houses 1..n, then the second's (x1..xn, y1..yn);
+    same_house takes the two attributes of one house; in_house takes the attribute in each listed house.
+    """
+    if kind == 'in_house':
+        (attr, value), = pairs
+        args = [f"x{house}" for house in houses]
+        return args, " or ".join(f"{arg} == {value!r}" for arg in args)
+    (attr1, value1), (attr2, value2) = pairs
+    if kind == 'same_house':
+        return ["x", "y"], f"x != {value1!r} or y == {value2!r}"
+    args = [f"x{house}" for house in range(1, num_houses + 1)] + [f"y{house}" for house in range(1, num_houses + 1)]
+    terms = []
+    for house in range(1, num_houses + 1):
+        if kind == 'left_of':
+            others = [house + 1] if house < num_houses else []
+        elif kind == 'next_to':
+            others = [other for other in (house - 1, house + 1) if 1 <= other <= num_houses]
+        elif kind == 'before':
+            others = list(range(house + 1, num_houses + 1))
+        else:
+            raise ValueError(f"checkerCodegen: Unsupported constraint type: {kind}")
+        if others:
+            terms.append(f"(x{house} == {value1!r} and {_any([f'y{other} == {value2!r}' for other in others])})")
+    return args, " or\n            ".join(terms) or "False"
+
+
+def _checker_class(name, key, args, expression):
+    """
+    Source of a python-constraint Constraint checking one clue, equivalent to wrapping the
+    expression in a FunctionConstraint but with the argument handling unrolled.
+    """
+    unassigned = " + ".join(f"({arg} is _unassigned)" for arg in args)
+    lines = [f"class {name}(Constraint):",
+             f"    # {key[0]} {key[1]}" + (f" houses {list(key[2])}" if key[2] else ""),
+             "    def __call__(self, variables, domains, assignments, forwardcheck=False, _unassigned=Unassigned):",
+             "        get = assignments.get"]
+    lines += [f"        {arg} = get(variables[{position}], _unassigned)" for position, arg in enumerate(args)]
+    lines += [f"        missing = {unassigned}",
+              "        if not missing:",
+              f"            return ({expression})",
+              "        if missing > 1 or not forwardcheck:",
+              "            return True",
+              "        # Forward checking: keep the values of the one unassigned argument that satisfy the clue"]
+    for position, arg in enumerate(args):
+        lines += [f"        if {arg} is _unassigned:",
+                  f"            domain = domains[variables[{position}]]",
+                  f"            for {arg} in domain[:]:",
+                  f"                if not ({expression}):",
+                  f"                    domain.hideValue({arg})",
+                  "            return bool(domain)"]
+    return lines + ["", ""]
+
+
+def checker_source(constraints, num_houses=5):
+    """
+    Python source of a module with one specialised Constraint class per distinct clue.
+
+    Every loop of the generic checkers is unrolled into comparisons and every value is inlined as a
+    constant, so a full check is a single boolean expression over its arguments. The arguments are
+    read and forward checked by straight-line code, instead of FunctionConstraint building an
+    argument list and calling a closure for every check.
+
+    :param constraints: List of constraint dictionaries.
+    :param num_houses: The number of houses in the puzzle (default is 5).
+    :return: Source text; executing it defines CHECKERS, a dictionary clue_key -> Constraint instance.
+    """
+    lines = ["# Generated by checkerCodegen.py", "", "from constraint import Constraint, Unassigned", "", ""]
+    names = {}
+    for constraint in constraints:
+        key = clue_key(constraint)
+        if key in names:
+            continue
+        names[key] = f"Clue{len(names)}"
+        lines += _checker_class(names[key], key, *_checker_body(*key, num_houses))
+    lines.append("CHECKERS = {")
+    lines += [f"    {key!r}: {name}()," for key, name in names.items()]
+    lines.append("}")
+    return "\n".join(lines) + "\n"
+
+
+def generated_checkers(attributes, constraints, num_houses=5):
+    """
+    Specialised checkers of a puzzle's clues, generated and compiled once per puzzle.
+
+    The compiled checkers are cached by the puzzle's fingerprint (see CompiledPuzzle.fingerprint),
+    so solving the same puzzle again reuses them without generating any code.
+
+    :return: Dictionary clue_key -> Constraint instance (stateless, so it can be added for several scopes).
+    """
+    fingerprint = CompiledPuzzle(attributes, constraints, num_houses).fingerprint()
+    if fingerprint in _cache:
+        _cache.move_to_end(fingerprint)
+        return _cache[fingerprint]
+    namespace = {}
+    exec(compile(checker_source(constraints, num_houses), f"<checkers {fingerprint[:12]}>", "exec"), namespace)
+    checkers = namespace['CHECKERS']
+    _cache[fingerprint] = checkers
+    if len(_cache) > CACHE_SIZE:
+        _cache.popitem(last=False)
+    return checkers
@@ -0,0 +1,166 @@
+# clueAnalysis.py
+
+import copy
+from itertools import islice
+from constraintPropagation import CompiledPuzzle, propagate
+from propagationSearch import house_bits, iter_solutions, solve_domains
+
+
+class PruneCounter:
+    def __init__(self, puzzle):
+        """
+        Counts the house values each clue removes during propagation.
+
+        Passed to propagate() in place of an Explanation: every reduction is charged to the clue
+        that made it, or to the AllDifferent rule when no clue is involved. Counts add up over
+        every domain list watched, so a whole search can be measured.
+
+        :param puzzle: CompiledPuzzle being propagated.
+        """
+        self.domains = None
+        self.last = None
+        self.pruned = [0] * len(puzzle.constraints)
+        self.all_different = 0
+
+    def watch(self, domains):
+        """ Measure the reductions of this domain list, which propagate() is about to narrow. """
+        self.domains = domains
+        self.last = list(domains)
+
+    def given(self, var):
+        pass
+
+    def derive(self, target, source, clue_id=None):
+        removed = bin(self.last[target] & ~self.domains[target]).count('1')
+        self.last[target] = self.domains[target]
+        if clue_id is None:
+            self.all_different += removed
+        else:
+            self.pruned[clue_id] += removed
+
+
+class ClueReport:
+    def __init__(self, constraint, pruned, redundant):
+        """
+        Analysis of one clue.
+
+        :param constraint: The constraint dictionary.
+        :param pruned: House values the clue removed while searching for the first solutions.
+        :param redundant: True if the other clues already imply it.
+        """
+        self.constraint = constraint
+        self.pruned = pruned
+        self.redundant = redundant
+
+    def __str__(self):
+        status = "redundant" if self.redundant else "needed"
+        return f"{self.constraint}: pruned {self.pruned}, {status}"
+
+
+def without_clue(puzzle, clue):
+    """ Shallow copy of a CompiledPuzzle that ignores one clue; domains and ids are unchanged. """
+    view = copy.copy(puzzle)
+    view.clues = [c for c in puzzle.clues if c is not clue]
+    view.var_clues = [[c for c in clues if c is not clue] for clues in puzzle.var_clues]
+    return view
+
+
+def idle_clues(puzzle):
+    """
+    Propagate the whole puzzle once and find the clues that removed nothing on the way.
+
+    Propagation without such a clue can make the same reductions in the same order, so the
+    puzzle's fixpoint is also the fixpoint of the other clues and can be passed to is_entailed().
+
+    :param puzzle: CompiledPuzzle.
+    :return: (fixpoint domains, set of idle clue ids), or (None, empty set) if propagation fails.
+    """
+    counter = PruneCounter(puzzle)
+    domains = puzzle.initial_domains()
+    counter.watch(domains)
+    if not propagate(puzzle, domains, explain=counter):
+        return None, set()
+    return domains, {clue.id for clue in puzzle.clues if not counter.pruned[clue.id]}
+
+
+def is_entailed(puzzle, clue, domains=None):
+    """
+    Check whether a clue follows from the other clues of the puzzle.
+
+    Starting from the fixpoint of the other clues, the clue's first value is tried in each of its
+    remaining houses with the second value restricted to the houses the clue forbids; the clue is
+    implied when none of these violations extends to a solution. The fixpoint is computed once and
+    each violation only propagates from the values it changed.
+
+    :param puzzle: CompiledPuzzle containing the clue.
+    :param clue: CompiledClue to test.
+    :param domains: Fixpoint of the other clues if already known, to skip the first propagation.
+    :return: True if every solution of the other clues satisfies the clue.
+    """
+    others = without_clue(puzzle, clue)
+    if domains is None:
+        domains = others.initial_domains()
+        if not propagate(others, domains):
+            return True
+    if clue.b is None:
+        violation = list(domains)
+        violation[clue.a] &= ~clue.mask
+        return not violation[clue.a] or solve_domains(others, violation, queue=[clue.a]) is None
+    for bit in house_bits(domains[clue.a]):
+        violation = list(domains)
+        violation[clue.a] = bit
+        violation[clue.b] &= ~clue.forward(bit)
+        if violation[clue.b] and solve_domains(others, violation, queue=[clue.a, clue.b]) is not None:
+            return False
+    return True
+
+
+def analyze_clues(attributes, constraints, num_houses=5, limit=2):
+    """
+    Report, per clue, how many house values it prunes and whether the other clues imply it.
+
+    Pruning is counted over a search for the first solutions rather than the root alone, since
+    most clues only bite once some values are placed; two are enough to tell a unique puzzle
+    apart, and a loose puzzle can have millions.
+
+    :param attributes: Dictionary of attribute types and their possible values.
+    :param constraints: List of constraint dictionaries.
+    :param num_houses: The number of houses in the puzzle (default is 5).
+    :param limit: Solutions searched for while counting pruning (default is 2; None searches all).
+    :return: List of ClueReport in constraint order (unsupported constraints are left out).
+    """
+    puzzle = CompiledPuzzle(attributes, constraints, num_houses)
+    counter = PruneCounter(puzzle)
+
+    def reduce(domains, queue):
+        counter.watch(domains)
+        return propagate(puzzle, domains, queue, counter)
+
+    for _ in islice(iter_solutions(puzzle, reduce=reduce), limit):
+        pass
+    fixpoint, idle = idle_clues(puzzle)
+    return [ClueReport(clue.constraint, counter.pruned[clue.id],
+                       is_entailed(puzzle, clue, fixpoint if clue.id in idle else None))
+            for clue in puzzle.clues]
+
+
+def drop_redundant_clues(attributes, constraints, num_houses=5):
+    """
+    Remove clues implied by the others, one at a time, without changing the puzzle's solutions.
+
+    Clues are tested in order against the clues still kept, so of two clues implying each other
+    only the first is dropped. The puzzle's fixpoint is shared by the idle clues until a clue that
+    pruned something is dropped; the others are tested from their own fixpoint.
+
+    :return: The remaining constraint dictionaries, in their original order.
+    """
+    kept = list(constraints)
+    puzzle = CompiledPuzzle(attributes, kept, num_houses)
+    fixpoint, idle = idle_clues(puzzle)
+    for clue in list(puzzle.clues):
+        if is_entailed(puzzle, clue, fixpoint if clue.id in idle else None):
+            puzzle = without_clue(puzzle, clue)
+            kept.remove(clue.constraint)
+            if clue.id not in idle:
+                idle = set()
+    return kept
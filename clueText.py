@@ -0,0 +1,201 @@
+# clueText.py
+
+# Define the role of each attribute type
+ATTRIBUTE_ROLES = {
+    'color': 'house',
+    'nationality': 'person',
+    'beverage': 'drink',
+    'cigarette': 'smoker',
+    'pet': 'pet'
+}
+
+
+def _keep(value):
+    return value
+
+
+def _lower(value):
+    return value.lower()
+
+
+def _sentence_start(value):
+    return value.lower().capitalize()
+
+
+# Sentence templates per relation and (role1, role2). Each entry is (format string, transform for {0}, transform for {1}).
+# Pairs listed in one order also match the reverse order with the values swapped.
+SAME_HOUSE_TEMPLATES = {
+    ('person', 'house'): ("The {0} person lives in the {1} house.", _keep, _lower),
+    ('smoker', 'pet'): ("The {0} smoker has a {1}.", _keep, _lower),
+    ('person', 'drink'): ("The {0} person drinks {1}.", _keep, _lower),
+    ('smoker', 'drink'): ("The {0} smoker drinks {1}.", _keep, _lower),
+    ('drink', 'house'): ("{0} is drunk in the {1} house.", _sentence_start, _lower),
+    ('person', 'pet'): ("The {0} person has a {1}.", _keep, _lower),
+    ('person', 'smoker'): ("The {0} person is a {1} smoker.", _keep, _keep),
+    ('pet', 'house'): ("The owner with a {0} is in the {1} house.", _lower, _lower),
+    ('smoker', 'house'): ("The {0} smoker is in the {1} house.", _keep, _lower),
+    ('pet', 'beverage'): ("The house with a {0} enjoys {1}.", _lower, _lower),
+}
+LEFT_OF_TEMPLATES = {
+    ('house', 'house'): ("the {0} house is immediately to the left of the {1} house.", _lower, _lower),
+}
+NEXT_TO_TEMPLATES = {
+    ('smoker', 'pet'): ("The {0} smoker is next to the house with a {1}.", _keep, _lower),
+    ('person', 'pet'): ("The {0} person is next to the house with a {1}.", _keep, _lower),
+}
+RELATION_TEMPLATES = {
+    'same_house': SAME_HOUSE_TEMPLATES,
+    'left_of': LEFT_OF_TEMPLATES,
+    'next_to': NEXT_TO_TEMPLATES,
+}
+
+
+def _fallback_template(relation, attr1, attr2):
+    """ Generic wording used when no role-specific template matches. """
+    if relation == 'same_house':
+        return "The {0} is in the same house as the {1}.", _lower, _lower
+    # Attribute names are constants of the template, so they are inlined once here
+    attr1 = attr1.replace('{', '{{').replace('}', '}}')
+    attr2 = attr2.replace('{', '{{').replace('}', '}}')
+    if relation == 'left_of':
+        return f"The {{0}} {attr1} is immediately to the left of the {{1}} {attr2}.", _lower, _lower
+    return f"The {{0}} {attr1} is next to the {{1}} {attr2}.", _lower, _lower
+
+
+class ClueTemplates:
+    def __init__(self, attribute_roles):
+        """
+        Clue-text templates compiled for one attribute schema.
+
+        Every (relation, attr1, attr2) combination is resolved to a format string up front,
+        and rendered sentences are memoized, so translating a clue is a dictionary lookup
+        in the common case.
+
+        :param attribute_roles: Dictionary mapping attribute types to their roles (see ATTRIBUTE_ROLES).
+        """
+        self.attribute_roles = dict(attribute_roles)
+        self.templates = {}
+        self.sentences = {}
+        for relation in RELATION_TEMPLATES:
+            for attr1 in self.attribute_roles:
+                for attr2 in self.attribute_roles:
+                    self.template(relation, attr1, attr2)
+
+    def template(self, relation, attr1, attr2):
+        """
+        Look up (or compile) the template for a relation between two attribute types.
+
+        :return: Tuple (format string, swap, transform1, transform2); swap means the values
+                 fill the template in reverse order.
+        """
+        key = (relation, attr1, attr2)
+        entry = self.templates.get(key)
+        if entry is None:
+            role1 = self.attribute_roles.get(attr1)
+            role2 = self.attribute_roles.get(attr2)
+            table = RELATION_TEMPLATES[relation]
+            if (role1, role2) in table:
+                entry = (*table[(role1, role2)][:1], False, *table[(role1, role2)][1:])
+            elif (role2, role1) in table:
+                entry = (*table[(role2, role1)][:1], True, *table[(role2, role1)][1:])
+            else:
+                text, transform1, transform2 = _fallback_template(relation, attr1, attr2)
+                entry = (text, False, transform1, transform2)
+            self.templates[key] = entry
+        return entry
+
+    def render(self, relation, pair1, pair2):
+        """
+        Render one clue as an English sentence.
+
+        :param relation: 'same_house', 'left_of' or 'next_to'.
+        :param pair1: (attribute type, value) of the first item.
+        :param pair2: (attribute type, value) of the second item.
+        """
+        key = (relation, pair1, pair2)
+        sentence = self.sentences.get(key)
+        if sentence is None:
+            (attr1, val1), (attr2, val2) = pair1, pair2
+            text, swap, transform1, transform2 = self.template(relation, attr1, attr2)
+            if swap:
+                val1, val2 = val2, val1
+            sentence = text.format(transform1(val1), transform2(val2))
+            self.sentences[key] = sentence
+        return sentence
+
+    def translate(self, constraints):
+        """
+        Translates a list of constraint dictionaries into readable English sentences.
+
+        :param constraints: List of constraint dictionaries.
+        :return: List of readable English sentences.
+        """
+        translated = []
+        seen = set()
+        previous_houses = set()  # Track houses referenced in the previous clue
+
+        for constraint in constraints:
+            for relation in RELATION_TEMPLATES:
+                if relation in constraint:
+                    break
+            else:
+                continue  # Handle other constraint types if any
+            pair1, pair2 = constraint[relation]
+            sentence = self.render(relation, tuple(pair1), tuple(pair2))
+            current_houses = set(constraint.get('houses', []))
+
+            # Skip clues that mention a house from the previous clue to avoid consecutive mentions,
+            # and sentences that are already in the list to avoid duplicates
+            if current_houses & previous_houses or sentence in seen:
+                continue
+
+            translated.append(sentence)
+            seen.add(sentence)
+            previous_houses = current_houses  # Update previous houses
+
+        return translated
+
+
+_compiled_templates = {}
+
+
+def compile_clue_templates(attribute_roles=None):
+    """
+    Return the ClueTemplates for an attribute schema, compiling them on first use.
+
+    :param attribute_roles: Dictionary mapping attribute types to roles (default is ATTRIBUTE_ROLES).
+    """
+    if attribute_roles is None:
+        attribute_roles = ATTRIBUTE_ROLES
+    key = tuple(attribute_roles.items())
+    templates = _compiled_templates.get(key)
+    if templates is None:
+        templates = _compiled_templates[key] = ClueTemplates(attribute_roles)
+    return templates
+
+
+#Translate contraints into clues
+def translate_constraints(constraints, attribute_roles=None):
+    """
+    Translates a list of constraint dictionaries into readable English sentences.
+
+    :param constraints: List of constraint dictionaries.
+    :param attribute_roles: Optional role mapping; defaults to ATTRIBUTE_ROLES.
+    :return: List of readable English sentences.
+    """
+    return compile_clue_templates(attribute_roles).translate(constraints)
+
+
+def translate_constraint_batches(puzzles, attribute_roles=None):
+    """
+    Translate many puzzles, sharing one compiled template table and sentence cache.
+
+    This is a loop of ClueTemplates.translate over the puzzles: once the cache is warm a clue is a
+    dictionary lookup, and grouping clues by template across puzzles measured slower than the loop.
+
+    :param puzzles: Iterable of constraint lists.
+    :param attribute_roles: Optional role mapping; defaults to ATTRIBUTE_ROLES.
+    :return: List with the translated sentences of each puzzle.
+    """
+    translate = compile_clue_templates(attribute_roles).translate
+    return [translate(constraints) for constraints in puzzles]
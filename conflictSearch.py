@@ -0,0 +1,209 @@
+# conflictSearch.py
+
+from constraintPropagation import apply_unary
+from propagationSearch import house_bits
+from searchTrace import ASSIGN, PRUNE, BACKTRACK, SOLUTION
+from searchBudget import BudgetExpired
+
+
+class ConflictDirectedSearch:
+    def __init__(self, puzzle, trace=None, max_nogood_size=None, budget=None):
+        """
+        Forward checking with conflict-directed backjumping (FC-CBJ) and nogood learning.
+
+        Every value is placed in one of its remaining houses in turn (fewest houses first) and the
+        houses it rules out for the other values are removed, remembering which decision removed
+        them. When a value runs out of houses, the decisions responsible are its conflict set: the
+        search jumps straight back to the deepest of them instead of retrying the decisions in
+        between, and the failing combination of placements is learned as a nogood that is checked
+        for the rest of the search.
+
+        :param puzzle: CompiledPuzzle.
+        :param trace: Optional SearchTrace recording assign/prune/backtrack/solution events.
+        :param max_nogood_size: Only learn nogoods with at most this many placements (default is no limit).
+        :param budget: Optional SearchBudget; every node is offered to it and BudgetExpired is raised
+                       from iter_solutions() when it runs out.
+        """
+        self.puzzle = puzzle
+        self.trace = trace
+        self.max_nogood_size = max_nogood_size
+        self.budget = budget
+        self.stats = {'nodes': 0, 'backjumps': 0, 'nogoods': 0, 'nogood_hits': 0}
+
+        # Neighbours of each variable: (other, clue or None for the AllDifferent rule, variable is clue.a)
+        self.neighbours = [[] for _ in puzzle.variables]
+        for clue in puzzle.clues:
+            if clue.b is not None:
+                self.neighbours[clue.a].append((clue.b, clue, True))
+                self.neighbours[clue.b].append((clue.a, clue, False))
+        for group in puzzle.groups:
+            for var in group:
+                self.neighbours[var].extend((other, None, True) for other in group if other != var)
+
+        self.nogoods = {}  # (var, bit) -> list of learned nogoods (tuples of (var, bit)) containing it
+
+    def iter_solutions(self, domains=None):
+        """
+        Enumerate the solutions.
+
+        :param domains: Starting domains (default is the initial domains with unary clues applied).
+        :return: Generator of solved domain lists.
+        """
+        if domains is None:
+            domains = self.puzzle.initial_domains()
+            if apply_unary(self.puzzle, domains) is None:
+                return
+        self.domains = list(domains)
+        if not all(self.domains):
+            return
+        self.placed = []                               # (var, bit) of each decision, by depth
+        self.depth_of = [-1] * len(self.domains)
+        self.pruned = []                               # (var, old mask) removed by each decision
+        self.past_fc = [[] for _ in self.domains]      # Depths whose decisions removed houses of each var
+        self.solutions = 0
+        yield from self._search(0)
+
+    def _choose(self):
+        best = None
+        best_count = None
+        for var, mask in enumerate(self.domains):
+            if self.depth_of[var] < 0:
+                count = bin(mask).count('1')
+                if best_count is None or count < best_count:
+                    best, best_count = var, count
+                    if count == 1:
+                        break
+        return best
+
+    def _record(self, op, var, bit):
+        attr, val = self.puzzle.variables[var]
+        self.trace.record(op, bit.bit_length(), attr, val)
+
+    def _search(self, depth):
+        var = self._choose()
+        if var is None:
+            self.solutions += 1
+            if self.trace is not None:
+                self.trace.record(SOLUTION, 0, None, None)
+            yield list(self.domains)
+            # Continuing after a solution must retry every decision in turn
+            return set(range(depth))
+
+        self.stats['nodes'] += 1
+        if self.budget is not None:
+            self.budget.offer_domains(self.domains)
+            self.budget.tick()
+        solutions_before = self.solutions
+        conflict = set(self.past_fc[var])
+        for bit in house_bits(self.domains[var]):
+            culprits = self._check_nogoods(var, bit)
+            if culprits is not None:
+                conflict |= culprits
+                continue
+            culprits = self._assign(var, bit, depth)
+            if culprits is not None:
+                self._undo(var, depth)
+                conflict |= culprits
+                continue
+            below = yield from self._search(depth + 1)
+            self._undo(var, depth)
+            if depth not in below:
+                # This decision played no part in the failure below: jump over it
+                self.stats['backjumps'] += 1
+                return below
+            conflict |= below - {depth}
+
+        if self.solutions == solutions_before:
+            self._learn(conflict)
+        return conflict
+
+    def _assign(self, var, bit, depth):
+        """
+        Place var in the house `bit` and forward check its neighbours.
+
+        :return: None on success, otherwise the depths responsible for the neighbour left without a house.
+        """
+        self.placed.append((var, bit))
+        self.depth_of[var] = depth
+        pruned = [(var, self.domains[var])]
+        self.pruned.append(pruned)
+        self.domains[var] = bit
+        if self.trace is not None:
+            self._record(ASSIGN, var, bit)
+
+        for other, clue, forward in self.neighbours[var]:
+            if self.depth_of[other] >= 0:
+                continue
+            old = self.domains[other]
+            if clue is None:
+                new = old & ~bit
+            elif forward:
+                new = old & clue.forward(bit)
+            else:
+                new = old & clue.backward(bit)
+            if new == old:
+                continue
+            pruned.append((other, old))
+            self.domains[other] = new
+            if not self.past_fc[other] or self.past_fc[other][-1] != depth:
+                self.past_fc[other].append(depth)
+            if self.trace is not None:
+                for removed in house_bits(old & ~new):
+                    self._record(PRUNE, other, removed)
+            if not new:
+                return set(self.past_fc[other]) - {depth}
+        return None
+
+    def _undo(self, var, depth):
+        for other, old in reversed(self.pruned.pop()):
+            self.domains[other] = old
+            if self.past_fc[other] and self.past_fc[other][-1] == depth:
+                self.past_fc[other].pop()
+        _, bit = self.placed.pop()
+        self.depth_of[var] = -1
+        if self.trace is not None:
+            self._record(BACKTRACK, var, bit)
+
+    def _check_nogoods(self, var, bit):
+        """ Return the depths of the other placements of a learned nogood completed by var=bit, or None. """
+        for nogood in self.nogoods.get((var, bit), ()):
+            depths = set()
+            for other, other_bit in nogood:
+                if other == var:
+                    continue
+                depth = self.depth_of[other]
+                if depth < 0 or self.domains[other] != other_bit:
+                    break
+                depths.add(depth)
+            else:
+                self.stats['nogood_hits'] += 1
+                return depths
+        return None
+
+    def _learn(self, conflict):
+        if not conflict:
+            return
+        if self.max_nogood_size is not None and len(conflict) > self.max_nogood_size:
+            return
+        nogood = tuple(self.placed[depth] for depth in sorted(conflict))
+        for literal in nogood:
+            self.nogoods.setdefault(literal, []).append(nogood)
+        self.stats['nogoods'] += 1
+
+
+def solve_cbj(puzzle, trace=None, stats=None, budget=None):
+    """
+    Return the domains of the first solution found by ConflictDirectedSearch, or None if there is none.
+
+    :param stats: Optional dictionary updated with the search counters (nodes, backjumps, nogoods, nogood_hits).
+    :param budget: Optional SearchBudget; None is also returned when it runs out, with the partial
+                   result in budget.best.
+    """
+    search = ConflictDirectedSearch(puzzle, trace, budget=budget)
+    try:
+        solution = next(search.iter_solutions(), None)
+    except BudgetExpired:
+        solution = None
+    if stats is not None:
+        stats.update(search.stats)
+    return solution
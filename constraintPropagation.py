@@ -0,0 +1,347 @@
+# constraintPropagation.py
+
+import hashlib
+import json
+from collections import deque
+
+# Binary clue types: each maps a mask of houses for the first value to the houses the second value
+# may still occupy (forward), and the reverse (backward). House h is bit h - 1 of a mask.
+RELATIONS = {
+    # Both values are in the same house
+    'same_house': (lambda mask, full: mask, lambda mask, full: mask),
+    # The values are in adjacent houses
+    'next_to': (lambda mask, full: ((mask << 1) | (mask >> 1)) & full,
+                lambda mask, full: ((mask << 1) | (mask >> 1)) & full),
+    # The first value is immediately to the left of the second
+    'left_of': (lambda mask, full: (mask << 1) & full, lambda mask, full: mask >> 1),
+    # The first value is in a lower-numbered house than the second (symmetry breaking, not a player clue)
+    'before': (lambda mask, full: full & -((mask & -mask) << 1) if mask else 0,
+               lambda mask, full: (1 << (mask.bit_length() - 1)) - 1 if mask else 0),
+}
+# Single-value clue types; the clue's 'houses' list holds the houses the value may occupy
+UNARY_KINDS = ('in_house',)
+CONSTRAINT_KINDS = tuple(RELATIONS) + UNARY_KINDS
+
+
+def constraint_kind(constraint):
+    """ Return the clue type of a constraint dictionary, or None if it is not supported. """
+    for kind in CONSTRAINT_KINDS:
+        if kind in constraint:
+            return kind
+    return None
+
+
+def house_mask(houses):
+    """ Bitmask of a list of 1-based house numbers. """
+    mask = 0
+    for house in houses:
+        mask |= 1 << (house - 1)
+    return mask
+
+
+def mask_houses(mask):
+    """ List of the 1-based house numbers set in a bitmask. """
+    houses = []
+    house = 1
+    while mask:
+        if mask & 1:
+            houses.append(house)
+        mask >>= 1
+        house += 1
+    return houses
+
+
+def single_house(mask):
+    """ House number if exactly one house is left in the mask, otherwise 0. """
+    if mask and not mask & (mask - 1):
+        return mask.bit_length()
+    return 0
+
+
+class CompiledClue:
+    __slots__ = ('id', 'kind', 'a', 'b', 'forward', 'backward', 'mask', 'constraint')
+
+    def __init__(self, clue_id, kind, a, b=None, forward=None, backward=None, mask=0, constraint=None):
+        """
+        A clue over variable ids.
+
+        :param clue_id: Position of the clue in the puzzle's constraint list.
+        :param kind: Clue type (see CONSTRAINT_KINDS).
+        :param a: Variable id of the first value.
+        :param b: Variable id of the second value, None for unary clues.
+        :param forward: Function mapping a's house mask to the houses b may occupy.
+        :param backward: Function mapping b's house mask to the houses a may occupy.
+        :param mask: Allowed houses of a unary clue.
+        :param constraint: The original constraint dictionary.
+        """
+        self.id = clue_id
+        self.kind = kind
+        self.a = a
+        self.b = b
+        self.forward = forward
+        self.backward = backward
+        self.mask = mask
+        self.constraint = constraint
+
+
+class CompiledPuzzle:
+    def __init__(self, attributes, constraints, num_houses=5):
+        """
+        Puzzle in the form used by the propagation engines.
+
+        Like ZebraRandomSolver, every attribute value is a variable whose domain is the set of houses
+        it may occupy; domains are stored as integer bitmasks (house h is bit h - 1).
+
+        :param attributes: Dictionary of attribute types and their possible values.
+        :param constraints: List of constraint dictionaries ('same_house', 'next_to', 'left_of', 'in_house').
+        :param num_houses: The number of houses in the puzzle (default is 5).
+        """
+        self.attributes = {attr: list(values) for attr, values in attributes.items()}
+        self.constraints = list(constraints)
+        self.num_houses = num_houses
+        self.full = (1 << num_houses) - 1
+
+        self.variables = []   # (attr, value) of each variable id
+        self.index = {}       # (attr, value) -> variable id
+        self.groups = []      # Variable ids of each attribute (an AllDifferent group)
+        self.group_of = []    # Group number of each variable
+        for attr, values in self.attributes.items():
+            group = []
+            for val in values:
+                self.index[(attr, val)] = len(self.variables)
+                group.append(len(self.variables))
+                self.variables.append((attr, val))
+                self.group_of.append(len(self.groups))
+            self.groups.append(group)
+        # Hidden singles only apply when every house must receive one value of the attribute
+        self.exact_groups = [len(group) == num_houses for group in self.groups]
+
+        self.clues = []
+        self.var_clues = [[] for _ in self.variables]  # Binary clues touching each variable
+        for clue_id, constraint in enumerate(self.constraints):
+            clue = self._compile(clue_id, constraint)
+            if clue is None:
+                continue
+            self.clues.append(clue)
+            if clue.b is not None:
+                self.var_clues[clue.a].append(clue)
+                if clue.b != clue.a:
+                    self.var_clues[clue.b].append(clue)
+
+    def _compile(self, clue_id, constraint):
+        kind = constraint_kind(constraint)
+        if kind is None:
+            print(f"CompiledPuzzle: Unknown constraint type: {constraint}")
+            return None
+        pairs = [self.index[tuple(pair)] for pair in constraint[kind]]
+        if kind in UNARY_KINDS:
+            return CompiledClue(clue_id, kind, pairs[0], mask=house_mask(constraint['houses']) & self.full,
+                                constraint=constraint)
+        forward, backward = RELATIONS[kind]
+        full = self.full
+        return CompiledClue(clue_id, kind, pairs[0], pairs[1],
+                            lambda mask: forward(mask, full), lambda mask: backward(mask, full),
+                            constraint=constraint)
+
+    def fingerprint(self):
+        """
+        Stable digest of the puzzle's logical content, used as a cache key.
+
+        Clue order and the informational 'houses' of binary clues are ignored; the houses of
+        unary clues are part of the clue and are included.
+        """
+        clues = sorted(
+            json.dumps([clue.kind, clue.a, clue.b, clue.mask]) for clue in self.clues)
+        content = json.dumps([self.num_houses, list(self.attributes.items()), clues])
+        return hashlib.sha1(content.encode('utf-8')).hexdigest()
+
+    def initial_domains(self):
+        """ Domains with every house still possible for every value. """
+        return [self.full] * len(self.variables)
+
+    def grid_domains(self, grid, domains=None, explain=None):
+        """
+        Narrow domains to the values already placed in a grid.
+
+        :param grid: List of house dictionaries {attr: value}; empty or missing cells are ignored.
+        :param domains: Domains to narrow in place (default is fresh initial domains).
+        :param explain: Optional Explanation recording the placed cells as givens.
+        :return: The domains, or None if the grid places a value in two houses.
+        """
+        if domains is None:
+            domains = self.initial_domains()
+        for house_num, house in enumerate(grid, start=1):
+            for attr, val in house.items():
+                var = self.index.get((attr, val))
+                if var is None:
+                    continue
+                domains[var] &= 1 << (house_num - 1)
+                if explain is not None:
+                    explain.given(var)
+                if not domains[var]:
+                    return None
+        return domains
+
+    def format_houses(self, domains):
+        """
+        Build house dictionaries from domains, like ZebraRandomSolver._format_solution.
+
+        Only values fixed to a single house are filled in.
+        """
+        houses = [{} for _ in range(self.num_houses)]
+        for var, (attr, val) in enumerate(self.variables):
+            house_num = single_house(domains[var])
+            if house_num:
+                houses[house_num - 1][attr] = val
+        return houses
+
+
+class Explanation:
+    def __init__(self, puzzle):
+        """
+        Records why each domain reduction happened during propagation.
+
+        For every variable it keeps the set of clue ids (and given grid cells) its reductions
+        depend on, and the propagation depth at which it was last reduced.
+
+        :param puzzle: The CompiledPuzzle being propagated.
+        """
+        self.num_clues = len(puzzle.constraints)
+        self.reasons = [frozenset() for _ in puzzle.variables]
+        self.depths = [0] * len(puzzle.variables)
+
+    def given(self, var):
+        # Given cells are stored after the clue ids so both fit in one set
+        self.reasons[var] = self.reasons[var] | {self.num_clues + var}
+
+    def derive(self, target, source, clue_id=None):
+        """ Record that `target` was reduced using `source`'s domain and the given clue. """
+        reasons = self.reasons[target]
+        if source is not None:
+            reasons = reasons | self.reasons[source]
+            self.depths[target] = max(self.depths[target], self.depths[source] + 1)
+        else:
+            self.depths[target] = max(self.depths[target], 1)
+        if clue_id is not None:
+            reasons = reasons | {clue_id}
+        self.reasons[target] = reasons
+
+    def clue_ids(self, var):
+        return sorted(r for r in self.reasons[var] if r < self.num_clues)
+
+    def given_vars(self, var):
+        return sorted(r - self.num_clues for r in self.reasons[var] if r >= self.num_clues)
+
+
+def apply_unary(puzzle, domains, explain=None):
+    """
+    Apply unary clues ('in_house') directly to the domains.
+
+    :return: List of variables whose domain changed, or None on a contradiction.
+    """
+    changed = []
+    for clue in puzzle.clues:
+        if clue.b is None:
+            new = domains[clue.a] & clue.mask
+            if new != domains[clue.a]:
+                if not new:
+                    return None
+                domains[clue.a] = new
+                changed.append(clue.a)
+                if explain is not None:
+                    explain.derive(clue.a, None, clue.id)
+    return changed
+
+
+def propagate(puzzle, domains, queue=None, explain=None):
+    """
+    Reduce domains to a fixpoint of the clues and the AllDifferent rule of each attribute.
+
+    Binary clues are made arc consistent; AllDifferent removes the house of a placed value from
+    the other values of its attribute and places a value when it is the only one left for a house.
+
+    :param puzzle: CompiledPuzzle.
+    :param domains: List of house bitmasks per variable, narrowed in place.
+    :param queue: Variables whose domains changed (default is all variables, after unary clues).
+    :param explain: Optional Explanation recording the reason of every reduction.
+    :return: True if the domains are consistent, False if some value has no house left.
+    """
+    if queue is None:
+        if apply_unary(puzzle, domains, explain) is None:
+            return False
+        queue = range(len(domains))
+    queue = deque(queue)
+    queued = bytearray(len(domains))
+    for var in queue:
+        queued[var] = 1
+    var_clues = puzzle.var_clues
+    groups = puzzle.groups
+    group_of = puzzle.group_of
+    exact_groups = puzzle.exact_groups
+    full = puzzle.full
+
+    while queue:
+        var = queue.popleft()
+        queued[var] = 0
+        mask = domains[var]
+
+        for clue in var_clues[var]:
+            if clue.a == var:
+                other = clue.b
+                allowed = clue.forward(mask)
+            else:
+                other = clue.a
+                allowed = clue.backward(mask)
+            new = domains[other] & allowed
+            if new != domains[other]:
+                if not new:
+                    return False
+                domains[other] = new
+                if explain is not None:
+                    explain.derive(other, var, clue.id)
+                if not queued[other]:
+                    queued[other] = 1
+                    queue.append(other)
+            if other == var:
+                mask = domains[var]
+
+        group_number = group_of[var]
+        group = groups[group_number]
+        if not mask & (mask - 1):
+            # Placed value: no other value of the attribute may use its house
+            for other in group:
+                if other != var and domains[other] & mask:
+                    new = domains[other] & ~mask
+                    if not new:
+                        return False
+                    domains[other] = new
+                    if explain is not None:
+                        explain.derive(other, var)
+                    if not queued[other]:
+                        queued[other] = 1
+                        queue.append(other)
+
+        if exact_groups[group_number]:
+            # Hidden single: a house only one value of the attribute can still occupy
+            once = multiple = 0
+            for other in group:
+                multiple |= once & domains[other]
+                once |= domains[other]
+            if once != full:
+                return False
+            singles = once & ~multiple
+            if singles:
+                for other in group:
+                    hit = domains[other] & singles
+                    if hit and hit != domains[other]:
+                        if hit & (hit - 1):
+                            return False
+                        domains[other] = hit
+                        if explain is not None:
+                            for source in group:
+                                if source != other:
+                                    explain.derive(other, source)
+                        if not queued[other]:
+                            queued[other] = 1
+                            queue.append(other)
+    return True
@@ -0,0 +1,219 @@
+# difficultyRater.py
+
+from collections import OrderedDict
+from constraintPropagation import CompiledPuzzle, propagate
+from propagationSearch import iter_solutions, is_solved, house_bits
+from puzzleFormat import PuzzleBank, PuzzleBankWriter
+
+# Inference tiers, from cheapest to strongest
+PROPAGATION = 1  # Clue arc consistency, placed values and hidden singles
+PAIRWISE = 2     # Naked and hidden pairs within an attribute
+LOOKAHEAD = 3    # Try each remaining house of a value and discard those that fail
+SEARCH = 4       # Guessing with backtracking
+UNSOLVABLE = 0xFF  # No solution; above every tier so such puzzles sort last (fits the bank's rating byte)
+TIER_NAMES = {PROPAGATION: 'propagation', PAIRWISE: 'pairwise', LOOKAHEAD: 'lookahead', SEARCH: 'search',
+              UNSOLVABLE: 'unsolvable'}
+
+# Most ratings kept by rate_puzzle; the least recently used are dropped beyond this
+CACHE_SIZE = 1024
+
+
+class Rating:
+    def __init__(self, tier, branches=0, solutions=1):
+        """
+        Difficulty of a puzzle.
+
+        :param tier: Strongest inference tier needed to solve it (1-4), UNSOLVABLE if it has no solution.
+        :param branches: Search branches tried when tier is SEARCH (0 otherwise).
+        :param solutions: Number of solutions found: 0, 1, or 2 meaning "more than one".
+        """
+        self.tier = tier
+        self.branches = branches
+        self.solutions = solutions
+
+    @property
+    def name(self):
+        return TIER_NAMES.get(self.tier, 'unsolvable')
+
+    def sort_key(self):
+        return (self.tier, self.branches)
+
+    def __repr__(self):
+        return f"Rating({self.name}, branches={self.branches}, solutions={self.solutions})"
+
+
+def pairwise_reduce(puzzle, domains):
+    """
+    Apply Hall sets of size two within every attribute.
+
+    Naked pair: two values limited to the same two houses take those houses from the others.
+    Hidden pair: two houses only two values can occupy restrict those values to them.
+
+    :return: List of variables whose domains changed, or None on a contradiction.
+    """
+    changed = []
+    for group_number, group in enumerate(puzzle.groups):
+        pairs = {}
+        for var in group:
+            mask = domains[var]
+            if bin(mask).count('1') == 2:
+                if mask in pairs:
+                    for other in group:
+                        if other != var and other != pairs[mask] and domains[other] & mask:
+                            domains[other] &= ~mask
+                            if not domains[other]:
+                                return None
+                            changed.append(other)
+                else:
+                    pairs[mask] = var
+
+        if not puzzle.exact_groups[group_number]:
+            continue
+        holders = {}  # House bit -> bitmask of group positions that can take it
+        for bit in house_bits(puzzle.full):
+            holders[bit] = sum(1 << i for i, var in enumerate(group) if domains[var] & bit)
+        seen = {}
+        for bit, who in holders.items():
+            if bin(who).count('1') != 2:
+                continue
+            if who in seen:
+                houses = bit | seen[who]
+                for i, var in enumerate(group):
+                    if who >> i & 1 and domains[var] & ~houses:
+                        domains[var] &= houses
+                        changed.append(var)
+            else:
+                seen[who] = bit
+    return changed
+
+
+def lookahead_reduce(puzzle, domains, closure):
+    """
+    Failed-value probing: place a value in each of its houses in turn and drop houses that fail.
+
+    :param closure: Function (domains, queue) -> bool used to test each placement.
+    :return: List of variables whose domains changed, or None on a contradiction.
+    """
+    changed = []
+    for var, mask in enumerate(domains):
+        if not mask & (mask - 1):
+            continue
+        for bit in house_bits(mask):
+            trial = list(domains)
+            trial[var] = bit
+            if not closure(trial, [var]):
+                domains[var] &= ~bit
+                if not domains[var]:
+                    return None
+        if domains[var] != mask:
+            changed.append(var)
+            if not closure(domains, [var]):
+                return None
+    return changed
+
+
+def make_reducer(puzzle, max_tier, used=None):
+    """
+    Build a node reduction applying the tiers up to max_tier until none makes progress.
+
+    :param used: Optional set collecting the tiers that made progress.
+    :return: Function (domains, queue) -> bool.
+    """
+    def reduce(domains, queue):
+        if not propagate(puzzle, domains, queue):
+            return False
+        while not is_solved(domains):
+            if max_tier >= PAIRWISE:
+                changed = pairwise_reduce(puzzle, domains)
+                if changed is None:
+                    return False
+                if changed:
+                    if used is not None:
+                        used.add(PAIRWISE)
+                    if not propagate(puzzle, domains, changed):
+                        return False
+                    continue
+            if max_tier >= LOOKAHEAD:
+                changed = lookahead_reduce(puzzle, domains, make_reducer(puzzle, PAIRWISE))
+                if changed is None:
+                    return False
+                if changed:
+                    if used is not None:
+                        used.add(LOOKAHEAD)
+                    continue
+            break
+        return True
+    return reduce
+
+
+_rating_cache = OrderedDict()
+
+
+def rate_compiled(puzzle):
+    """
+    Rate a CompiledPuzzle (uncached).
+
+    The tiers are applied from the weakest up; search only starts when lookahead is stuck, and
+    then runs with tiers 1-2 at every node until a second solution is found or the tree is exhausted.
+    """
+    used = {PROPAGATION}
+    domains = puzzle.initial_domains()
+    if not make_reducer(puzzle, LOOKAHEAD, used)(domains, None):
+        return Rating(UNSOLVABLE, solutions=0)
+    if is_solved(domains):
+        return Rating(max(used))
+
+    stats = {'branches': 0}
+    solutions = 0
+    for _ in iter_solutions(puzzle, domains, make_reducer(puzzle, PAIRWISE), stats):
+        solutions += 1
+        if solutions == 2:
+            break
+    return Rating(SEARCH if solutions else UNSOLVABLE, stats['branches'], solutions)
+
+
+def rate_puzzle(attributes, constraints, num_houses=5):
+    """
+    Rate a puzzle, reusing the cached rating of an identical puzzle (the CACHE_SIZE most recent are kept).
+
+    :param attributes: Dictionary of attribute types and their possible values.
+    :param constraints: List of constraint dictionaries.
+    :param num_houses: The number of houses in the puzzle (default is 5).
+    :return: Rating.
+    """
+    puzzle = CompiledPuzzle(attributes, constraints, num_houses)
+    key = puzzle.fingerprint()
+    if key in _rating_cache:
+        _rating_cache.move_to_end(key)
+        return _rating_cache[key]
+    rating = _rating_cache[key] = rate_compiled(puzzle)
+    if len(_rating_cache) > CACHE_SIZE:
+        _rating_cache.popitem(last=False)
+    return rating
+
+
+def sort_puzzle_bank(source_path, target_path):
+    """
+    Offline pass: rate every puzzle of a bank and write a copy sorted from easiest to hardest.
+
+    Ratings are stored in the new bank next to each puzzle; puzzles that already carry a rating
+    are not rated again. Unsolvable puzzles are written last.
+
+    :return: Number of puzzles written.
+    """
+    with PuzzleBank(source_path) as bank:
+        attributes = bank.schema.attributes
+        ratings = []
+        for index in range(len(bank)):
+            rating = bank.rating(index)
+            if rating is None:
+                constraints, solution, num_houses = bank[index]
+                rating = rate_puzzle(attributes, constraints, num_houses)
+                rating = (rating.tier, rating.branches)
+            ratings.append((rating, index))
+        ratings.sort()
+        with PuzzleBankWriter(target_path, attributes) as writer:
+            for rating, index in ratings:
+                constraints, solution, num_houses = bank[index]
+                writer.append(constraints, num_houses, solution, rating)
+    return len(ratings)
@@ -0,0 +1,65 @@
+# domainReduction.py
+
+from constraintPropagation import CompiledPuzzle, propagate, mask_houses
+
+
+def reduce_domains(attributes, constraints, num_houses=5):
+    """
+    Pre-solve pass: apply the clues to the house domains of every value before search.
+
+    Positional clues ('in_house') fix their values directly, and propagation carries the effect
+    through same_house, next_to, left_of and the AllDifferent rule of each attribute.
+
+    :param attributes: Dictionary of attribute types and their possible values.
+    :param constraints: List of constraint dictionaries.
+    :param num_houses: The number of houses in the puzzle (default is 5).
+    :return: Dictionary (attr, value) -> list of houses still possible, or None if the clues contradict.
+    """
+    puzzle = CompiledPuzzle(attributes, constraints, num_houses)
+    domains = puzzle.initial_domains()
+    if not propagate(puzzle, domains):
+        return None
+    return {pair: mask_houses(domains[var]) for var, pair in enumerate(puzzle.variables)}
+
+
+def house_domains(attributes, value_houses, num_houses=5):
+    """
+    Turn value domains into the domains of per-house variables, as used by backTracking.ZebraPuzzleSolver.
+
+    :param value_houses: Result of reduce_domains.
+    :return: Dictionary attr -> list (house 1 first) of the values each house may still hold.
+    """
+    domains = {}
+    for attr, values in attributes.items():
+        domains[attr] = [[val for val in values if house in value_houses[(attr, val)]]
+                         for house in range(1, num_houses + 1)]
+    return domains
+
+
+def same_house_classes(attributes, constraints):
+    """
+    Group values that same_house clues force into one house, so they can share a single variable.
+
+    Two values of the same attribute are never merged (that clue is a contradiction and is left to
+    the search to report).
+
+    :return: Dictionary (attr, value) -> representative (attr, value) of its class.
+    """
+    parent = {(attr, val): (attr, val) for attr, values in attributes.items() for val in values}
+    members = {pair: {pair[0]} for pair in parent}  # Attribute types in each class, kept on the root
+
+    def find(pair):
+        while parent[pair] != pair:
+            parent[pair] = parent[parent[pair]]
+            pair = parent[pair]
+        return pair
+
+    for constraint in constraints:
+        if 'same_house' not in constraint:
+            continue
+        first, second = (find(tuple(pair)) for pair in constraint['same_house'])
+        if first == second or members[first] & members[second]:
+            continue
+        parent[second] = first
+        members[first] |= members.pop(second)
+    return {pair: find(pair) for pair in parent}
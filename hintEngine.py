@@ -0,0 +1,106 @@
+# hintEngine.py
+
+from constraintPropagation import Explanation, propagate, single_house, mask_houses
+
+
+class Hint:
+    def __init__(self, kind, house=None, attribute=None, value=None, houses=None, constraints=(), cells=()):
+        """
+        A single deduction offered to the player.
+
+        :param kind: 'place' (value belongs in house), 'exclude' (value is ruled out of some houses),
+                     'conflict' (the grid contradicts the clues) or 'none' (propagation finds nothing new).
+        :param house: House number of a 'place' hint.
+        :param attribute: Attribute type of the value the hint is about.
+        :param value: The attribute value the hint is about.
+        :param houses: Houses the value may still occupy, for 'exclude' hints.
+        :param constraints: Constraint dictionaries that force the deduction.
+        :param cells: (house, attribute, value) grid entries the deduction (or conflict) relies on.
+        """
+        self.kind = kind
+        self.house = house
+        self.attribute = attribute
+        self.value = value
+        self.houses = houses
+        self.constraints = list(constraints)
+        self.cells = list(cells)
+
+    def __str__(self):
+        if self.kind == 'place':
+            return f"The {self.attribute} '{self.value}' must be in house {self.house}."
+        if self.kind == 'exclude':
+            houses = ", ".join(str(h) for h in self.houses)
+            return f"The {self.attribute} '{self.value}' can only be in house {houses}."
+        if self.kind == 'conflict':
+            cells = ", ".join(f"{value} in house {house}" for house, _, value in self.cells)
+            return f"Your grid contradicts the clues: {cells}."
+        return "No further deduction follows directly from the clues."
+
+
+def _given_cells(puzzle, domains, variables):
+    cells = []
+    for var in variables:
+        attr, val = puzzle.variables[var]
+        cells.append((single_house(domains[var]), attr, val))
+    return cells
+
+
+def _conflicting_cells(puzzle, grid):
+    """
+    Shrink the player's entries to a minimal set that still contradicts the clues.
+
+    Each cell is dropped in turn and kept out if the rest still fails to propagate.
+    """
+    cells = [(house_num, attr, val) for house_num, house in enumerate(grid, start=1)
+             for attr, val in house.items() if (attr, val) in puzzle.index]
+    for cell in list(cells):
+        trial = [c for c in cells if c is not cell]
+        subgrid = [{} for _ in grid]
+        for house_num, attr, val in trial:
+            subgrid[house_num - 1][attr] = val
+        domains = puzzle.grid_domains(subgrid)
+        if domains is None or not propagate(puzzle, domains):
+            cells = trial
+    return cells
+
+
+def next_hint(puzzle, grid):
+    """
+    Find the cheapest deduction forced by the clues from the current grid, using propagation only.
+
+    The player's entries are taken as given. Among the values propagation fixes to a house that
+    the grid doesn't show yet, the one reached in the fewest propagation steps (then with the
+    fewest clues involved) is returned. If nothing can be placed, the cheapest elimination is
+    returned instead.
+
+    :param puzzle: CompiledPuzzle of the puzzle being played.
+    :param grid: List of house dictionaries {attr: value} with the player's current entries.
+    :return: A Hint.
+    """
+    explain = Explanation(puzzle)
+    domains = puzzle.grid_domains(grid, explain=explain)
+    if domains is None or not propagate(puzzle, domains, explain=explain):
+        return Hint('conflict', cells=_conflicting_cells(puzzle, grid))
+    start = puzzle.grid_domains(grid)
+
+    placements = []
+    eliminations = []
+    for var, mask in enumerate(domains):
+        if mask == start[var]:
+            continue
+        rank = (explain.depths[var], len(explain.reasons[var]), var)
+        if single_house(mask) and not single_house(start[var]):
+            placements.append(rank)
+        else:
+            eliminations.append(rank)
+    if not placements and not eliminations:
+        return Hint('none')
+
+    var = min(placements or eliminations)[-1]
+    attr, val = puzzle.variables[var]
+    constraints = [puzzle.constraints[i] for i in explain.clue_ids(var)]
+    cells = _given_cells(puzzle, domains, explain.given_vars(var))
+    if placements:
+        return Hint('place', single_house(domains[var]), attr, val, constraints=constraints, cells=cells)
+    return Hint('exclude', attribute=attr, value=val, houses=mask_houses(domains[var]),
+                constraints=constraints, cells=cells)
@@ -0,0 +1,199 @@
+# houseGrid.py
+
+from array import array
+from collections.abc import MutableMapping
+
+# Cell code of an empty cell
+EMPTY = -1
+
+
+class HouseGrid:
+    __slots__ = ('attributes', 'num_houses', 'column', 'values', 'value_ids', 'cells', 'positions', 'counts')
+
+    def __init__(self, attributes, num_houses=5):
+        """
+        Compact houses x attributes grid shared by the game, the checkers and the solvers.
+
+        Cells hold small integer value codes in one flat array (house-major), and each attribute
+        keeps the inverse index value -> house, so "where is value X" is a single lookup. Values not
+        listed in `attributes` are given a code the first time they are stored. A value may sit in
+        several houses while the player is editing; `counts` tracks that and where() then falls back
+        to scanning the attribute's column.
+
+        :param attributes: Dictionary of attribute types and their possible values, or a list of attribute types.
+        :param num_houses: The number of houses (default is 5).
+        """
+        self.attributes = list(attributes)
+        self.num_houses = num_houses
+        self.column = {attr: i for i, attr in enumerate(self.attributes)}
+        self.values = [list(attributes[attr]) if isinstance(attributes, dict) else [] for attr in self.attributes]
+        self.value_ids = [{val: i for i, val in enumerate(values)} for values in self.values]
+        self.cells = array('h', [EMPTY]) * (num_houses * len(self.attributes))
+        self.positions = [array('h', [EMPTY]) * len(values) for values in self.values]  # 0-based house of each value
+        self.counts = [array('h', [0]) * len(values) for values in self.values]
+
+    @classmethod
+    def from_dicts(cls, attributes, houses, num_houses=None):
+        """ Grid holding a list of house dictionaries (house 1 first); the number of houses defaults to its length. """
+        grid = cls(attributes, len(houses) if num_houses is None else num_houses)
+        grid.load(houses)
+        return grid
+
+    def _value_id(self, col, value):
+        ids = self.value_ids[col]
+        if value not in ids:
+            ids[value] = len(self.values[col])
+            self.values[col].append(value)
+            self.positions[col].append(EMPTY)
+            self.counts[col].append(0)
+        return ids[value]
+
+    def get(self, house_index, attr):
+        """ Value of an attribute in a house (0-based index), or None if the cell is empty. """
+        col = self.column[attr]
+        code = self.cells[house_index * len(self.attributes) + col]
+        return None if code == EMPTY else self.values[col][code]
+
+    def set(self, house_index, attr, value):
+        """ Store a value in a cell; None or "" empties it. """
+        col = self.column[attr]
+        cell = house_index * len(self.attributes) + col
+        old = self.cells[cell]
+        if old != EMPTY:
+            self.cells[cell] = EMPTY
+            self.counts[col][old] -= 1
+            if self.positions[col][old] == house_index:
+                # The value may still be duplicated elsewhere while the player edits
+                self.positions[col][old] = EMPTY if not self.counts[col][old] else self._scan(col, old, None)
+        if value is None or value == "":
+            return
+        code = self._value_id(col, value)
+        self.cells[cell] = code
+        self.counts[col][code] += 1
+        self.positions[col][code] = house_index
+
+    def _scan(self, col, code, exclude):
+        width = len(self.attributes)
+        for house_index in range(self.num_houses):
+            if house_index != exclude and self.cells[house_index * width + col] == code:
+                return house_index
+        return EMPTY
+
+    def where(self, attr, value, exclude=None):
+        """
+        House holding a value.
+
+        :param attr: Attribute type.
+        :param value: Attribute value.
+        :param exclude: 0-based house index to ignore, to look for a duplicate of that house's value.
+        :return: 0-based house index, or None if no (other) house holds the value.
+        """
+        col = self.column[attr]
+        code = self.value_ids[col].get(value)
+        if code is None or not self.counts[col][code]:
+            return None
+        house_index = self.positions[col][code]
+        if house_index == exclude:
+            house_index = self._scan(col, code, exclude) if self.counts[col][code] > 1 else EMPTY
+        return None if house_index == EMPTY else house_index
+
+    def house(self, house_index):
+        """ Dictionary of the filled cells of a house. """
+        width = len(self.attributes)
+        base = house_index * width
+        return {attr: self.values[col][self.cells[base + col]]
+                for col, attr in enumerate(self.attributes) if self.cells[base + col] != EMPTY}
+
+    def to_dicts(self):
+        """ List of house dictionaries (house 1 first), as used by the solvers and the hint engine. """
+        return [self.house(house_index) for house_index in range(self.num_houses)]
+
+    def load(self, houses):
+        """ Replace the contents with a list of house dictionaries; keys that are not attributes are ignored. """
+        self.clear()
+        for house_index, cells in enumerate(houses):
+            for attr, value in cells.items():
+                if attr in self.column:
+                    self.set(house_index, attr, value)
+
+    def filled(self):
+        """ Number of non-empty cells. """
+        return sum(1 for code in self.cells if code != EMPTY)
+
+    def clear(self):
+        for col in range(len(self.attributes)):
+            self.positions[col] = array('h', [EMPTY]) * len(self.values[col])
+            self.counts[col] = array('h', [0]) * len(self.values[col])
+        self.cells = array('h', [EMPTY]) * len(self.cells)
+
+    def copy(self):
+        grid = HouseGrid(self.attributes, self.num_houses)
+        grid.values = [list(values) for values in self.values]
+        grid.value_ids = [dict(ids) for ids in self.value_ids]
+        grid.cells = array('h', self.cells)
+        grid.positions = [array('h', positions) for positions in self.positions]
+        grid.counts = [array('h', counts) for counts in self.counts]
+        return grid
+
+    def __len__(self):
+        return self.num_houses
+
+    def __getitem__(self, house_index):
+        if not -self.num_houses <= house_index < self.num_houses:
+            raise IndexError(house_index)
+        return HouseRow(self, house_index % self.num_houses)
+
+    def __iter__(self):
+        return (HouseRow(self, house_index) for house_index in range(self.num_houses))
+
+    def __repr__(self):
+        return f"HouseGrid({self.to_dicts()})"
+
+
+class HouseRow(MutableMapping):
+    __slots__ = ('grid', 'index')
+
+    def __init__(self, grid, index):
+        """
+        Dictionary view of one house of a HouseGrid, holding only its filled cells.
+
+        Lets code written for house dictionaries (house.get(attr), house[attr] = value,
+        del house[attr], attr in house, house.items()) work on the grid unchanged.
+        """
+        self.grid = grid
+        self.index = index
+
+    def __getitem__(self, attr):
+        value = self.grid.get(self.index, attr) if attr in self.grid.column else None
+        if value is None:
+            raise KeyError(attr)
+        return value
+
+    def __setitem__(self, attr, value):
+        self.grid.set(self.index, attr, value)
+
+    def __delitem__(self, attr):
+        if attr not in self:
+            raise KeyError(attr)
+        self.grid.set(self.index, attr, None)
+
+    def __iter__(self):
+        return iter(self.grid.house(self.index))
+
+    def __len__(self):
+        return len(self.grid.house(self.index))
+
+    def __repr__(self):
+        return repr(self.grid.house(self.index))
+
+
+def cell_property(attr):
+    """ Property exposing one attribute of a house object's grid cell, "" when the cell is empty. """
+    def get(house):
+        value = house.grid.get(house.index, attr)
+        return "" if value is None else value
+
+    def set(house, value):
+        house.grid.set(house.index, attr, value)
+
+    return property(get, set)
@@ -0,0 +1,175 @@
+# houseSweep.py
+
+from constraintPropagation import RELATIONS, UNARY_KINDS, propagate
+from searchBudget import BudgetExpired
+
+# Clue types the sweep can check from the state alone
+SWEEP_KINDS = tuple(RELATIONS) + UNARY_KINDS
+
+
+class HouseSweep:
+    def __init__(self, puzzle, domains=None):
+        """
+        Dynamic programming over the houses, left to right.
+
+        A state after house h is (values used in houses 1..h, values in house h), both stored as
+        variable bitmasks; the values of house h + 1 are chosen from that state alone. Every
+        supported clue relates values in the same or neighbouring houses, or (for 'before') only
+        needs to know whether a value was placed earlier. So a clue can be checked exactly once the
+        later of its two values is placed, using only the state. Paths that reach the same state are
+        merged and carry their number of completions, so solutions are counted without being listed.
+
+        The number of states grows with how loosely the clues tie the houses together; tightly
+        clued puzzles stay small even when they are large.
+
+        :param puzzle: CompiledPuzzle (only the clue types in SWEEP_KINDS are supported).
+        :param domains: Starting domains (default is the initial domains); they are propagated first.
+        """
+        for clue in puzzle.clues:
+            if clue.kind not in SWEEP_KINDS:
+                raise ValueError(f"HouseSweep: Unsupported constraint type: {clue.kind}")
+        self.puzzle = puzzle
+        self.stats = {'states': 0, 'max_frontier': 0}
+        self.domains = puzzle.initial_domains() if domains is None else list(domains)
+        if not propagate(puzzle, self.domains):
+            self.domains = None
+            return
+        self.all_values = (1 << len(puzzle.variables)) - 1
+        self.group_masks = [sum(1 << var for var in group) for group in puzzle.groups]
+        # Each clue is checked once the later of its attributes has been chosen for the house
+        self.group_clues = [[] for _ in puzzle.groups]
+        for clue in puzzle.clues:
+            last = puzzle.group_of[clue.a] if clue.b is None else max(puzzle.group_of[clue.a], puzzle.group_of[clue.b])
+            bits = 1 << clue.a if clue.b is None else (1 << clue.a) | (1 << clue.b)
+            self.group_clues[last].append((clue, bits))
+
+    def _position(self, var, house, used, prev, cur):
+        """ Houses (as a mask) `var` can occupy given the state while house `house` (0-based) is filled. """
+        bit = 1 << var
+        if cur & bit:
+            mask = 1 << house
+        elif prev & bit:
+            mask = 1 << (house - 1)
+        elif used & bit:
+            mask = (1 << max(house - 1, 0)) - 1
+        else:
+            mask = self.puzzle.full & ~((1 << (house + 1)) - 1)
+        return mask & self.domains[var]
+
+    def _holds(self, clue, house, used, prev, cur):
+        pos_a = self._position(clue.a, house, used, prev, cur)
+        if clue.b is None:
+            return bool(pos_a & clue.mask)
+        return bool(clue.forward(pos_a) & self._position(clue.b, house, used, prev, cur))
+
+    def _houses(self, house, used, prev):
+        """ Every valid choice of values for a house, as a variable mask. """
+        puzzle = self.puzzle
+        houses_left = puzzle.num_houses - house - 1
+        house_bit = 1 << house
+
+        def choose(group_number, cur):
+            if group_number == len(puzzle.groups):
+                yield cur
+                return
+            group = puzzle.groups[group_number]
+            unplaced = len(group) - bin(used & self.group_masks[group_number]).count('1')
+            options = [var for var in group if not used >> var & 1 and self.domains[var] & house_bit]
+            # Leaving the attribute empty in this house is only possible if its values still fit in the houses left
+            if unplaced <= houses_left:
+                options.append(None)
+            for var in options:
+                chosen = cur if var is None else cur | (1 << var)
+                if all(self._holds(clue, house, used, prev, chosen)
+                       for clue, bits in self.group_clues[group_number] if bits & (chosen | prev)):
+                    yield from choose(group_number + 1, chosen)
+
+        return choose(0, 0)
+
+    def sweep(self, record=False, budget=None):
+        """
+        Run the sweep over every house.
+
+        :param record: Keep the parent states of every layer, so solutions can be rebuilt.
+        :param budget: Optional SearchBudget ticked once per state expanded; BudgetExpired is raised when it runs out.
+        :return: Dictionary final state -> number of solutions reaching it (empty if there are none).
+        """
+        self.parents = []
+        if self.domains is None:
+            return {}
+        layer = {(0, 0): 1}  # (used, values of the last house) -> number of partial grids reaching it
+        for house in range(self.puzzle.num_houses):
+            following = {}
+            parents = {}
+            for state, count in layer.items():
+                if budget is not None:
+                    budget.tick()
+                used, prev = state
+                for cur in self._houses(house, used, prev):
+                    child = (used | cur, cur)
+                    following[child] = following.get(child, 0) + count
+                    if record:
+                        parents.setdefault(child, []).append(state)
+            layer = following
+            self.stats['states'] += len(layer)
+            self.stats['max_frontier'] = max(self.stats['max_frontier'], len(layer))
+            if record:
+                self.parents.append(parents)
+        return {state: count for state, count in layer.items() if state[0] == self.all_values}
+
+    def count(self, budget=None):
+        """ Exact number of solutions; only one layer of states is kept at a time. """
+        return sum(self.sweep(budget=budget).values())
+
+    def iter_solutions(self, budget=None):
+        """ Generator of solved domain lists, rebuilt from the recorded parent states. """
+        final = self.sweep(record=True, budget=budget)
+        num_houses = self.puzzle.num_houses
+
+        def walk(house, state, chosen):
+            chosen[house] = state[1]
+            if house == 0:
+                yield self._domains(chosen)
+                return
+            for parent in self.parents[house][state]:
+                yield from walk(house - 1, parent, chosen)
+
+        for state in final:
+            yield from walk(num_houses - 1, state, [0] * num_houses)
+
+    def _domains(self, chosen):
+        domains = [0] * len(self.puzzle.variables)
+        for house, cur in enumerate(chosen):
+            while cur:
+                bit = cur & -cur
+                domains[bit.bit_length() - 1] = 1 << house
+                cur ^= bit
+        return domains
+
+
+def solve_sweep(puzzle, stats=None, budget=None):
+    """
+    Return the domains of a solution found by HouseSweep, or None if there is none.
+
+    :param stats: Optional dictionary updated with 'states' and 'max_frontier'.
+    :param budget: Optional SearchBudget. None is also returned when it runs out; budget.best then
+                   holds the propagated root domains as the partial result.
+    """
+    sweep = HouseSweep(puzzle)
+    try:
+        return next(sweep.iter_solutions(budget), None)
+    except BudgetExpired:
+        budget.offer_domains(sweep.domains or puzzle.initial_domains())
+        return None
+    finally:
+        if stats is not None:
+            stats.update(sweep.stats)
+
+
+def count_sweep(puzzle, domains=None, stats=None):
+    """ Exact number of solutions of a puzzle, counted by HouseSweep without listing them. """
+    sweep = HouseSweep(puzzle, domains)
+    count = sweep.count()
+    if stats is not None:
+        stats.update(sweep.stats)
+    return count
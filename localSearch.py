@@ -0,0 +1,214 @@
+# localSearch.py
+
+import math
+import random
+import time
+from searchBudget import BudgetExpired
+
+# Probability of a random swap instead of the best one (min-conflicts noise)
+NOISE = 0.1
+# Annealing temperature at the start of each restart, and its decay per step
+START_TEMPERATURE = 2.0
+COOLING = 0.999
+# Restart from a fresh grid after this many steps without a new best
+STALL_STEPS = 2000
+
+
+class LocalSearch:
+    def __init__(self, puzzle, rng=random):
+        """
+        Min-conflicts local search with simulated annealing over complete grids.
+
+        Every attribute is kept as a permutation of its values over the houses, so the AllDifferent
+        rule always holds; a move swaps the houses of two values of one attribute (or moves a value
+        to an empty house when the attribute has fewer values than houses). The number of violated
+        clues is updated per swap from the clues of the two values involved only.
+
+        Finds any grid satisfying every clue; it does not prove uniqueness or unsatisfiability.
+
+        :param puzzle: CompiledPuzzle.
+        :param rng: Random number generator (default is the random module).
+        """
+        self.puzzle = puzzle
+        self.rng = rng
+        self.stats = {'steps': 0, 'restarts': 0, 'best_violations': None}
+        # Clues touching each variable, unary and binary
+        self.touching = [[] for _ in puzzle.variables]
+        for clue in puzzle.clues:
+            self.touching[clue.a].append(clue)
+            if clue.b is not None:
+                self.touching[clue.b].append(clue)
+
+    def _randomize(self):
+        """ Start from a random permutation of every attribute's values over the houses. """
+        num_houses = self.puzzle.num_houses
+        self.house = [0] * len(self.puzzle.variables)   # 0-based house of each variable
+        self.rows = []                                   # Per group: variable in each house, or None
+        for group in self.puzzle.groups:
+            row = list(group) + [None] * (num_houses - len(group))
+            self.rng.shuffle(row)
+            for h, var in enumerate(row):
+                if var is not None:
+                    self.house[var] = h
+            self.rows.append(row)
+        # Violated clues in a list, so a random one is picked in constant time and the same way on every
+        # run with a seeded rng; position maps each of them to its index for swap-removal
+        self.violated = [clue for clue in self.puzzle.clues if self._is_violated(clue)]
+        self.position = {clue: i for i, clue in enumerate(self.violated)}
+
+    def _mark(self, clue, violated):
+        if violated and clue not in self.position:
+            self.position[clue] = len(self.violated)
+            self.violated.append(clue)
+        elif not violated and clue in self.position:
+            i = self.position.pop(clue)
+            last = self.violated.pop()
+            if last is not clue:
+                self.violated[i] = last
+                self.position[last] = i
+
+    def _is_violated(self, clue):
+        bit = 1 << self.house[clue.a]
+        if clue.b is None:
+            return not bit & clue.mask
+        return not clue.forward(bit) >> self.house[clue.b] & 1
+
+    def _swap(self, group_number, h1, h2):
+        row = self.rows[group_number]
+        row[h1], row[h2] = row[h2], row[h1]
+        if row[h1] is not None:
+            self.house[row[h1]] = h1
+        if row[h2] is not None:
+            self.house[row[h2]] = h2
+
+    def _affected(self, row, h1, h2):
+        clues = self.touching[row[h1]] if row[h1] is not None else []
+        if row[h2] is not None:
+            clues = clues + self.touching[row[h2]]
+        return dict.fromkeys(clues)  # Without duplicates, in a fixed order
+
+    def _delta(self, group_number, h1, h2):
+        """ Change in the violated-clue count if houses h1 and h2 of the group were swapped. """
+        clues = self._affected(self.rows[group_number], h1, h2)
+        before = sum(1 for clue in clues if clue in self.position)
+        self._swap(group_number, h1, h2)
+        after = sum(1 for clue in clues if self._is_violated(clue))
+        self._swap(group_number, h1, h2)
+        return after - before
+
+    def _apply(self, group_number, h1, h2):
+        clues = self._affected(self.rows[group_number], h1, h2)
+        self._swap(group_number, h1, h2)
+        for clue in clues:
+            self._mark(clue, self._is_violated(clue))
+
+    def _step(self, temperature):
+        """ Repair one variable of a random violated clue. """
+        clue = self.rng.choice(self.violated)
+        var = clue.a if clue.b is None or self.rng.random() < 0.5 else clue.b
+        group_number = self.puzzle.group_of[var]
+        h1 = self.house[var]
+        targets = [h for h in range(self.puzzle.num_houses) if h != h1]
+        if not targets:
+            return
+        if self.rng.random() < NOISE:
+            h2 = self.rng.choice(targets)
+            self._apply(group_number, h1, h2)
+            return
+        best_delta = None
+        best = []
+        for h2 in targets:
+            delta = self._delta(group_number, h1, h2)
+            if best_delta is None or delta < best_delta:
+                best_delta, best = delta, [h2]
+            elif delta == best_delta:
+                best.append(h2)
+        if best_delta > 0 and self.rng.random() >= math.exp(-best_delta / temperature):
+            return
+        self._apply(group_number, h1, self.rng.choice(best))
+
+    def _domains(self):
+        return [1 << h for h in self.house]
+
+    def _partial_domains(self, domains):
+        """ Keep the houses of values whose clues all hold in a grid; the other values get every house back. """
+        partial = list(domains)
+        for clue in self.puzzle.clues:
+            bit = domains[clue.a]
+            if clue.b is None:
+                holds = bit & clue.mask
+            else:
+                holds = clue.forward(bit) & domains[clue.b]
+            if not holds:
+                partial[clue.a] = self.puzzle.full
+                if clue.b is not None:
+                    partial[clue.b] = self.puzzle.full
+        return partial
+
+    def solve(self, time_limit=10.0, max_restarts=None, budget=None):
+        """
+        Search for a grid that satisfies every clue.
+
+        :param time_limit: Time budget in seconds (None for no limit).
+        :param max_restarts: Stop after this many restarts (default is no limit).
+        :param budget: Optional SearchBudget ticked once per step. When it runs out the search stops
+                       and the best grid is offered to it with the values of violated clues unplaced.
+        :return: Tuple (domains of the best grid found, number of clues it violates); the grid is a
+                 solution when the count is 0.
+        """
+        deadline = None if time_limit is None else time.perf_counter() + time_limit
+        best_domains = None
+        best_count = None
+        restarts = 0
+        while True:
+            self._randomize()
+            temperature = START_TEMPERATURE
+            round_best = len(self.violated)
+            stalled = 0
+            while self.violated and stalled < STALL_STEPS:
+                if deadline is not None and time.perf_counter() >= deadline:
+                    break
+                if budget is not None:
+                    try:
+                        budget.tick()
+                    except BudgetExpired:
+                        if best_count is None:
+                            best_domains, best_count = self._domains(), len(self.violated)
+                        budget.offer_domains(self._partial_domains(best_domains))
+                        self.stats['best_violations'] = best_count
+                        return best_domains, best_count
+                self._step(temperature)
+                self.stats['steps'] += 1
+                temperature = max(temperature * COOLING, 1e-3)
+                if len(self.violated) < round_best:
+                    round_best = len(self.violated)
+                    stalled = 0
+                else:
+                    stalled += 1
+                if best_count is None or len(self.violated) < best_count:
+                    best_domains, best_count = self._domains(), len(self.violated)
+            if best_count is None or len(self.violated) < best_count:
+                best_domains, best_count = self._domains(), len(self.violated)
+            self.stats['best_violations'] = best_count
+            if best_count == 0 or (deadline is not None and time.perf_counter() >= deadline):
+                break
+            restarts += 1
+            self.stats['restarts'] = restarts
+            if max_restarts is not None and restarts > max_restarts:
+                break
+        return best_domains, best_count
+
+
+def solve_local(puzzle, time_limit=10.0, stats=None, rng=random, budget=None):
+    """
+    Return the domains of a grid satisfying every clue found by LocalSearch, or None if none was
+    found within the time budget.
+
+    :param stats: Optional dictionary updated with the search counters (steps, restarts, best_violations).
+    :param budget: Optional SearchBudget; see LocalSearch.solve.
+    """
+    search = LocalSearch(puzzle, rng)
+    domains, violations = search.solve(time_limit, budget=budget)
+    if stats is not None:
+        stats.update(search.stats)
+    return domains if violations == 0 else None
@@ -0,0 +1,249 @@
+# parallelSearch.py
+
+import multiprocessing
+import os
+import signal
+import time
+from constraintPropagation import CompiledPuzzle, propagate
+from propagationSearch import choose_variable, house_bits, is_solved, iter_solutions
+from searchBudget import SearchBudget, BudgetExpired
+
+# Work units created per worker process, so faster workers can keep taking units while slow ones finish
+UNITS_PER_WORKER = 8
+# Never split deeper than this many branching variables
+MAX_SPLIT_DEPTH = 6
+
+# State of each worker process, set by _init_worker
+_worker_puzzle = None
+_worker_stop = None
+
+
+class _StopRequested(Exception):
+    """ Raised inside a worker's search once another worker has found enough solutions. """
+
+
+def split_units(puzzle, domains, target, budget=None):
+    """
+    Partition the search space into independent work units by branching on the first variables.
+
+    Branching follows the sequential search order (fewest houses first); every unit is propagated,
+    dead ends are dropped and the split goes one variable deeper until there are at least `target`
+    units or MAX_SPLIT_DEPTH is reached.
+
+    :param puzzle: CompiledPuzzle.
+    :param domains: Propagated root domains.
+    :param target: Number of units wanted.
+    :param budget: Optional SearchBudget ticked once per unit created; BudgetExpired is raised when it runs out.
+    :return: List of unit domain lists; solved units are complete solutions.
+    """
+    units = [domains]
+    for _ in range(MAX_SPLIT_DEPTH):
+        if len(units) >= target:
+            break
+        split = []
+        branched = False
+        for unit in units:
+            var = choose_variable(puzzle, unit)
+            if var is None:
+                split.append(unit)
+                continue
+            branched = True
+            for bit in house_bits(unit[var]):
+                child = list(unit)
+                child[var] = bit
+                if propagate(puzzle, child, [var]):
+                    split.append(child)
+                    if budget is not None:
+                        budget.offer_domains(child)
+                        budget.tick()
+        units = split
+        if not branched:
+            break
+    return units
+
+
+def hold_sigterm():
+    """
+    Block SIGTERM in the calling thread while worker processes are started; they inherit the mask.
+
+    A worker releases it in default_sigterm(), so a terminate() sent before the worker is ready is
+    kept pending instead of reaching a handler copied from the parent.
+
+    :return: The previous signal mask for release_sigterm(), or None where masks are not supported.
+    """
+    if not hasattr(signal, 'pthread_sigmask'):
+        return None
+    return signal.pthread_sigmask(signal.SIG_BLOCK, {signal.SIGTERM})
+
+
+def release_sigterm(previous):
+    """ Restore the signal mask returned by hold_sigterm(). """
+    if previous is not None:
+        signal.pthread_sigmask(signal.SIG_SETMASK, previous)
+
+
+def default_sigterm():
+    """
+    In a worker process: restore the default SIGTERM action, then accept any held terminate().
+
+    A forked worker inherits the parent's SIGTERM handling (pygame's turns it into a quit event),
+    which would keep terminate() from stopping it.
+    """
+    signal.signal(signal.SIGTERM, signal.SIG_DFL)
+    if hasattr(signal, 'pthread_sigmask'):
+        signal.pthread_sigmask(signal.SIG_UNBLOCK, {signal.SIGTERM})
+
+
+def _init_worker(attributes, constraints, num_houses, stop):
+    global _worker_puzzle, _worker_stop
+    default_sigterm()
+    _worker_puzzle = CompiledPuzzle(attributes, constraints, num_houses)
+    _worker_stop = stop
+
+
+def _stopping_reduce(puzzle, stop):
+    def reduce(domains, queue):
+        if stop.is_set():
+            raise _StopRequested()
+        return propagate(puzzle, domains, queue)
+    return reduce
+
+
+def _search_unit(task):
+    """
+    Worker: search one unit for up to `limit` solutions, giving up early if the stop event fires.
+
+    A unit searched under a budget gets the deadline and the nodes the parent had left when it was
+    handed out, and reports the nodes it used, plus its best partial domains if it ran out.
+    """
+    domains, limit, deadline, max_nodes = task
+    solutions = []
+    stats = {}
+    if _worker_stop.is_set():
+        return solutions, stats, None
+    budget = None
+    if deadline is not None or max_nodes is not None:
+        budget = SearchBudget(deadline, max_nodes)
+    reduce = _stopping_reduce(_worker_puzzle, _worker_stop)
+    try:
+        for solution in iter_solutions(_worker_puzzle, domains, reduce, stats, budget):
+            solutions.append(solution)
+            if len(solutions) >= limit:
+                break
+    except (_StopRequested, BudgetExpired):
+        pass
+    if budget is None:
+        return solutions, stats, None
+    return solutions, stats, (budget.nodes, budget.best if budget.expired else None)
+
+
+def parallel_solutions(attributes, constraints, num_houses=5, limit=1, processes=None, stats=None, budget=None):
+    """
+    Search one puzzle on a process pool by splitting it into subtrees.
+
+    Units are handed out one at a time, so a worker that finishes early takes the next unit instead
+    of sitting idle. As soon as `limit` solutions are known the stop event fires, every worker
+    abandons its unit and the pool is shut down.
+
+    Under a budget the split counts as search nodes too. Each unit may use the nodes left when it is
+    handed out, so units running side by side can overshoot a node limit by up to one unit each.
+    When the deadline passes or a unit runs out, the stop event fires and the pool is shut down the
+    same way; budget.expired is then set and budget.best holds the most advanced partial domains.
+
+    :param attributes: Dictionary of attribute types and their possible values.
+    :param constraints: List of constraint dictionaries.
+    :param num_houses: The number of houses in the puzzle (default is 5).
+    :param limit: Number of solutions to look for: 1 to find any, 2 to test uniqueness.
+    :param processes: Number of worker processes (default is the number of CPUs).
+    :param stats: Optional dictionary updated with 'units' and the workers' total 'branches'.
+    :param budget: Optional SearchBudget shared by the split and the workers.
+    :return: List of at most `limit` solved domain lists (fewer if the budget ran out).
+    """
+    puzzle = CompiledPuzzle(attributes, constraints, num_houses)
+    domains = puzzle.initial_domains()
+    if not propagate(puzzle, domains):
+        return []
+    if processes is None:
+        processes = os.cpu_count() or 1
+    if budget is not None:
+        budget.offer_domains(domains)
+    try:
+        units = split_units(puzzle, domains, processes * UNITS_PER_WORKER, budget)
+    except BudgetExpired:
+        return []
+    solutions = [unit for unit in units if is_solved(unit)][:limit]
+    units = [unit for unit in units if not is_solved(unit)]
+    if stats is not None:
+        stats['units'] = len(units)
+        stats.setdefault('branches', 0)
+    if len(solutions) >= limit or not units:
+        return solutions
+
+    stop = multiprocessing.Event()
+    held = hold_sigterm()
+    try:
+        pool = multiprocessing.Pool(processes, _init_worker, (attributes, constraints, num_houses, stop))
+    finally:
+        release_sigterm(held)
+    try:
+        results = pool.imap_unordered(_search_unit, _unit_tasks(units, limit, budget), chunksize=1)
+        while True:
+            try:
+                found, unit_stats, used = results.next(_time_left(budget))
+            except StopIteration:
+                break
+            except multiprocessing.TimeoutError:
+                budget.expired = True
+                stop.set()
+                break
+            if stats is not None:
+                stats['branches'] += unit_stats.get('branches', 0)
+            solutions.extend(found[:limit - len(solutions)])
+            if len(solutions) >= limit:
+                stop.set()
+                break
+            if used is not None:
+                nodes, best = used
+                budget.nodes += nodes
+                if best is not None:
+                    budget.offer_domains(best)
+                    budget.expired = True
+                    stop.set()
+                    break
+    finally:
+        pool.terminate()
+        pool.join()
+    return solutions
+
+
+def _unit_tasks(units, limit, budget):
+    """ Tasks for the workers, created as they are handed out so each gets the nodes still left. """
+    for unit in units:
+        if budget is None:
+            yield unit, limit, None, None
+        else:
+            max_nodes = None if budget.max_nodes is None else max(budget.max_nodes - budget.nodes, 0)
+            yield unit, limit, budget.deadline, max_nodes
+
+
+def _time_left(budget):
+    """ Seconds until the budget's deadline, or None to wait without a timeout. """
+    if budget is None or budget.deadline is None:
+        return None
+    return max(budget.deadline - time.monotonic(), 0)
+
+
+def solve_parallel(attributes, constraints, num_houses=5, processes=None, stats=None, budget=None):
+    """
+    Return the domains of a solution found by the parallel search, or None if there is none.
+
+    With a budget, None is also returned when it runs out; budget.expired and budget.best then
+    hold the partial result.
+    """
+    solutions = parallel_solutions(attributes, constraints, num_houses, 1, processes, stats, budget)
+    return solutions[0] if solutions else None
+
+
+def is_unique_parallel(attributes, constraints, num_houses=5, processes=None):
+    """ True if the puzzle has exactly one solution; the search stops at the second one found. """
+    return len(parallel_solutions(attributes, constraints, num_houses, 2, processes)) == 1
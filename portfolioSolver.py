@@ -0,0 +1,142 @@
+# portfolioSolver.py
+
+import json
+import multiprocessing
+import queue
+import time
+from collections import Counter
+from backtrackingRandom import ZebraRandomSolver
+from constraintPropagation import CompiledPuzzle
+from parallelSearch import default_sigterm, hold_sigterm, release_sigterm
+
+# Solver configurations raced by default: name -> ZebraRandomSolver keyword arguments
+DEFAULT_PORTFOLIO = {
+    'constraint': {'method': 'constraint'},
+    'constraint-symmetry': {'method': 'constraint', 'break_symmetry': True},
+    'cbj': {'method': 'cbj'},
+    'sat': {'method': 'sat'},
+}
+# JSON lines file recording which configuration won each race
+PORTFOLIO_LOG = 'portfolio_log.jsonl'
+# How often the parent checks for workers that died without answering (seconds)
+POLL_INTERVAL = 0.05
+
+
+def _run_config(name, options, attributes, constraints, num_houses, results):
+    """ Worker process: solve with one configuration and report (name, houses or False, stats). """
+    default_sigterm()
+    solver = ZebraRandomSolver(attributes, constraints, num_houses, **options)
+    houses = solver.solve()
+    results.put((name, houses, solver.stats))
+
+
+class PortfolioResult:
+    def __init__(self, houses, winner, seconds, stats=None):
+        """
+        Outcome of a portfolio race.
+
+        :param houses: List of house dictionaries, or False if the winner found no solution.
+        :param winner: Name of the configuration that answered first, or None if none answered.
+        :param seconds: Wall-clock time until the first answer.
+        :param stats: Search counters reported by the winning solver.
+        """
+        self.houses = houses
+        self.winner = winner
+        self.seconds = seconds
+        self.stats = stats or {}
+
+    def __repr__(self):
+        return f"PortfolioResult(winner={self.winner!r}, seconds={self.seconds:.4f})"
+
+
+def solve_portfolio(attributes, constraints, num_houses=5, configs=None, timeout=None, log_path=PORTFOLIO_LOG):
+    """
+    Race several solver configurations in separate processes on the same puzzle.
+
+    The first configuration to answer wins and the other processes are terminated. The winner is
+    appended to the log so the default configuration can be tuned from real puzzles (see winner_counts).
+
+    :param attributes: Dictionary of attribute types and their possible values.
+    :param constraints: List of constraint dictionaries, as for ZebraRandomSolver.
+    :param num_houses: The number of houses in the puzzle (default is 5).
+    :param configs: Dictionary name -> ZebraRandomSolver keyword arguments (default is DEFAULT_PORTFOLIO).
+    :param timeout: Give up after this many seconds (default is no limit).
+    :param log_path: File the winner is appended to, or None to skip logging.
+    :return: PortfolioResult; its winner is None if every worker failed or the timeout expired.
+    """
+    if configs is None:
+        configs = DEFAULT_PORTFOLIO
+    results = multiprocessing.Queue()
+    workers = [
+        multiprocessing.Process(target=_run_config, daemon=True,
+                                args=(name, options, attributes, constraints, num_houses, results))
+        for name, options in configs.items()
+    ]
+    start = time.perf_counter()
+    # Workers accept terminate() only once they are running _run_config
+    held = hold_sigterm()
+    try:
+        for worker in workers:
+            worker.start()
+    finally:
+        release_sigterm(held)
+
+    answer = None
+    try:
+        while answer is None:
+            elapsed = time.perf_counter() - start
+            if timeout is not None and elapsed >= timeout:
+                break
+            wait = POLL_INTERVAL if timeout is None else min(POLL_INTERVAL, timeout - elapsed)
+            try:
+                answer = results.get(timeout=wait)
+            except queue.Empty:
+                if not any(worker.is_alive() for worker in workers) and results.empty():
+                    break
+    finally:
+        seconds = time.perf_counter() - start
+        for worker in workers:
+            if worker.is_alive():
+                worker.terminate()
+        for worker in workers:
+            worker.join()
+        results.close()
+
+    if answer is None:
+        print("PortfolioSolver: No configuration answered.")
+        result = PortfolioResult(False, None, seconds)
+    else:
+        name, houses, stats = answer
+        result = PortfolioResult(houses, name, seconds, stats)
+    if log_path is not None:
+        _log_winner(log_path, attributes, constraints, num_houses, result, list(configs))
+    return result
+
+
+def _log_winner(log_path, attributes, constraints, num_houses, result, names):
+    entry = {
+        'puzzle': CompiledPuzzle(attributes, constraints, num_houses).fingerprint(),
+        'winner': result.winner,
+        'seconds': round(result.seconds, 6),
+        'solved': bool(result.houses),
+        'configs': names,
+    }
+    with open(log_path, 'a') as file:
+        file.write(json.dumps(entry) + "\n")
+
+
+def winner_counts(log_path=PORTFOLIO_LOG):
+    """
+    Count how often each configuration won, from a portfolio log.
+
+    :return: Counter of configuration names (None counts races nobody answered).
+    """
+    counts = Counter()
+    try:
+        with open(log_path, 'r') as file:
+            for line in file:
+                if line.strip():
+                    counts[json.loads(line)['winner']] += 1
+    except FileNotFoundError:
+        print(f"PortfolioSolver: {log_path} not found.")
+    return counts
@@ -0,0 +1,186 @@
+# problemDecomposition.py
+
+from constraint import Problem, Constraint, FunctionConstraint
+from searchBudget import BudgetConstraint
+
+
+class ProblemGraph:
+    def __init__(self):
+        """
+        Constraint graph of a python-constraint problem, solved one independent component at a time.
+
+        Variables and constraints are added with the same addVariable/addConstraint calls as a Problem.
+        Two open variables (more than one value left) are linked when a constraint covers both. A
+        variable with a single value cannot couple anything, so it is copied into every component whose
+        constraints mention it. Each component is solved on its own and the solutions are combined, so
+        a puzzle made of unrelated parts costs the sum of its parts instead of their product.
+
+        Components whose constraints each cover at most two open variables, linking them as a tree,
+        are solved without search: the number of solutions below each value is computed from the
+        leaves up, then a value with solutions is picked for each variable from the root down.
+        """
+        self.domains = {}
+        self.constraints = []
+        # Values of the components solved so far; read it for the partial answer after BudgetExpired
+        self.solution = {}
+        self.stats = {'components': 0, 'tree_components': 0}
+
+    def addVariable(self, variable, domain):
+        self.domains[variable] = list(domain)
+
+    def addConstraint(self, constraint, variables=None):
+        if not isinstance(constraint, Constraint):
+            constraint = FunctionConstraint(constraint)
+        self.constraints.append((constraint, list(self.domains) if variables is None else list(variables)))
+
+    def components(self):
+        """
+        Split the graph into independent components.
+
+        :return: List of (open variables, constraints) tuples, in the order the variables were added.
+                 Constraints over single-valued variables only form a last component with no open variables.
+        """
+        parent = {var: var for var, domain in self.domains.items() if len(domain) > 1}
+
+        def find(var):
+            while parent[var] != var:
+                parent[var] = parent[parent[var]]
+                var = parent[var]
+            return var
+
+        for constraint, variables in self.constraints:
+            open_vars = [var for var in variables if var in parent]
+            for var in open_vars[1:]:
+                parent[find(var)] = find(open_vars[0])
+        members = {}
+        for var in parent:
+            members.setdefault(find(var), []).append(var)
+        component_constraints = {root: [] for root in members}
+        fixed_constraints = []
+        for constraint, variables in self.constraints:
+            open_var = next((var for var in variables if var in parent), None)
+            if open_var is None:
+                fixed_constraints.append((constraint, variables))
+            else:
+                component_constraints[find(open_var)].append((constraint, variables))
+        components = [(members[root], component_constraints[root]) for root in members]
+        if fixed_constraints:
+            components.append(([], fixed_constraints))
+        return components
+
+    def solve(self, make_problem=Problem, budget=None, first_only=False, split=True):
+        """
+        Solve every component and combine their solutions.
+
+        :param make_problem: Callable returning an empty Problem (e.g. with a tracing solver) for components that need search.
+        :param budget: Optional SearchBudget, enforced by a BudgetConstraint in each searched component.
+        :param first_only: Stop each search at its first solution instead of listing all of them.
+        :param split: False solves the whole graph as a single Problem, e.g. so a trace replays one search.
+        :return: Dictionary variable -> value, or None if there is no solution. self.stats['solutions']
+                 holds the number of solutions, or None when first_only left it unknown.
+        """
+        self.solution = {var: domain[0] for var, domain in self.domains.items() if len(domain) == 1}
+        components = self.components() if split else [(list(self.domains), self.constraints)]
+        self.stats['components'] = len(components)
+        self.stats['tree_components'] = 0
+        total = 1
+        for variables, constraints in components:
+            tree = self._tree(variables, constraints) if split else None
+            if tree is not None:
+                self.stats['tree_components'] += 1
+                solution, count = self._solve_tree(variables, *tree)
+            else:
+                solution, count = self._solve_problem(make_problem(), variables, constraints, budget, first_only)
+            if solution is None:
+                self.stats['solutions'] = 0
+                return None
+            self.solution.update(solution)
+            total = None if total is None or count is None else total * count
+        self.stats['solutions'] = total
+        return self.solution
+
+    def _fixed_values(self, constraint_variables):
+        """ Assignments of the single-valued variables of a constraint, the context it is checked in. """
+        return {var: self.domains[var][0] for var in constraint_variables if len(self.domains[var]) == 1}
+
+    def _solve_problem(self, problem, variables, constraints, budget, first_only):
+        mentioned = set(variables)
+        for constraint, scope in constraints:
+            mentioned.update(scope)
+        for var in self.domains:
+            if var in mentioned:
+                problem.addVariable(var, self.domains[var])
+        for constraint, scope in constraints:
+            problem.addConstraint(constraint, scope)
+        if budget is not None:
+            # Checked last, so it only records assignments the clues accepted
+            problem.addConstraint(BudgetConstraint(budget))
+        if first_only:
+            solution = problem.getSolution()
+            return solution, None
+        solutions = problem.getSolutions()
+        return (solutions[0] if solutions else None), len(solutions)
+
+    def _tree(self, variables, constraints):
+        """
+        Check whether a component is tree-structured.
+
+        :return: Tuple (unary constraints per variable, binary constraints per (var1, var2) edge),
+                 or None if a constraint covers more than two open variables or the edges form a cycle.
+        """
+        if not variables:
+            return None
+        open_vars = set(variables)
+        unary = {var: [] for var in variables}
+        edges = {}
+        for constraint, scope in constraints:
+            ends = [var for var in scope if var in open_vars]
+            if len(ends) > 2:
+                return None
+            if len(ends) == 1:
+                unary[ends[0]].append((constraint, scope))
+            else:
+                key = tuple(sorted(ends, key=variables.index))
+                edges.setdefault(key, []).append((constraint, scope))
+        if len(edges) != len(variables) - 1:
+            return None
+        return unary, edges
+
+    def _solve_tree(self, variables, unary, edges):
+        domains = {var: [value for value in self.domains[var]
+                         if all(constraint(scope, self.domains, {**self._fixed_values(scope), var: value})
+                                for constraint, scope in unary[var])]
+                   for var in variables}
+        neighbours = {var: [] for var in variables}
+        for var1, var2 in edges:
+            neighbours[var1].append(var2)
+            neighbours[var2].append(var1)
+
+        def allowed(var1, value1, var2, value2):
+            key = (var1, var2) if (var1, var2) in edges else (var2, var1)
+            return all(constraint(scope, self.domains, {**self._fixed_values(scope), var1: value1, var2: value2})
+                       for constraint, scope in edges[key])
+
+        # Breadth-first order from the first variable; every variable after the first has its parent earlier
+        order = [variables[0]]
+        parent = {variables[0]: None}
+        for var in order:
+            for other in neighbours[var]:
+                if other not in parent:
+                    parent[other] = var
+                    order.append(other)
+        counts = {var: {value: 1 for value in domains[var]} for var in variables}
+        for var in reversed(order[1:]):
+            above = parent[var]
+            for value in domains[above]:
+                counts[above][value] *= sum(count for below, count in counts[var].items()
+                                            if count and allowed(above, value, var, below))
+        total = sum(counts[order[0]].values())
+        if not total:
+            return None, 0
+        solution = {}
+        for var in order:
+            above = parent[var]
+            solution[var] = next(value for value in domains[var] if counts[var][value] and
+                                 (above is None or allowed(above, solution[above], var, value)))
+        return solution, total
@@ -0,0 +1,100 @@
+# propagationSearch.py
+
+from constraintPropagation import propagate
+from searchBudget import BudgetExpired
+
+
+def is_solved(domains):
+    """ True when every value is fixed to a single house. """
+    return all(not mask & (mask - 1) for mask in domains)
+
+
+def house_bits(mask):
+    """ Single-house masks of every house set in a mask, lowest house first. """
+    bits = []
+    while mask:
+        bit = mask & -mask
+        bits.append(bit)
+        mask ^= bit
+    return bits
+
+
+def choose_variable(puzzle, domains):
+    """
+    Pick the next value to branch on: fewest houses left first (MRV), then most clues.
+
+    :return: Variable id, or None if every value is placed.
+    """
+    best = None
+    best_key = None
+    for var, mask in enumerate(domains):
+        if mask & (mask - 1):
+            key = (bin(mask).count('1'), -len(puzzle.var_clues[var]))
+            if best_key is None or key < best_key:
+                best, best_key = var, key
+    return best
+
+
+def default_reduce(puzzle):
+    """ The standard node reduction: propagation to a fixpoint. """
+    def reduce(domains, queue):
+        return propagate(puzzle, domains, queue)
+    return reduce
+
+
+def iter_solutions(puzzle, domains=None, reduce=None, stats=None, budget=None, queue=None):
+    """
+    Depth-first search over house domains, reducing every node before branching.
+
+    :param puzzle: CompiledPuzzle.
+    :param domains: Starting domains (default is the initial domains; they are reduced first).
+    :param reduce: Function (domains, queue) -> bool applying inference in place; queue is None for a
+                   full pass or the list of variables just changed (default is propagate).
+    :param stats: Optional dictionary; 'branches' is incremented for every branch tried.
+    :param budget: Optional SearchBudget; every node is offered to it and BudgetExpired is raised
+                   from the generator when it runs out.
+    :param queue: Variables changed since the domains were last at a fixpoint, so only they are
+                  reduced before the search (default is a full pass).
+    :return: Generator of solved domain lists.
+    """
+    if reduce is None:
+        reduce = default_reduce(puzzle)
+    if stats is not None:
+        stats.setdefault('branches', 0)
+    if domains is None:
+        domains = puzzle.initial_domains()
+    else:
+        domains = list(domains)
+    if not reduce(domains, queue):
+        return iter(())
+    return _search(puzzle, domains, reduce, stats, budget)
+
+
+def _search(puzzle, domains, reduce, stats, budget=None):
+    if budget is not None:
+        budget.offer_domains(domains)
+        budget.tick()
+    var = choose_variable(puzzle, domains)
+    if var is None:
+        yield domains
+        return
+    for bit in house_bits(domains[var]):
+        if stats is not None:
+            stats['branches'] += 1
+        child = list(domains)
+        child[var] = bit
+        if reduce(child, [var]):
+            yield from _search(puzzle, child, reduce, stats, budget)
+
+
+def solve_domains(puzzle, domains=None, reduce=None, stats=None, budget=None, queue=None):
+    """
+    Return the first solution's domains, or None if there is none.
+
+    With a budget, None is also returned when it runs out; budget.expired and budget.best then
+    hold the partial result.
+    """
+    try:
+        return next(iter_solutions(puzzle, domains, reduce, stats, budget, queue), None)
+    except BudgetExpired:
+        return None
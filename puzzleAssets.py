@@ -0,0 +1,182 @@
+# puzzleAssets.py
+
+import json
+import os
+
+ATTRIBUTES_FILE = 'attributes.json'
+CLUES_FILE = 'clues.json'
+SOLUTION_FILE = 'og_attributes.json'
+BACKGROUND_IMAGE = 'albert.png'
+
+
+class AssetCache:
+    def __init__(self):
+        """
+        Parsed files kept in memory and reloaded only when the file changes on disk.
+
+        Each entry remembers the modification time and size of the file it was read from; a lookup
+        costs one stat() call and the file is only opened again when either has changed. Failed
+        loads are not cached, so a fixed file is picked up on the next lookup.
+        """
+        self.entries = {}  # (path, loader) -> (mtime_ns, size, value)
+        self.paths = {}    # Requested path -> file found by resolve_path
+        self.loads = 0     # Number of times a file was actually read
+
+    def load(self, path, loader):
+        """
+        Return the parsed contents of a file.
+
+        :param path: File to read.
+        :param loader: Function path -> parsed value; also part of the key, so one file can be parsed several ways.
+        :return: The cached value, shared with every other caller (do not modify it).
+        """
+        if path not in self.paths:
+            self.paths[path] = resolve_path(path)
+        try:
+            stat = os.stat(self.paths[path])
+        except FileNotFoundError:
+            del self.paths[path]
+            raise
+        path = self.paths[path]
+        key = (path, loader)
+        entry = self.entries.get(key)
+        if entry is not None and entry[0] == stat.st_mtime_ns and entry[1] == stat.st_size:
+            return entry[2]
+        value = loader(path)
+        self.loads += 1
+        self.entries[key] = (stat.st_mtime_ns, stat.st_size, value)
+        return value
+
+    def clear(self):
+        self.entries.clear()
+        self.paths.clear()
+
+
+# Cache shared by the game, the solvers and the scripts
+assets = AssetCache()
+# Image loader of each display size, so every scaled copy has its own cache entry
+_image_loaders = {}
+
+
+def resolve_path(path):
+    """ Return `path`, or a file in the same directory whose name differs only in case (e.g. clues.JSON). """
+    if os.path.exists(path):
+        return path
+    directory, name = os.path.split(path)
+    try:
+        for candidate in os.listdir(directory or '.'):
+            if candidate.lower() == name.lower():
+                return os.path.join(directory, candidate)
+    except FileNotFoundError:
+        pass
+    raise FileNotFoundError(f"{path} not found.")
+
+
+def _read_json(path):
+    with open(path, 'r') as file:
+        return json.load(file)
+
+
+def parse_attributes(data, path=ATTRIBUTES_FILE):
+    """
+    Validate the contents of attributes.json.
+
+    :return: Dictionary attribute type -> list of its values.
+    """
+    attributes = data.get('attributes') if isinstance(data, dict) else None
+    if not isinstance(attributes, dict) or not attributes:
+        raise ValueError(f"{path}: expected an 'attributes' object.")
+    for attr, values in attributes.items():
+        if not isinstance(values, list) or not values or not all(isinstance(val, str) for val in values):
+            raise ValueError(f"{path}: values of '{attr}' must be a non-empty list of strings.")
+        if len(set(values)) != len(values):
+            raise ValueError(f"{path}: values of '{attr}' are not unique.")
+    return attributes
+
+
+def parse_clues(data, path=CLUES_FILE):
+    """
+    Validate the contents of clues.json.
+
+    :return: List of clue dictionaries, each with an integer 'id' and a 'description'.
+    """
+    clues = data.get('clues') if isinstance(data, dict) else None
+    if not isinstance(clues, list):
+        raise ValueError(f"{path}: expected a 'clues' list.")
+    ids = set()
+    for clue in clues:
+        if not isinstance(clue, dict) or not isinstance(clue.get('id'), int) \
+                or not isinstance(clue.get('description'), str):
+            raise ValueError(f"{path}: every clue needs an integer 'id' and a 'description': {clue}")
+        if clue['id'] in ids:
+            raise ValueError(f"{path}: duplicate clue id {clue['id']}.")
+        ids.add(clue['id'])
+    return clues
+
+
+def parse_solution(data, path=SOLUTION_FILE):
+    """
+    Validate the contents of og_attributes.json.
+
+    :return: List of house dictionaries (house 1 first), all with the same attribute types and no
+             value used twice for one attribute.
+    """
+    houses = data.get('original_attributes') if isinstance(data, dict) else None
+    if not isinstance(houses, list) or not houses or not all(isinstance(house, dict) for house in houses):
+        raise ValueError(f"{path}: expected an 'original_attributes' list of houses.")
+    keys = set(houses[0])
+    for number, house in enumerate(houses, start=1):
+        if set(house) != keys:
+            raise ValueError(f"{path}: house {number} does not list the same attributes as house 1.")
+    for attr in keys - {'number'}:
+        values = [house[attr] for house in houses]
+        if len(set(values)) != len(values):
+            raise ValueError(f"{path}: '{attr}' has a value in more than one house.")
+    return houses
+
+
+def _load_attributes(path):
+    return parse_attributes(_read_json(path), path)
+
+
+def _load_clues(path):
+    return parse_clues(_read_json(path), path)
+
+
+def _load_solution(path):
+    return parse_solution(_read_json(path), path)
+
+
+def load_attributes(path=ATTRIBUTES_FILE):
+    """
+    Attribute types and values from attributes.json, read once and cached until the file changes.
+
+    Raises FileNotFoundError, json.JSONDecodeError or ValueError (invalid contents).
+    """
+    return assets.load(path, _load_attributes)
+
+
+def load_clues(path=CLUES_FILE):
+    """ Clues from clues.json, cached like load_attributes. """
+    return assets.load(path, _load_clues)
+
+
+def load_solution(path=SOLUTION_FILE):
+    """ Solution of the original puzzle from og_attributes.json, cached like load_attributes. """
+    return assets.load(path, _load_solution)
+
+
+def load_image(path=BACKGROUND_IMAGE, size=None):
+    """
+    Image converted for the display (and scaled to `size` if given), cached until the file changes.
+
+    Needs pygame and a display mode to be set; raises pygame.error otherwise.
+    """
+    import pygame
+
+    def load(resolved):
+        image = pygame.image.load(resolved).convert()
+        return pygame.transform.scale(image, size) if size else image
+    loader = _image_loaders.setdefault(size, load)
+    return assets.load(path, loader)
+
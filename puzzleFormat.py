@@ -0,0 +1,266 @@
+# puzzleFormat.py
+
+import json
+import mmap
+import struct
+import sys
+
+# Clue opcodes used in the binary encoding
+CLUE_OPCODES = {
+    'same_house': 1,
+    'next_to': 2,
+    'left_of': 3,
+    'in_house': 4,  # Positional clue; its 'houses' slots hold the (at most two) houses the value may be in
+    'before': 5,    # Symmetry-breaking order between two values
+}
+CLUE_KINDS = {opcode: kind for kind, opcode in CLUE_OPCODES.items()}
+
+NO_ID = 0xFF  # Unused attribute/value slot of a clue
+NO_HOUSE = 0  # Unused house slot of a clue (houses are 1-based)
+
+# Puzzle record: num_houses, flags, clue count
+RECORD_HEADER = struct.Struct('<BBH')
+# Clue: opcode, attr1, value1, attr2, value2, house1, house2
+CLUE = struct.Struct('<7B')
+# Difficulty rating: inference tier, search branches
+RATING = struct.Struct('<BI')
+HAS_SOLUTION = 0x01
+HAS_RATING = 0x02
+
+# Container file: magic, version, puzzle count, offset table position, schema length
+BANK_MAGIC = b'ZPB1'
+BANK_HEADER = struct.Struct('<4sHQQI')
+BANK_VERSION = 1
+
+
+class PuzzleSchema:
+    def __init__(self, attributes):
+        """
+        Maps attribute types and values to the small integer ids used in the binary format.
+
+        :param attributes: Dictionary of attribute types and their possible values, in a fixed order.
+        """
+        self.attributes = {attr: list(values) for attr, values in attributes.items()}
+        self.attribute_names = list(self.attributes)
+        if len(self.attribute_names) >= NO_ID or any(len(values) >= NO_ID for values in self.attributes.values()):
+            raise ValueError("PuzzleSchema: at most 254 attributes and 254 values per attribute are supported.")
+        self.attribute_ids = {attr: i for i, attr in enumerate(self.attribute_names)}
+        self.value_ids = {
+            attr: {val: i for i, val in enumerate(values)} for attr, values in self.attributes.items()
+        }
+        # Shared (attr, value) tuples indexed by id, so decoding never builds new pairs; the NO_ID row stays empty
+        self.pairs = [[(attr, val) for val in values] for attr, values in self.attributes.items()]
+        self.pairs += [[]] * (NO_ID + 1 - len(self.pairs))
+
+    def to_json(self):
+        return json.dumps({'attributes': self.attributes})
+
+    @classmethod
+    def from_json(cls, text):
+        return cls(json.loads(text)['attributes'])
+
+    def encode(self, constraints, num_houses, solution=None, rating=None):
+        """
+        Encode one puzzle (and optionally its solution) into bytes.
+
+        :param constraints: List of constraint dictionaries as produced by generate_constraints_from_solution.
+        :param num_houses: The number of houses in the puzzle, stored in the record header.
+        :param solution: Optional list of house dictionaries; stored as a value permutation per attribute.
+        :param rating: Optional (tier, branches) difficulty rating stored with the puzzle.
+        :return: The encoded record. ValueError is raised for a solution with another number of houses
+                 and for a clue listing more than two houses or a house outside the puzzle.
+        """
+        if not 0 < num_houses < 256:
+            raise ValueError(f"PuzzleSchema: A record holds 1 to 255 houses, not {num_houses}.")
+        if solution and len(solution) != num_houses:
+            raise ValueError(f"PuzzleSchema: The solution has {len(solution)} houses, not {num_houses}.")
+        flags = (HAS_SOLUTION if solution else 0) | (HAS_RATING if rating else 0)
+        parts = [RECORD_HEADER.pack(num_houses, flags, len(constraints))]
+
+        for constraint in constraints:
+            kind = next((k for k in CLUE_OPCODES if k in constraint), None)
+            if kind is None:
+                raise ValueError(f"PuzzleSchema: Unknown constraint type: {constraint}")
+            slots = []
+            for attr, val in constraint[kind]:
+                slots += [self.attribute_ids[attr], self.value_ids[attr][val]]
+            slots += [NO_ID] * (4 - len(slots))
+            houses = list(constraint.get('houses', []))
+            if len(houses) > 2:
+                # Dropping houses would change the puzzle (e.g. where an in_house value may be)
+                raise ValueError(f"PuzzleSchema: A clue can hold at most 2 houses: {constraint}")
+            if any(not 1 <= house <= num_houses for house in houses):
+                raise ValueError(f"PuzzleSchema: A clue names a house outside 1..{num_houses}: {constraint}")
+            houses += [NO_HOUSE] * (2 - len(houses))
+            parts.append(CLUE.pack(CLUE_OPCODES[kind], *slots, *houses))
+
+        if solution:
+            for attr in self.attribute_names:
+                parts.append(bytes(self.value_ids[attr][house[attr]] for house in solution))
+        if rating:
+            parts.append(RATING.pack(*rating))
+        return b''.join(parts)
+
+    @staticmethod
+    def decode_num_houses(data, offset=0):
+        """ Read only the number of houses stored in a record's header. """
+        return RECORD_HEADER.unpack_from(data, offset)[0]
+
+    def decode_rating(self, data, offset=0):
+        """
+        Read only the stored rating of a record.
+
+        :return: Tuple (tier, branches), or None if the record has no rating.
+        """
+        num_houses, flags, num_clues = RECORD_HEADER.unpack_from(data, offset)
+        if not flags & HAS_RATING:
+            return None
+        offset += RECORD_HEADER.size + num_clues * CLUE.size
+        if flags & HAS_SOLUTION:
+            offset += num_houses * len(self.attribute_names)
+        return RATING.unpack_from(data, offset)
+
+    def decode(self, data, offset=0):
+        """
+        Decode a record produced by encode().
+
+        :param data: Buffer holding the record (bytes, memoryview or mmap).
+        :param offset: Position of the record in the buffer.
+        :return: Tuple (constraints, solution, num_houses); solution is None if it was not stored.
+        """
+        num_houses, flags, num_clues = RECORD_HEADER.unpack_from(data, offset)
+        offset += RECORD_HEADER.size
+        constraints = []
+        pairs = self.pairs
+        for opcode, a1, v1, a2, v2, h1, h2 in CLUE.iter_unpack(data[offset:offset + num_clues * CLUE.size]):
+            if a2 == NO_ID:
+                constraint = {CLUE_KINDS[opcode]: [pairs[a1][v1]]}
+            else:
+                constraint = {CLUE_KINDS[opcode]: [pairs[a1][v1], pairs[a2][v2]]}
+            if h1 != NO_HOUSE:
+                constraint['houses'] = [h1, h2] if h2 != NO_HOUSE else [h1]
+            constraints.append(constraint)
+        offset += num_clues * CLUE.size
+
+        solution = None
+        if flags & HAS_SOLUTION:
+            solution = [{} for _ in range(num_houses)]
+            for attr in self.attribute_names:
+                values = self.attributes[attr]
+                for house, value_id in zip(solution, data[offset:offset + num_houses]):
+                    house[attr] = values[value_id]
+                offset += num_houses
+        return constraints, solution, num_houses
+
+
+class PuzzleBankWriter:
+    def __init__(self, path, attributes):
+        """
+        Stream puzzles into a container file that PuzzleBank can memory-map.
+
+        Records are appended as they arrive; the offset table is written on close(),
+        so millions of puzzles can be stored without holding them in memory.
+
+        :param path: Output file path.
+        :param attributes: Dictionary of attribute types and values shared by every puzzle in the bank.
+        """
+        self.schema = PuzzleSchema(attributes)
+        self.file = open(path, 'wb')
+        self.offsets = []
+        schema_bytes = self.schema.to_json().encode('utf-8')
+        self.file.write(BANK_HEADER.pack(BANK_MAGIC, BANK_VERSION, 0, 0, len(schema_bytes)))
+        self.file.write(schema_bytes)
+        self.position = BANK_HEADER.size + len(schema_bytes)
+
+    def append(self, constraints, num_houses, solution=None, rating=None):
+        """ Encode and append one puzzle of `num_houses` houses; returns its index in the bank. """
+        record = self.schema.encode(constraints, num_houses, solution, rating)
+        self.offsets.append(self.position)
+        self.file.write(record)
+        self.position += len(record)
+        return len(self.offsets) - 1
+
+    def close(self):
+        # Offset table: one uint64 per record plus the end position, so record i spans offsets[i]:offsets[i + 1]
+        self.offsets.append(self.position)
+        table = struct.pack(f'<{len(self.offsets)}Q', *self.offsets)
+        self.file.write(table)
+        self.file.seek(0)
+        self.file.write(BANK_HEADER.pack(BANK_MAGIC, BANK_VERSION, len(self.offsets) - 1, self.position,
+                                         len(self.schema.to_json().encode('utf-8'))))
+        self.file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+class PuzzleBank:
+    def __init__(self, path):
+        """
+        Read-only, memory-mapped view of a puzzle container file with random access by index.
+
+        Opening the bank only reads the header and schema; records are decoded on demand.
+
+        :param path: Path of a file written by PuzzleBankWriter.
+        """
+        self.file = open(path, 'rb')
+        self.map = mmap.mmap(self.file.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, version, count, table_position, schema_length = BANK_HEADER.unpack_from(self.map, 0)
+        if magic != BANK_MAGIC or version != BANK_VERSION:
+            raise ValueError(f"PuzzleBank: {path} is not a puzzle bank file.")
+        self.count = count
+        self.schema = PuzzleSchema.from_json(
+            bytes(self.map[BANK_HEADER.size:BANK_HEADER.size + schema_length]).decode('utf-8'))
+        # The offset table is used in place on little-endian machines; no per-record parsing on open
+        self._table = memoryview(self.map)[table_position:table_position + (count + 1) * 8]
+        self.offsets = self._table.cast('Q') if sys.byteorder == 'little' else \
+            struct.unpack(f'<{count + 1}Q', self._table)
+
+    def __len__(self):
+        return self.count
+
+    def raw(self, index):
+        """ Return the encoded bytes of puzzle `index`. """
+        if not 0 <= index < self.count:
+            raise IndexError("PuzzleBank index out of range")
+        return self.map[self.offsets[index]:self.offsets[index + 1]]
+
+    def __getitem__(self, index):
+        """ Decode puzzle `index` into (constraints, solution, num_houses). """
+        if index < 0:
+            index += self.count
+        return self.schema.decode(self.raw(index))
+
+    def num_houses(self, index):
+        """ Number of houses of puzzle `index`, read from its header only. """
+        return self.schema.decode_num_houses(self.raw(index))
+
+    def rating(self, index):
+        """ Stored (tier, branches) rating of puzzle `index`, or None. """
+        return self.schema.decode_rating(self.raw(index))
+
+    def __iter__(self):
+        for index in range(self.count):
+            yield self[index]
+
+    def close(self):
+        if isinstance(self.offsets, memoryview):
+            self.offsets.release()
+        self._table.release()
+        self.map.close()
+        self.file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+if __name__ == "__main__":
+    # Summarise a puzzle bank: python puzzleFormat.py <bank file>
+    with PuzzleBank(sys.argv[1]) as bank:
+        print(f"{len(bank)} puzzles, attributes: {', '.join(bank.schema.attribute_names)}")
@@ -0,0 +1,243 @@
+# puzzleSymmetry.py
+
+from collections import Counter
+from constraintPropagation import CompiledPuzzle, constraint_kind, UNARY_KINDS
+
+# Clue types whose two values can be swapped without changing the meaning
+SYMMETRIC_KINDS = ('same_house', 'next_to')
+
+
+def clue_key(constraint):
+    """
+    Hashable form of a constraint's logical content.
+
+    The informational 'houses' of binary clues are left out; symmetric clues list their values in sorted order.
+    """
+    kind = constraint_kind(constraint)
+    pairs = [tuple(pair) for pair in constraint[kind]]
+    if kind in UNARY_KINDS:
+        return (kind, pairs[0], tuple(sorted(constraint['houses'])))
+    if kind in SYMMETRIC_KINDS:
+        pairs.sort()
+    return (kind, pairs[0], pairs[1])
+
+
+def _swap_key(key, attr, u, v):
+    def swap(pair):
+        if pair[0] != attr:
+            return pair
+        if pair[1] == u:
+            return (attr, v)
+        if pair[1] == v:
+            return (attr, u)
+        return pair
+    kind = key[0]
+    if kind in UNARY_KINDS:
+        return (kind, swap(key[1]), key[2])
+    pairs = [swap(key[1]), swap(key[2])]
+    if kind in SYMMETRIC_KINDS:
+        pairs.sort()
+    return (kind, pairs[0], pairs[1])
+
+
+def interchangeable_values(attributes, constraints):
+    """
+    Find values that can be renamed into each other without changing the puzzle.
+
+    Two values of an attribute are interchangeable when swapping them maps the clue set onto
+    itself (for example, values no clue mentions). Such swaps compose, so the values of each
+    attribute fall into classes.
+
+    :return: List of (attr, [values]) for every class with at least two values.
+    """
+    keys = Counter(clue_key(constraint) for constraint in constraints if constraint_kind(constraint))
+    classes = []
+    for attr, values in attributes.items():
+        remaining = list(values)
+        while remaining:
+            first = remaining.pop(0)
+            members = [first]
+            for other in list(remaining):
+                if Counter(_swap_key(key, attr, first, other) for key in keys.elements()) == keys:
+                    members.append(other)
+                    remaining.remove(other)
+            if len(members) > 1:
+                classes.append((attr, members))
+    return classes
+
+
+def break_symmetries(attributes, constraints):
+    """
+    Add symmetry-breaking constraints for interchangeable values.
+
+    The values of each class are ordered by house with 'before' constraints (house of the first value
+    lower than the second). Every solution of the original puzzle can be renamed within the classes
+    into exactly one solution of the new puzzle, so search never explores the mirrored subtrees.
+
+    :return: New constraint list (the original constraints followed by the added ones).
+    """
+    added = []
+    for attr, members in interchangeable_values(attributes, constraints):
+        for first, second in zip(members, members[1:]):
+            added.append({'before': [(attr, first), (attr, second)]})
+    return list(constraints) + added
+
+
+def _relabel(signatures):
+    """ Replace signatures by small integers, numbered in sorted order so the numbering never depends on names. """
+    numbers = {signature: number for number, signature in enumerate(sorted(set(signatures)))}
+    return [numbers[signature] for signature in signatures]
+
+
+def _refine(colors, incident):
+    """
+    Split colour classes until every value of a class has the same clues to the same colours.
+
+    :param colors: Colour number of each value.
+    :param incident: Per value, the (kind, role, other value or None, houses) tuples of its clues.
+    :return: The refined colours.
+    """
+    while True:
+        refined = _relabel([(colors[var], tuple(sorted((kind, role, -1 if other is None else colors[other], houses)
+                                                       for kind, role, other, houses in incident[var])))
+                            for var in range(len(colors))])
+        if len(set(refined)) == len(set(colors)):
+            return refined
+        colors = refined
+
+
+def canonical_form(attributes, constraints):
+    """
+    Map a puzzle to a normal form under renaming of values within each attribute.
+
+    Works on the clues alone, so it costs the same for puzzles with one solution, many or none. Values
+    are coloured by their attribute and their clues, and the colours are refined until values of the same
+    colour are tied to the same colours by the same clues. While a colour still holds several values, each
+    of them in turn is singled out and the colours refined again; every value is then renamed after its
+    colour's rank within its attribute. The normal form is the smallest renamed clue list over these
+    choices, so two puzzles get the same form exactly when one is a relabeling of the other. Values that
+    an automorphism of the clues maps onto each other lead to the same forms, so only one is singled out;
+    the automorphisms come from interchangeable values (see interchangeable_values) and from any two
+    choices that gave the same form.
+
+    :param attributes: Dictionary of attribute types and their possible values.
+    :param constraints: List of constraint dictionaries.
+    :return: Sorted list of constraint dictionaries in normal form ('houses' only on positional clues).
+    """
+    constraints = [constraint for constraint in constraints if constraint_kind(constraint)]
+    pairs = [(attr, val) for attr, values in attributes.items() for val in values]
+    index = {pair: var for var, pair in enumerate(pairs)}
+    names = {attr: list(values) for attr, values in attributes.items()}
+    attribute_number = {attr: number for number, attr in enumerate(attributes)}
+    clues = []
+    incident = [[] for _ in pairs]
+    for constraint in constraints:
+        kind = constraint_kind(constraint)
+        scope = [index[tuple(pair)] for pair in constraint[kind]]
+        houses = tuple(sorted(constraint['houses'])) if kind in UNARY_KINDS else ()
+        clues.append((kind, scope, houses))
+        if kind in UNARY_KINDS:
+            incident[scope[0]].append((kind, 0, None, houses))
+        else:
+            symmetric = kind in SYMMETRIC_KINDS
+            incident[scope[0]].append((kind, 0, scope[1], houses))
+            incident[scope[1]].append((kind, 0 if symmetric else 1, scope[0], houses))
+    # Known automorphisms (value permutations mapping the clue set onto itself), as lists var -> var;
+    # swaps of interchangeable values to start with, and every pair of leaves giving the same form
+    automorphisms = []
+    for attr, members in interchangeable_values(attributes, constraints):
+        for val in members[1:]:
+            swap = list(range(len(pairs)))
+            first, other = index[(attr, members[0])], index[(attr, val)]
+            swap[first], swap[other] = other, first
+            automorphisms.append(swap)
+
+    def ranks(colors):
+        """ Rank of each value's colour within its attribute, once every colour holds a single value. """
+        rank = [0] * len(pairs)
+        for attr, values in attributes.items():
+            for position, val in enumerate(sorted(values, key=lambda val: colors[index[(attr, val)]])):
+                rank[index[(attr, val)]] = position
+        return rank
+
+    def renamed(rank):
+        form = []
+        for kind, scope, houses in clues:
+            renamed_pairs = [(pairs[var][0], names[pairs[var][0]][rank[var]]) for var in scope]
+            if kind in SYMMETRIC_KINDS:
+                renamed_pairs.sort()
+            form.append((kind, tuple(renamed_pairs), houses))
+        return tuple(sorted(form))
+
+    def orbits(path):
+        """ Union-find roots of the values under the known automorphisms that fix every value of path. """
+        root = list(range(len(pairs)))
+
+        def find(var):
+            while root[var] != var:
+                root[var] = root[root[var]]
+                var = root[var]
+            return var
+
+        for mapping in automorphisms:
+            if all(mapping[var] == var for var in path):
+                for var, image in enumerate(mapping):
+                    root[find(var)] = find(image)
+        return find
+
+    leaves = {}  # Form -> ranks of the first leaf that gave it
+    best = None
+
+    def search(colors, path):
+        nonlocal best
+        members = {}
+        for var, color in enumerate(colors):
+            members.setdefault(color, []).append(var)
+        tied = next((cell for color, cell in sorted(members.items()) if len(cell) > 1), None)
+        if tied is None:
+            rank = ranks(colors)
+            form = renamed(rank)
+            if form in leaves:
+                # Both renamings give the same clues, so mapping one onto the other is an automorphism
+                holder = {(pairs[var][0], position): var for var, position in enumerate(leaves[form])}
+                automorphisms.append([holder[(pairs[var][0], rank[var])] for var in range(len(pairs))])
+            else:
+                leaves[form] = rank
+            if best is None or form < best:
+                best = form
+            return
+        tried = []
+        for var in tied:
+            find = orbits(path)
+            if any(find(var) == find(other) for other in tried):
+                continue
+            tried.append(var)
+            search(_refine(_relabel([(color, other != var) for other, color in enumerate(colors)]), incident),
+                   path + [var])
+
+    search(_refine(_relabel([attribute_number[attr] for attr, val in pairs]), incident), [])
+    return [{kind: list(renamed_pairs), 'houses': list(houses)} if kind in UNARY_KINDS else {kind: list(renamed_pairs)}
+            for kind, renamed_pairs, houses in best]
+
+
+def canonical_key(attributes, constraints, num_houses=5):
+    """ Fingerprint of the puzzle's normal form (see canonical_form). """
+    form = canonical_form(attributes, constraints)
+    return CompiledPuzzle(attributes, form, num_houses).fingerprint()
+
+
+def deduplicate(attributes, puzzles, num_houses=5):
+    """
+    Drop puzzles that are relabelings of an earlier puzzle.
+
+    :param puzzles: Iterable of constraint lists.
+    :return: Indices of the puzzles to keep.
+    """
+    seen = set()
+    keep = []
+    for index, constraints in enumerate(puzzles):
+        key = canonical_key(attributes, constraints, num_houses)
+        if key not in seen:
+            keep.append(index)
+            seen.add(key)
+    return keep
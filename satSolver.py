@@ -0,0 +1,505 @@
+# satSolver.py
+
+import heapq
+from constraintPropagation import CompiledPuzzle, house_mask
+from searchBudget import BudgetExpired
+
+# Restart after luby(i) * RESTART_BASE conflicts
+RESTART_BASE = 100
+ACTIVITY_DECAY = 0.95
+CLAUSE_DECAY = 0.999
+# Learned clauses kept before the first reduction, and how much the limit grows after each one
+FIRST_REDUCE = 2000
+REDUCE_GROWTH = 300
+# Learned clauses with an LBD (number of decision levels) this low are never deleted
+GLUE_LBD = 2
+
+
+def luby(i):
+    """ The i-th term (1-based) of the Luby restart sequence 1, 1, 2, 1, 1, 2, 4, ... """
+    i -= 1
+    size = 1
+    while size < i + 1:
+        size = 2 * size + 1
+    while size - 1 != i:
+        size = (size - 1) // 2
+        if i >= size:
+            i -= size
+    return (size + 1) // 2
+
+
+def _index(lit):
+    """ Position of a literal in the watch lists: 2v for v, 2v + 1 for -v. """
+    return 2 * lit if lit > 0 else 1 - 2 * lit
+
+
+class CdclSolver:
+    def __init__(self, num_vars):
+        """
+        Conflict-driven clause learning SAT solver.
+
+        Two watched literals per clause, first-UIP clause learning with non-chronological
+        backtracking, VSIDS branching (the most active unassigned variable, taken from a heap)
+        with phase saving, and Luby restarts. At a restart, once more than a growing
+        limit of learned clauses is kept, the worse half of them (highest LBD, then least active)
+        is deleted; clauses with an LBD of at most GLUE_LBD are always kept.
+        Literals are DIMACS integers: v or -v for variables 1..num_vars.
+
+        :param num_vars: Number of variables.
+        """
+        self.num_vars = num_vars
+        self.clauses = []
+        self.watches = [[] for _ in range(2 * num_vars + 2)]
+        self.values = [0] * (num_vars + 1)       # 1 true, -1 false, 0 unassigned
+        self.levels = [0] * (num_vars + 1)
+        self.reasons = [None] * (num_vars + 1)   # Clause index that implied each variable
+        self.trail = []
+        self.trail_lim = []                      # Trail position of each decision level
+        self.qhead = 0
+        self.activity = [0.0] * (num_vars + 1)
+        self.var_inc = 1.0
+        # Branching heap of (-activity, variable); see _pick_branch
+        self.order = [(0.0, var) for var in range(1, num_vars + 1)]
+        self.clause_lbd = []                     # Per clause: LBD when learned, 0 for clauses of the formula
+        self.clause_activity = []
+        self.clause_inc = 1.0
+        self.num_learned = 0
+        self.max_learned = FIRST_REDUCE
+        self.phase = [True] * (num_vars + 1)
+        self.ok = True
+        self.best_values = list(self.values)     # Assignment of the longest trail reached, for partial results
+        self.best_trail = 0
+        self.stats = {'decisions': 0, 'conflicts': 0, 'propagations': 0, 'learned': 0, 'deleted': 0,
+                      'restarts': 0}
+
+    def _value(self, lit):
+        value = self.values[lit if lit > 0 else -lit]
+        return value if lit > 0 else -value
+
+    def _enqueue(self, lit, reason):
+        var = lit if lit > 0 else -lit
+        self.values[var] = 1 if lit > 0 else -1
+        self.levels[var] = len(self.trail_lim)
+        self.reasons[var] = reason
+        self.trail.append(lit)
+
+    def _watch(self, clause_index):
+        clause = self.clauses[clause_index]
+        self.watches[_index(clause[0])].append(clause_index)
+        self.watches[_index(clause[1])].append(clause_index)
+
+    def add_clause(self, lits):
+        """
+        Add a clause between searches (at decision level 0).
+
+        :return: False if the formula became unsatisfiable.
+        """
+        if not self.ok:
+            return False
+        clause = []
+        for lit in lits:
+            value = self._value(lit)
+            if value == 1 or -lit in clause:
+                return True  # Satisfied or tautology
+            if value == 0 and lit not in clause:
+                clause.append(lit)
+        if not clause:
+            self.ok = False
+        elif len(clause) == 1:
+            self._enqueue(clause[0], None)
+            self.ok = self._propagate() is None
+        else:
+            self._store(clause, 0)
+        return self.ok
+
+    def _store(self, clause, lbd):
+        """ Append a clause and watch its first two literals; returns its index. """
+        self.clauses.append(clause)
+        self.clause_lbd.append(lbd)
+        self.clause_activity.append(0.0)
+        self._watch(len(self.clauses) - 1)
+        return len(self.clauses) - 1
+
+    def _propagate(self):
+        """ Unit propagation over the watched literals. Returns a conflicting clause index or None. """
+        clauses = self.clauses
+        watches = self.watches
+        values = self.values
+        while self.qhead < len(self.trail):
+            false_lit = -self.trail[self.qhead]
+            self.qhead += 1
+            self.stats['propagations'] += 1
+            watching = watches[_index(false_lit)]
+            keep = []
+            for position, clause_index in enumerate(watching):
+                clause = clauses[clause_index]
+                if clause[0] == false_lit:
+                    clause[0], clause[1] = clause[1], false_lit
+                first = clause[0]
+                first_value = values[first if first > 0 else -first]
+                if first < 0:
+                    first_value = -first_value
+                if first_value == 1:
+                    keep.append(clause_index)
+                    continue
+                for k in range(2, len(clause)):
+                    lit = clause[k]
+                    value = values[lit if lit > 0 else -lit]
+                    if (value if lit > 0 else -value) != -1:
+                        clause[1], clause[k] = lit, false_lit
+                        watches[_index(lit)].append(clause_index)
+                        break
+                else:
+                    keep.append(clause_index)
+                    if first_value == -1:
+                        keep.extend(watching[position + 1:])
+                        watches[_index(false_lit)] = keep
+                        return clause_index
+                    self._enqueue(first, clause_index)
+            watches[_index(false_lit)] = keep
+        return None
+
+    def _bump(self, var):
+        self.activity[var] += self.var_inc
+        if self.activity[var] > 1e100:
+            self.activity = [a * 1e-100 for a in self.activity]
+            self.var_inc *= 1e-100
+            self._rebuild_order()
+
+    def _rebuild_order(self):
+        """ Heap entries of exactly the unassigned variables, with their current activity. """
+        activity = self.activity
+        values = self.values
+        self.order = [(-activity[var], var) for var in range(1, self.num_vars + 1) if not values[var]]
+        heapq.heapify(self.order)
+
+    def _bump_clause(self, index):
+        activity = self.clause_activity
+        activity[index] += self.clause_inc
+        if activity[index] > 1e20:
+            for i in range(len(activity)):
+                activity[i] *= 1e-20
+            self.clause_inc *= 1e-20
+
+    def _analyze(self, conflict):
+        """
+        First-UIP conflict analysis.
+
+        :return: (learned clause with the asserting literal first, backtrack level).
+        """
+        level = len(self.trail_lim)
+        seen = set()
+        learned = [0]
+        counter = 0
+        lit = None
+        position = len(self.trail) - 1
+        clause = self.clauses[conflict]
+        if self.clause_lbd[conflict]:
+            self._bump_clause(conflict)
+        while True:
+            for q in (clause if lit is None else clause[1:]):
+                var = q if q > 0 else -q
+                if var not in seen and self.levels[var] > 0:
+                    seen.add(var)
+                    self._bump(var)
+                    if self.levels[var] == level:
+                        counter += 1
+                    else:
+                        learned.append(q)
+            while abs(self.trail[position]) not in seen:
+                position -= 1
+            lit = self.trail[position]
+            position -= 1
+            counter -= 1
+            if counter == 0:
+                break
+            reason = self.reasons[abs(lit)]
+            clause = self.clauses[reason]
+            if self.clause_lbd[reason]:
+                self._bump_clause(reason)
+        learned[0] = -lit
+
+        back_level = 0
+        if len(learned) > 1:
+            # Watch the literal assigned last (besides the UIP) so the clause is unit after backtracking
+            best = max(range(1, len(learned)), key=lambda i: self.levels[abs(learned[i])])
+            learned[1], learned[best] = learned[best], learned[1]
+            back_level = self.levels[abs(learned[1])]
+        return learned, back_level
+
+    def _cancel_until(self, level):
+        if len(self.trail_lim) <= level:
+            return
+        start = self.trail_lim[level]
+        order = self.order
+        activity = self.activity
+        for lit in self.trail[start:]:
+            var = lit if lit > 0 else -lit
+            self.phase[var] = lit > 0
+            self.values[var] = 0
+            self.reasons[var] = None
+            heapq.heappush(order, (-activity[var], var))
+        del self.trail[start:]
+        del self.trail_lim[level:]
+        self.qhead = len(self.trail)
+
+    def _pick_branch(self):
+        """
+        Most active unassigned variable (the lowest one on ties), with its saved phase; 0 if none is left.
+
+        A variable gets a heap entry whenever it is unassigned. Activity only changes while a variable
+        is assigned (conflict analysis bumps the variables on the trail), so every unassigned variable
+        has an entry holding its current activity; entries of assigned variables, and older entries
+        holding a lower activity, are dropped when they come out on top.
+        """
+        order = self.order
+        if len(order) > 4 * self.num_vars:
+            self._rebuild_order()
+            order = self.order
+        values = self.values
+        activity = self.activity
+        while order:
+            key, var = heapq.heappop(order)
+            if not values[var] and -key == activity[var]:
+                return var if self.phase[var] else -var
+        return 0
+
+    def _reduce_learned(self):
+        """
+        Delete the worse half of the learned clauses that are not glue clauses.
+
+        Only called at decision level 0, where no clause is the reason of an assignment conflict
+        analysis can reach, so clauses can be removed and the rest renumbered. The kept clauses keep
+        their literal order, so rebuilding the watch lists keeps the watched literals.
+        """
+        lbd = self.clause_lbd
+        activity = self.clause_activity
+        candidates = [i for i in range(len(self.clauses)) if lbd[i] > GLUE_LBD]
+        candidates.sort(key=lambda i: (lbd[i], -activity[i]))
+        dropped = set(candidates[len(candidates) // 2:])
+        kept = [i for i in range(len(self.clauses)) if i not in dropped]
+        renumber = {old: new for new, old in enumerate(kept)}
+        self.clauses = [self.clauses[i] for i in kept]
+        self.clause_lbd = [lbd[i] for i in kept]
+        self.clause_activity = [activity[i] for i in kept]
+        self.reasons = [None if reason is None else renumber.get(reason) for reason in self.reasons]
+        self.watches = [[] for _ in range(2 * self.num_vars + 2)]
+        for index in range(len(self.clauses)):
+            self._watch(index)
+        self.num_learned -= len(dropped)
+        self.max_learned += REDUCE_GROWTH
+        self.stats['deleted'] += len(dropped)
+
+    def solve(self, max_conflicts=None, budget=None):
+        """
+        Search for a satisfying assignment.
+
+        :param max_conflicts: Give up after this many conflicts (default is no limit).
+        :param budget: Optional SearchBudget ticked once per decision; BudgetExpired is raised when it
+                       runs out, with the longest partial assignment left in best_values.
+        :return: Model as a list of booleans indexed by variable (index 0 unused), None if the formula
+                 is unsatisfiable, or False if the conflict limit was reached.
+        """
+        if not self.ok or self._propagate() is not None:
+            self.ok = False
+            return None
+        conflicts = 0
+        restart_number = 1
+        restart_at = luby(restart_number) * RESTART_BASE
+        while True:
+            conflict = self._propagate()
+            if conflict is not None:
+                self.stats['conflicts'] += 1
+                conflicts += 1
+                if not self.trail_lim:
+                    self.ok = False
+                    return None
+                learned, back_level = self._analyze(conflict)
+                self._cancel_until(back_level)
+                if len(learned) == 1:
+                    self._enqueue(learned[0], None)
+                else:
+                    lbd = len({self.levels[abs(lit)] for lit in learned})
+                    index = self._store(learned, lbd)
+                    self._bump_clause(index)
+                    self._enqueue(learned[0], index)
+                    self.num_learned += 1
+                    self.stats['learned'] += 1
+                self.var_inc /= ACTIVITY_DECAY
+                self.clause_inc /= CLAUSE_DECAY
+                if max_conflicts is not None and conflicts >= max_conflicts:
+                    self._cancel_until(0)
+                    return False
+                if conflicts >= restart_at:
+                    self.stats['restarts'] += 1
+                    restart_number += 1
+                    restart_at = conflicts + luby(restart_number) * RESTART_BASE
+                    self._cancel_until(0)
+                    if self.num_learned > self.max_learned:
+                        self._reduce_learned()
+                continue
+            lit = self._pick_branch()
+            if not lit:
+                model = [value > 0 for value in self.values]
+                self._cancel_until(0)
+                return model
+            if budget is not None:
+                if len(self.trail) > self.best_trail:
+                    self.best_trail = len(self.trail)
+                    self.best_values = list(self.values)
+                try:
+                    budget.tick()
+                except BudgetExpired:
+                    self._cancel_until(0)
+                    raise
+            self.stats['decisions'] += 1
+            self.trail_lim.append(len(self.trail))
+            self._enqueue(lit, None)
+
+
+class CnfEncoding:
+    def __init__(self, puzzle):
+        """
+        CNF encoding of a puzzle's house grid.
+
+        Variable x(value, house) is true when the value is in the house. Every value is in exactly one
+        house and every house holds exactly one value of each attribute (at most one when the attribute
+        has fewer values than there are houses). Each binary clue is encoded as "value a in house h
+        implies value b in one of the houses the relation allows", in both directions; unary clues
+        become unit clauses.
+
+        :param puzzle: CompiledPuzzle.
+        """
+        self.puzzle = puzzle
+        self.num_houses = puzzle.num_houses
+        self.num_vars = len(puzzle.variables) * puzzle.num_houses
+        self.clauses = []
+        self._encode()
+
+    def literal(self, var, house):
+        """ CNF variable of a value (CompiledPuzzle variable id) in a house (1-based). """
+        return var * self.num_houses + house
+
+    def _exactly_one(self, lits, at_least=True):
+        if at_least:
+            self.clauses.append(list(lits))
+        for i in range(len(lits)):
+            for j in range(i + 1, len(lits)):
+                self.clauses.append([-lits[i], -lits[j]])
+
+    def _implies_any(self, var, house, other, mask):
+        clause = [-self.literal(var, house)]
+        clause.extend(self.literal(other, h) for h in range(1, self.num_houses + 1) if mask >> (h - 1) & 1)
+        self.clauses.append(clause)
+
+    def _encode(self):
+        puzzle = self.puzzle
+        houses = range(1, self.num_houses + 1)
+        for var in range(len(puzzle.variables)):
+            self._exactly_one([self.literal(var, h) for h in houses])
+        for number, group in enumerate(puzzle.groups):
+            for h in houses:
+                self._exactly_one([self.literal(var, h) for var in group], puzzle.exact_groups[number])
+        for clue in puzzle.clues:
+            if clue.b is None:
+                for h in houses:
+                    if not clue.mask >> (h - 1) & 1:
+                        self.clauses.append([-self.literal(clue.a, h)])
+                continue
+            for h in houses:
+                bit = 1 << (h - 1)
+                self._implies_any(clue.a, h, clue.b, clue.forward(bit))
+                self._implies_any(clue.b, h, clue.a, clue.backward(bit))
+
+    def domains(self, model):
+        """ Decode a model into solved domains (one house bit per value). """
+        domains = []
+        for var in range(len(self.puzzle.variables)):
+            domains.append(house_mask(h for h in range(1, self.num_houses + 1) if model[self.literal(var, h)]))
+        return domains
+
+    def partial_domains(self, values):
+        """ Domains left by a partial assignment (CdclSolver.values): every house not assigned false. """
+        domains = []
+        for var in range(len(self.puzzle.variables)):
+            domains.append(house_mask(h for h in range(1, self.num_houses + 1)
+                                      if values[self.literal(var, h)] != -1))
+        return domains
+
+    def blocking_clause(self, domains):
+        """ Clause excluding the given solved domains, used to look for further solutions. """
+        return [-self.literal(var, mask.bit_length()) for var, mask in enumerate(domains)]
+
+    def solver(self):
+        """ A fresh CdclSolver loaded with the encoding. """
+        solver = CdclSolver(self.num_vars)
+        for clause in self.clauses:
+            if not solver.add_clause(clause):
+                break
+        return solver
+
+    def write_dimacs(self, file):
+        """
+        Write the encoding in DIMACS CNF format.
+
+        Comment lines map every CNF variable to its value and house.
+
+        :param file: Path or open text file.
+        """
+        if isinstance(file, str):
+            with open(file, 'w') as f:
+                self.write_dimacs(f)
+            return
+        for var, (attr, val) in enumerate(self.puzzle.variables):
+            for h in range(1, self.num_houses + 1):
+                file.write(f"c {self.literal(var, h)} {attr}={val} house={h}\n")
+        file.write(f"p cnf {self.num_vars} {len(self.clauses)}\n")
+        for clause in self.clauses:
+            file.write(" ".join(str(lit) for lit in clause) + " 0\n")
+
+
+def iter_sat_solutions(puzzle, stats=None, budget=None):
+    """
+    Enumerate the solutions of a CompiledPuzzle with the CDCL solver, blocking each one found.
+
+    :param stats: Optional dictionary updated with the solver counters.
+    :param budget: Optional SearchBudget; when it runs out the enumeration stops and the domains of
+                   the longest partial assignment are offered to it.
+    :return: Generator of solved domain lists.
+    """
+    encoding = CnfEncoding(puzzle)
+    solver = encoding.solver()
+    try:
+        while True:
+            try:
+                model = solver.solve(budget=budget)
+            except BudgetExpired:
+                budget.offer_domains(encoding.partial_domains(solver.best_values))
+                return
+            if not model:
+                return
+            domains = encoding.domains(model)
+            yield domains
+            if not solver.add_clause(encoding.blocking_clause(domains)):
+                return
+    finally:
+        if stats is not None:
+            stats.update(solver.stats)
+
+
+def solve_sat(puzzle, stats=None, budget=None):
+    """
+    Return the first solution's domains found by the SAT backend, or None if there is none.
+
+    With a budget, None is also returned when it runs out; budget.best then holds the partial result.
+    """
+    return next(iter_sat_solutions(puzzle, stats, budget), None)
+
+
+def puzzle_to_dimacs(attributes, constraints, file, num_houses=5):
+    """
+    Export a puzzle (ZebraRandomSolver constraint dictionaries) as DIMACS CNF.
+
+    :param file: Path or open text file.
+    """
+    CnfEncoding(CompiledPuzzle(attributes, constraints, num_houses)).write_dimacs(file)
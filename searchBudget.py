@@ -0,0 +1,96 @@
+# searchBudget.py
+
+import time
+from constraint import Constraint
+
+
+class BudgetExpired(Exception):
+    """ Raised inside a search when its SearchBudget runs out. """
+
+
+class SearchBudget:
+    def __init__(self, deadline=None, max_nodes=None):
+        """
+        Latency bound for a search, and the best partial assignment seen before it ran out.
+
+        Searches call tick() once per node and offer() with their current state; tick() raises
+        BudgetExpired when the deadline passes or the node limit is reached, and the caller turns
+        `best` into its partial answer.
+
+        :param deadline: time.monotonic() value after which the search stops (default is no deadline).
+        :param max_nodes: Number of search nodes allowed (default is no limit).
+        """
+        self.deadline = deadline
+        self.max_nodes = max_nodes
+        self.nodes = 0
+        self.expired = False
+        self.best = None
+        self._best_key = None
+
+    @classmethod
+    def within(cls, seconds=None, max_nodes=None):
+        """ Budget expiring `seconds` from now. """
+        return cls(None if seconds is None else time.monotonic() + seconds, max_nodes)
+
+    def tick(self):
+        """ Count one search node; raise BudgetExpired once the budget is used up. """
+        self.nodes += 1
+        if self.max_nodes is not None and self.nodes > self.max_nodes:
+            self.expired = True
+        elif self.deadline is not None and time.monotonic() >= self.deadline:
+            self.expired = True
+        if self.expired:
+            raise BudgetExpired()
+
+    def offer(self, placed, remaining, snapshot):
+        """
+        Keep the search state if it is the best so far: most values placed, then fewest choices left.
+
+        :param placed: Number of variables with a single value left.
+        :param remaining: Total size of the domains.
+        :param snapshot: Callable returning a copy of the state; only called when it is kept.
+        """
+        key = (placed, -remaining)
+        if self._best_key is None or key > self._best_key:
+            self._best_key = key
+            self.best = snapshot()
+
+    def offer_domains(self, domains):
+        """ offer() for a list of house bitmasks, as used by the CompiledPuzzle engines. """
+        placed = remaining = 0
+        for mask in domains:
+            count = bin(mask).count('1')
+            remaining += count
+            if count == 1:
+                placed += 1
+        self.offer(placed, remaining, lambda: list(domains))
+
+
+class BudgetConstraint(Constraint):
+    def __init__(self, budget=None):
+        """
+        python-constraint constraint over every variable that enforces a SearchBudget.
+
+        The solver checks it on every assignment, so it counts nodes, keeps the best partial state
+        (a tuple of the assignments and a dictionary variable -> list of values still possible,
+        after forward checking) and stops the search by raising
+        BudgetExpired out of getSolution(). Add it after the other constraints: it is then only
+        reached by assignments they accepted, and sees the domains after their forward checking.
+
+        :param budget: SearchBudget, or None to accept everything (it can be set between searches).
+        """
+        self.budget = budget
+
+    def preProcess(self, variables, domains, constraints, vconstraints):
+        pass
+
+    def __call__(self, variables, domains, assignments, forwardcheck=False):
+        budget = self.budget
+        if budget is None:
+            return True
+        placed = len(assignments)
+        remaining = placed + sum(len(domains[var]) for var in variables if var not in assignments)
+        budget.offer(placed, remaining, lambda: (dict(assignments), {
+            var: [assignments[var]] if var in assignments else list(domains[var]) for var in variables}))
+        budget.tick()
+        return True
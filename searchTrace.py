@@ -0,0 +1,247 @@
+# searchTrace.py
+
+from array import array
+from constraint import BacktrackingSolver, Constraint, Domain
+
+# Event opcodes stored in the trace
+ASSIGN = 0      # A value was placed in a house cell
+PRUNE = 1       # Forward checking ruled a value out of a house cell
+BACKTRACK = 2   # A previously placed value was taken back out of its cell
+SOLUTION = 3    # The search reached a complete assignment
+
+EVENT_NAMES = {ASSIGN: "assign", PRUNE: "prune", BACKTRACK: "backtrack", SOLUTION: "solution"}
+
+# Every event is stored as four packed shorts: opcode, house, attribute id, value id
+EVENT_WIDTH = 4
+# Grid snapshots are kept every CHECKPOINT_INTERVAL events so seeking stays cheap
+CHECKPOINT_INTERVAL = 256
+
+
+class SearchTrace:
+    def __init__(self, attributes, num_houses=5):
+        """
+        Compact, array-backed log of the events of a single search.
+
+        :param attributes: Dictionary of attribute types and their possible values.
+                           Attribute and value names are stored once; events only hold integer ids.
+        :param num_houses: The number of houses in the puzzle (default is 5).
+        """
+        self.attribute_names = list(attributes)
+        self.values = [list(values) for values in attributes.values()]
+        self.num_houses = num_houses
+        self.events = array('h')
+        self._ids = {}
+        for attr_id, attr in enumerate(self.attribute_names):
+            for value_id, value in enumerate(self.values[attr_id]):
+                self._ids[(attr, value)] = (attr_id, value_id)
+
+    def __len__(self):
+        return len(self.events) // EVENT_WIDTH
+
+    def record(self, op, house, attr, value):
+        """
+        Append one event to the trace.
+
+        :param op: Event opcode (ASSIGN, PRUNE, BACKTRACK or SOLUTION).
+        :param house: House number (1-based) the event refers to, 0 if none.
+        :param attr: Attribute type of the cell, or None.
+        :param value: Attribute value of the cell, or None.
+        """
+        attr_id, value_id = self._ids.get((attr, value), (-1, -1))
+        self.events.extend((op, house, attr_id, value_id))
+
+    def clear(self):
+        """ Drop all recorded events, keeping the attribute schema. """
+        del self.events[:]
+
+    def event(self, index):
+        """
+        Decode the event at the given position.
+
+        :return: Tuple (op, house, attribute, value); attribute and value are None for SOLUTION events.
+        """
+        base = index * EVENT_WIDTH
+        op, house, attr_id, value_id = self.events[base:base + EVENT_WIDTH]
+        if attr_id < 0:
+            return op, house, None, None
+        return op, house, self.attribute_names[attr_id], self.values[attr_id][value_id]
+
+    def counts(self):
+        """ Return a dictionary with the number of events of each kind. """
+        totals = {name: 0 for name in EVENT_NAMES.values()}
+        for base in range(0, len(self.events), EVENT_WIDTH):
+            totals[EVENT_NAMES[self.events[base]]] += 1
+        return totals
+
+
+class TraceCursor:
+    def __init__(self, trace):
+        """
+        Replay position inside a SearchTrace.
+
+        The cursor reconstructs the grid as it looked after any number of events.
+        Snapshots are taken every CHECKPOINT_INTERVAL events, so seeking backwards
+        only replays a short stretch of the log instead of starting over.
+
+        :param trace: SearchTrace to replay.
+        """
+        self.trace = trace
+        self.position = 0
+        self.grid = [{} for _ in range(trace.num_houses)]
+        self.prunes = 0
+        self._checkpoints = {0: ([{} for _ in range(trace.num_houses)], 0)}
+
+    def __len__(self):
+        return len(self.trace)
+
+    def at_end(self):
+        return self.position >= len(self.trace)
+
+    def _apply(self, index):
+        op, house, attr, value = self.trace.event(index)
+        if op == ASSIGN:
+            self.grid[house - 1][attr] = value
+        elif op == BACKTRACK:
+            if self.grid[house - 1].get(attr) == value:
+                del self.grid[house - 1][attr]
+        elif op == PRUNE:
+            self.prunes += 1
+        position = index + 1
+        if position % CHECKPOINT_INTERVAL == 0 and position not in self._checkpoints:
+            self._checkpoints[position] = ([dict(cells) for cells in self.grid], self.prunes)
+
+    def seek(self, position):
+        """
+        Move the cursor to just after `position` events and rebuild the grid.
+
+        :param position: Number of events to have applied; clamped to the trace length.
+        :return: The new position.
+        """
+        position = max(0, min(position, len(self.trace)))
+        if position < self.position:
+            start = (position // CHECKPOINT_INTERVAL) * CHECKPOINT_INTERVAL
+            while start not in self._checkpoints:
+                start -= CHECKPOINT_INTERVAL
+            grid, prunes = self._checkpoints[start]
+            self.grid = [dict(cells) for cells in grid]
+            self.prunes = prunes
+            self.position = start
+        for index in range(self.position, position):
+            self._apply(index)
+        self.position = position
+        return position
+
+    def step(self, count=1):
+        """ Move forwards (or backwards for negative counts) by `count` events. """
+        return self.seek(self.position + count)
+
+    def skip_to_end(self):
+        return self.seek(len(self.trace))
+
+    def next_solution(self):
+        """
+        Move just past the next SOLUTION event, or to the end of the trace if there is none.
+
+        :return: The new position.
+        """
+        events = self.trace.events
+        for index in range(self.position, len(self.trace)):
+            if events[index * EVENT_WIDTH] == SOLUTION:
+                return self.seek(index + 1)
+        return self.skip_to_end()
+
+    def current_event(self):
+        """ Return the last applied event, or None at the start of the trace. """
+        if self.position == 0:
+            return None
+        return self.trace.event(self.position - 1)
+
+
+class _TracingDomain(Domain):
+    def __init__(self, values, variable, hidden):
+        """
+        Domain that reports every value forward checking hides, as (variable, value), to a shared list.
+        """
+        Domain.__init__(self, values)
+        self.variable = variable
+        self.hidden = hidden
+
+    def hideValue(self, value):
+        Domain.hideValue(self, value)
+        self.hidden.append((self.variable, value))
+
+
+class _AssignmentRecorder(Constraint):
+    def __init__(self, assigned):
+        """
+        Constraint on one variable that accepts everything and reports each value given to it.
+
+        The backtracking solver checks a variable's constraints in order right after assigning it,
+        so one of these at the head of every variable's list sees every assignment.
+        """
+        self.assigned = assigned
+
+    def __call__(self, variables, domains, assignments, forwardcheck=False):
+        self.assigned(variables[0], assignments[variables[0]])
+        return True
+
+
+class TracingBacktrackingSolver(BacktrackingSolver):
+    def __init__(self, trace, cell, forwardcheck=True):
+        """
+        python-constraint backtracking solver that logs its search into a SearchTrace.
+
+        The search is BacktrackingSolver's own, so its order and forward checking are unchanged. It
+        only sees the problem through the public Domain and Constraint interfaces: the domains are
+        copied into a Domain subclass whose hideValue reports forward checking, and a recorder
+        constraint at the head of each variable's constraint list reports assignments. A variable
+        that is assigned again while it is still on the stack of live assignments means everything
+        above it was taken back; the values hidden after an assignment are only logged once the
+        assignment turns out to be accepted (the search goes deeper or reaches a solution).
+
+        :param trace: SearchTrace receiving the events.
+        :param cell: Callable mapping (variable, value) to a (house, attribute, value) cell.
+        :param forwardcheck: Whether forward checking is performed (default is True).
+        """
+        super().__init__(forwardcheck)
+        self._trace = trace
+        self._cell = cell
+
+    def getSolutionIter(self, domains, constraints, vconstraints):
+        record = self._trace.record
+        cell = self._cell
+        live = []    # (variable, value) of the assignments recorded and not yet retracted, in order
+        depth = {}   # Position of each live variable in `live`
+        hidden = []  # (variable, value) hidden by forward checking since the last assignment
+
+        def retract_to(position):
+            while len(live) > position:
+                variable, value = live.pop()
+                del depth[variable]
+                record(BACKTRACK, *cell(variable, value))
+
+        def flush_prunes():
+            for variable, value in hidden:
+                record(PRUNE, *cell(variable, value))
+            del hidden[:]
+
+        def assigned(variable, value):
+            if variable in depth:
+                # Back at a live variable: the assignments from it upwards were rejected or exhausted
+                retract_to(depth[variable])
+                del hidden[:]
+            else:
+                flush_prunes()
+            depth[variable] = len(live)
+            live.append((variable, value))
+            record(ASSIGN, *cell(variable, value))
+
+        recorder = _AssignmentRecorder(assigned)
+        domains = {variable: _TracingDomain(domain, variable, hidden) for variable, domain in domains.items()}
+        vconstraints = {variable: [(recorder, [variable])] + list(scoped)
+                        for variable, scoped in vconstraints.items()}
+        for solution in super().getSolutionIter(domains, constraints, vconstraints):
+            flush_prunes()
+            record(SOLUTION, 0, None, None)
+            yield solution
+        retract_to(0)
@@ -0,0 +1,107 @@
+# solutionCounting.py
+
+from collections import OrderedDict
+from constraintPropagation import propagate
+from propagationSearch import house_bits
+
+# Most subproblem counts kept; the least recently used are dropped beyond this
+CACHE_SIZE = 100000
+
+
+class SolutionCounter:
+    def __init__(self, puzzle, cache_size=CACHE_SIZE):
+        """
+        Exact model counting over house domains, without building any solution.
+
+        Each node is propagated, then its open values are split into independent components:
+        values are linked when they share an attribute (AllDifferent) or a clue. Once every
+        value on the other side of a clue is placed, propagation has already applied that clue.
+        The count of a node is the product of its components' counts. Each component is counted
+        by branching on one value, and counts are memoised by the component's domains, so a
+        subproblem reached along different branches is counted once.
+
+        Memory is bounded by `cache_size` cached counts plus a recursion stack no deeper than the
+        number of values.
+
+        :param puzzle: CompiledPuzzle.
+        :param cache_size: Number of subproblem counts to keep.
+        """
+        self.puzzle = puzzle
+        self.cache_size = cache_size
+        self.cache = OrderedDict()
+        self.stats = {'nodes': 0, 'cache_hits': 0, 'splits': 0}
+        # Values linked to each value by an attribute or a binary clue
+        self.neighbours = [set(puzzle.groups[puzzle.group_of[var]]) for var in range(len(puzzle.variables))]
+        for clue in puzzle.clues:
+            if clue.b is not None:
+                self.neighbours[clue.a].add(clue.b)
+                self.neighbours[clue.b].add(clue.a)
+        for var, neighbours in enumerate(self.neighbours):
+            neighbours.discard(var)
+
+    def count(self, domains=None):
+        """ Number of solutions within the given domains (default is the whole puzzle). """
+        domains = self.puzzle.initial_domains() if domains is None else list(domains)
+        if not propagate(self.puzzle, domains):
+            return 0
+        return self._count(domains, range(len(domains)))
+
+    def components(self, domains, variables):
+        """ Split the open values among `variables` into independent components (lists of variable ids). """
+        open_vars = {var for var in variables if domains[var] & (domains[var] - 1)}
+        components = []
+        while open_vars:
+            start = open_vars.pop()
+            component = [start]
+            stack = [start]
+            while stack:
+                for other in self.neighbours[stack.pop()]:
+                    if other in open_vars:
+                        open_vars.remove(other)
+                        component.append(other)
+                        stack.append(other)
+            components.append(sorted(component))
+        return components
+
+    def _count(self, domains, variables):
+        components = self.components(domains, variables)
+        if len(components) > 1:
+            self.stats['splits'] += 1
+        total = 1
+        for component in components:
+            total *= self._count_component(domains, component)
+            if not total:
+                return 0
+        return total
+
+    def _count_component(self, domains, component):
+        key = (tuple(component), tuple(domains[var] for var in component))
+        if key in self.cache:
+            self.cache.move_to_end(key)
+            self.stats['cache_hits'] += 1
+            return self.cache[key]
+        self.stats['nodes'] += 1
+        var = min(component, key=lambda v: (bin(domains[v]).count('1'), -len(self.neighbours[v])))
+        total = 0
+        for bit in house_bits(domains[var]):
+            child = list(domains)
+            child[var] = bit
+            if propagate(self.puzzle, child, [var]):
+                total += self._count(child, component)
+        self.cache[key] = total
+        if len(self.cache) > self.cache_size:
+            self.cache.popitem(last=False)
+        return total
+
+
+def count_solutions(puzzle, stats=None, cache_size=CACHE_SIZE):
+    """
+    Exact number of solutions of a CompiledPuzzle, counted by SolutionCounter.
+
+    :param stats: Optional dictionary updated with the counter's 'nodes', 'cache_hits' and 'splits'.
+    """
+    counter = SolutionCounter(puzzle, cache_size)
+    count = counter.count()
+    if stats is not None:
+        stats.update(counter.stats)
+    return count
@@ -0,0 +1,15 @@
+# conftest.py
+
+import os
+import sys
+import pytest
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if ROOT not in sys.path:
+    sys.path.insert(0, ROOT)
+
+
+@pytest.fixture(autouse=True)
+def repo_directory(monkeypatch):
+    """ Game files are looked up relative to the working directory, as when the game is started. """
+    monkeypatch.chdir(ROOT)
@@ -0,0 +1,96 @@
+# puzzles.py
+
+import itertools
+import random
+from constraintPropagation import CompiledPuzzle
+
+HOLDS = {
+    'same_house': lambda a, b: a == b,
+    'next_to': lambda a, b: abs(a - b) == 1,
+    'left_of': lambda a, b: a + 1 == b,
+    'before': lambda a, b: a < b,
+}
+
+
+def random_puzzle(num_houses, num_attributes, num_clues, seed, satisfiable=True):
+    """
+    Random puzzle over attributes a0, a1, ... with values v<attr>_<j>.
+
+    :param satisfiable: Draw the clues from a hidden solution; otherwise the clues are arbitrary.
+    :return: Tuple (attributes, constraints).
+    """
+    rng = random.Random(seed)
+    attributes = {f"a{i}": [f"v{i}_{j}" for j in range(num_houses)] for i in range(num_attributes)}
+    placed = {}
+    for attr, values in attributes.items():
+        for value, house in zip(values, rng.sample(range(1, num_houses + 1), num_houses)):
+            placed[(attr, value)] = house
+    pairs = list(placed)
+    constraints = []
+    while len(constraints) < num_clues:
+        first, second = rng.sample(pairs, 2)
+        kind = rng.choice(['same_house', 'next_to', 'left_of', 'before', 'in_house'])
+        if kind == 'in_house':
+            houses = sorted(rng.sample(range(1, num_houses + 1), rng.randint(1, 2)))
+            if not satisfiable or placed[first] in houses:
+                constraints.append({'in_house': [first], 'houses': houses})
+        elif first[0] != second[0] or kind != 'same_house':
+            if not satisfiable or HOLDS[kind](placed[first], placed[second]):
+                constraints.append({kind: [first, second]})
+    return attributes, constraints
+
+
+def brute_force(attributes, constraints, num_houses):
+    """
+    Every solution, by trying each permutation of every attribute.
+
+    :return: Set of tuples holding the (1-based) house of each CompiledPuzzle variable, in variable order.
+    """
+    key = repr((attributes, constraints, num_houses))
+    if key not in _solutions:
+        _solutions[key] = frozenset(_brute_force(attributes, constraints, num_houses))
+    return _solutions[key]
+
+
+_solutions = {}  # Memoised brute_force results; many tests check the same small puzzles
+
+
+def _brute_force(attributes, constraints, num_houses):
+    order = CompiledPuzzle(attributes, constraints, num_houses).variables
+    solutions = set()
+    for permutations in itertools.product(*(itertools.permutations(range(1, num_houses + 1))
+                                            for _ in attributes)):
+        house = {}
+        for (attr, values), permutation in zip(attributes.items(), permutations):
+            for value, position in zip(values, permutation):
+                house[(attr, value)] = position
+        if all(_holds(constraint, house) for constraint in constraints):
+            solutions.add(tuple(house[pair] for pair in order))
+    return solutions
+
+
+def _holds(constraint, house):
+    if 'in_house' in constraint:
+        return house[tuple(constraint['in_house'][0])] in constraint['houses']
+    kind = next(kind for kind in HOLDS if kind in constraint)
+    first, second = constraint[kind]
+    return HOLDS[kind](house[tuple(first)], house[tuple(second)])
+
+
+def houses_of(domains):
+    """ Solved domain bitmasks as a tuple of 1-based houses, comparable with brute_force. """
+    return tuple(mask.bit_length() for mask in domains)
+
+
+def small_puzzles(count=40, satisfiable=True):
+    """ Puzzles of 3-4 houses and 2-3 attributes, small enough for brute_force. """
+    for seed in range(count):
+        num_houses = 3 + seed % 2
+        num_attributes = 2 + seed % 2
+        yield random_puzzle(num_houses, num_attributes, 2 + seed % 6, seed, satisfiable), num_houses
+
+
+def houses_tuple(attributes, constraints, num_houses, houses):
+    """ House dictionaries returned by ZebraRandomSolver as a tuple comparable with brute_force. """
+    position = {(attr, house[attr]): number for number, house in enumerate(houses, 1) for attr in attributes}
+    return tuple(position[pair] for pair in CompiledPuzzle(attributes, constraints, num_houses).variables)
@@ -0,0 +1,65 @@
+# test_allDifferent.py
+
+import itertools
+import random
+from constraint import Problem, AllDifferentConstraint
+from allDifferent import alldifferent_supports, GACAllDifferentConstraint
+from backTracking import ZebraPuzzleSolver
+from backtrackingRandom import ZebraRandomSolver
+from puzzleAssets import load_attributes, load_clues
+from tests.puzzles import brute_force, houses_tuple, small_puzzles
+
+
+def supported_by_brute_force(domains):
+    variables = list(domains)
+    supports = {var: set() for var in variables}
+    for values in itertools.product(*(domains[var] for var in variables)):
+        if len(set(values)) == len(values):
+            for var, value in zip(variables, values):
+                supports[var].add(value)
+    return supports if any(supports.values()) or not variables else None
+
+
+def test_hall_set_is_pruned():
+    # a and b share the two values 1 and 2, so c must take 3 and d is left with 4
+    supports = alldifferent_supports({'a': [1, 2], 'b': [1, 2], 'c': [1, 2, 3], 'd': [1, 2, 3, 4]})
+    assert supports == {'a': {1, 2}, 'b': {1, 2}, 'c': {3}, 'd': {4}}
+    assert alldifferent_supports({'a': [1, 2], 'b': [1, 2], 'c': [2, 1]}) is None
+
+
+def test_supports_match_brute_force():
+    rng = random.Random(2)
+    for _ in range(500):
+        values = list(range(rng.randint(2, 6)))
+        domains = {f"x{i}": rng.sample(values, rng.randint(1, len(values))) for i in range(rng.randint(1, 5))}
+        assert alldifferent_supports(domains) == supported_by_brute_force(domains)
+
+
+def test_constraint_keeps_the_solutions_of_alldifferent():
+    rng = random.Random(4)
+    for _ in range(100):
+        problems = [Problem(), Problem()]
+        variables = [f"x{i}" for i in range(rng.randint(2, 5))]
+        for var in variables:
+            domain = rng.sample(range(5), rng.randint(1, 4))
+            for problem in problems:
+                problem.addVariable(var, domain)
+        problems[0].addConstraint(AllDifferentConstraint(), variables)
+        problems[1].addConstraint(GACAllDifferentConstraint(), variables)
+        first, second = variables[:2]
+        for problem in problems:
+            problem.addConstraint(lambda a, b: a < b, [first, second])
+        expected = sorted(map(sorted, (solution.items() for solution in problems[0].getSolutions())))
+        # Solving again after an interrupted search must start from the full domains
+        problems[1].getSolution()
+        assert sorted(map(sorted, (solution.items() for solution in problems[1].getSolutions()))) == expected
+
+
+def test_solvers_with_gac():
+    for (attributes, constraints), num_houses in small_puzzles():
+        solutions = brute_force(attributes, constraints, num_houses)
+        houses = ZebraRandomSolver(attributes, constraints, num_houses, gac=True).solve()
+        assert houses_tuple(attributes, constraints, num_houses, houses) in solutions
+    solver = ZebraPuzzleSolver(load_attributes(), load_clues(), presolve=False, gac=True)
+    solver.solve(max_nodes=3)
+    assert solver.expired and solver.solve() == ZebraPuzzleSolver(load_attributes(), load_clues(), gac=False).solve()
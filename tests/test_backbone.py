@@ -0,0 +1,22 @@
+# test_backbone.py
+
+from backbone import find_backbone
+from constraintPropagation import CompiledPuzzle
+from tests.puzzles import brute_force, small_puzzles
+
+
+def test_backbone_matches_brute_force():
+    for (attributes, constraints), num_houses in small_puzzles(satisfiable=False):
+        solutions = brute_force(attributes, constraints, num_houses)
+        backbone = find_backbone(attributes, constraints, num_houses)
+        if not solutions:
+            assert backbone is None
+            continue
+        variables = CompiledPuzzle(attributes, constraints, num_houses).variables
+        for var, pair in enumerate(variables):
+            houses = {solution[var] for solution in solutions}
+            # Fixed values are exact; ambiguous ones list only the houses of the solutions examined
+            assert set(backbone.values[pair]) <= houses
+            assert (len(backbone.values[pair]) == 1) == (len(houses) == 1)
+        assert backbone.is_unique() == (len(solutions) == 1)
+        assert len(backbone.cells) + len(backbone.ambiguous) == num_houses * len(attributes)
@@ -0,0 +1,69 @@
+# test_checkerCodegen.py
+
+from constraint import Problem, AllDifferentConstraint
+import checkerCodegen
+from checkerCodegen import checker_source, clue_key, generated_checkers
+from backTracking import ZebraPuzzleSolver
+from constraintPropagation import CompiledPuzzle, constraint_kind
+from puzzleAssets import load_attributes, load_clues
+from tests.puzzles import brute_force, small_puzzles
+
+
+def grid_solutions(attributes, constraints, num_houses):
+    """ Solve the per-house grid ('attr_house' variables) with the generated checkers, as ZebraPuzzleSolver does. """
+    problem = Problem()
+    houses = range(1, num_houses + 1)
+    for attr, values in attributes.items():
+        for house in houses:
+            problem.addVariable(f"{attr}_{house}", values)
+        problem.addConstraint(AllDifferentConstraint(), [f"{attr}_{house}" for house in houses])
+    checkers = generated_checkers(attributes, constraints, num_houses)
+    for constraint in constraints:
+        kind = constraint_kind(constraint)
+        check = checkers[clue_key(constraint)]
+        if kind == 'in_house':
+            (attr, value), = constraint[kind]
+            problem.addConstraint(check, [f"{attr}_{house}" for house in constraint['houses']])
+        elif kind == 'same_house':
+            (attr1, value1), (attr2, value2) = constraint[kind]
+            for house in houses:
+                problem.addConstraint(check, [f"{attr1}_{house}", f"{attr2}_{house}"])
+        else:
+            (attr1, value1), (attr2, value2) = constraint[kind]
+            problem.addConstraint(check, [f"{attr1}_{house}" for house in houses] +
+                                  [f"{attr2}_{house}" for house in houses])
+    order = CompiledPuzzle(attributes, constraints, num_houses).variables
+    found = set()
+    for solution in problem.getSolutions():
+        position = {(attr, solution[f"{attr}_{house}"]): house for attr in attributes for house in houses}
+        found.add(tuple(position[pair] for pair in order))
+    return found
+
+
+def test_generated_checkers_match_brute_force():
+    for (attributes, constraints), num_houses in small_puzzles(satisfiable=False):
+        assert grid_solutions(attributes, constraints, num_houses) == brute_force(attributes, constraints, num_houses)
+
+
+def test_source_has_one_class_per_distinct_clue():
+    (attributes, constraints), num_houses = next(small_puzzles(1))
+    source = checker_source(constraints + constraints, num_houses)
+    namespace = {}
+    exec(compile(source, '<test>', 'exec'), namespace)
+    assert set(namespace['CHECKERS']) == {clue_key(constraint) for constraint in constraints}
+
+
+def test_checkers_are_cached_per_puzzle(monkeypatch):
+    monkeypatch.setattr(checkerCodegen, 'CACHE_SIZE', 2)
+    checkerCodegen._cache.clear()
+    puzzles = [puzzle for puzzle, num_houses in small_puzzles(6) if num_houses == 3]
+    first = generated_checkers(*puzzles[0], 3)
+    assert generated_checkers(*puzzles[0], 3) is first
+    for attributes, constraints in puzzles[1:]:
+        generated_checkers(attributes, constraints, 3)
+    assert len(checkerCodegen._cache) == 2
+
+
+def test_original_puzzle_with_codegen():
+    attributes, clues = load_attributes(), load_clues()
+    assert ZebraPuzzleSolver(attributes, clues, codegen=True).solve() == ZebraPuzzleSolver(attributes, clues).solve()
@@ -0,0 +1,50 @@
+# test_clueAnalysis.py
+
+from clueAnalysis import analyze_clues, drop_redundant_clues, idle_clues, without_clue
+from constraintPropagation import CompiledPuzzle, propagate
+from tests.puzzles import brute_force, small_puzzles
+
+
+def test_redundancy_matches_brute_force():
+    for (attributes, constraints), num_houses in small_puzzles(16, satisfiable=False):
+        solutions = brute_force(attributes, constraints, num_houses)
+        reports = analyze_clues(attributes, constraints, num_houses)
+        assert [report.constraint for report in reports] == constraints
+        for index, report in enumerate(reports):
+            others = constraints[:index] + constraints[index + 1:]
+            assert report.redundant == (brute_force(attributes, others, num_houses) == solutions)
+            assert report.pruned >= 0
+
+
+def test_dropping_redundant_clues_keeps_the_solutions():
+    for (attributes, constraints), num_houses in small_puzzles(16):
+        solutions = brute_force(attributes, constraints, num_houses)
+        kept = drop_redundant_clues(attributes, constraints, num_houses)
+        assert brute_force(attributes, kept, num_houses) == solutions
+        # No clue left is implied by the others
+        for index in range(len(kept)):
+            assert brute_force(attributes, kept[:index] + kept[index + 1:], num_houses) != solutions
+
+
+def test_pruning_is_counted_on_a_bounded_search():
+    for (attributes, constraints), num_houses in small_puzzles(16):
+        bounded = analyze_clues(attributes, constraints, num_houses)
+        complete = analyze_clues(attributes, constraints, num_houses, limit=None)
+        assert [report.redundant for report in bounded] == [report.redundant for report in complete]
+        assert all(a.pruned <= b.pruned for a, b in zip(bounded, complete))
+    # 8!^8 solutions: only a bounded search can finish
+    attributes = {f"attr{i}": [f"v{i}{j}" for j in range(8)] for i in range(8)}
+    constraints = [{'next_to': [('attr0', 'v00'), ('attr1', 'v10')]}]
+    [report] = analyze_clues(attributes, constraints, 8)
+    assert not report.redundant and report.pruned > 0
+
+
+def test_idle_clues_share_the_fixpoint_of_the_others():
+    for (attributes, constraints), num_houses in small_puzzles(40, satisfiable=False):
+        puzzle = CompiledPuzzle(attributes, constraints, num_houses)
+        fixpoint, idle = idle_clues(puzzle)
+        for clue in puzzle.clues:
+            if clue.id in idle:
+                others = without_clue(puzzle, clue)
+                domains = others.initial_domains()
+                assert propagate(others, domains) and domains == fixpoint
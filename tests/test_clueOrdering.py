@@ -0,0 +1,42 @@
+# test_clueOrdering.py
+
+import itertools
+import random
+import pytest
+
+
+@pytest.fixture
+def game(monkeypatch):
+    """ zebraPuzzleGame, imported without opening a window. """
+    monkeypatch.setenv('SDL_VIDEODRIVER', 'dummy')
+    pytest.importorskip('pygame')
+    import zebraPuzzleGame
+    return zebraPuzzleGame
+
+
+def separated(order):
+    return all(not set(first.get('houses', [])) & set(second.get('houses', []))
+               for first, second in zip(order, order[1:]))
+
+
+def test_order_exists_exactly_when_brute_force_finds_one(game):
+    rng = random.Random(0)
+    for _ in range(300):
+        clues = [{'id': i, 'houses': rng.sample(range(1, 5), rng.randint(0, 2))} for i in range(rng.randint(0, 7))]
+        possible = any(separated(order) for order in itertools.permutations(clues))
+        order = game.order_constraints_no_consecutive_same_house(clues, random.Random(1))
+        if order is None:
+            assert not possible
+        else:
+            assert possible and separated(order)
+            assert sorted(clue['id'] for clue in order) == list(range(len(clues)))
+
+
+def test_generated_puzzles_are_ordered_in_place(game):
+    for seed in range(20):
+        random.seed(seed)
+        solution = game.get_random_attr(game.attributes).houses
+        constraints = game.generate_constraints_from_solution(solution)
+        ordered = game.shuffle_constraints_no_consecutive_same_house(constraints)
+        assert ordered is constraints
+        assert separated(ordered) or game.order_constraints_no_consecutive_same_house(ordered) is None
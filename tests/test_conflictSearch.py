@@ -0,0 +1,26 @@
+# test_conflictSearch.py
+
+from backtrackingRandom import ZebraRandomSolver
+from conflictSearch import ConflictDirectedSearch
+from constraintPropagation import CompiledPuzzle
+from tests.puzzles import brute_force, houses_of, houses_tuple, small_puzzles
+
+
+def test_enumerates_every_solution_once():
+    for max_nogood_size in (None, 2):
+        for (attributes, constraints), num_houses in small_puzzles(satisfiable=False):
+            search = ConflictDirectedSearch(CompiledPuzzle(attributes, constraints, num_houses),
+                                            max_nogood_size=max_nogood_size)
+            found = [houses_of(domains) for domains in search.iter_solutions()]
+            assert len(found) == len(set(found))
+            assert set(found) == brute_force(attributes, constraints, num_houses)
+
+
+def test_solver_method():
+    for (attributes, constraints), num_houses in small_puzzles(satisfiable=False):
+        solutions = brute_force(attributes, constraints, num_houses)
+        houses = ZebraRandomSolver(attributes, constraints, num_houses, method='cbj').solve()
+        if solutions:
+            assert houses_tuple(attributes, constraints, num_houses, houses) in solutions
+        else:
+            assert houses is False
@@ -0,0 +1,42 @@
+# test_difficultyRater.py
+
+import difficultyRater
+from difficultyRater import rate_puzzle, sort_puzzle_bank, UNSOLVABLE, PROPAGATION, SEARCH
+from puzzleFormat import PuzzleBankWriter, PuzzleBank
+from tests.puzzles import brute_force, small_puzzles
+
+ATTRIBUTES = {'color': ['red', 'green', 'blue'], 'pet': ['dog', 'fox', 'zebra']}
+SOLVED = [{'in_house': [('color', 'red')], 'houses': [1]}, {'in_house': [('color', 'green')], 'houses': [2]},
+          {'same_house': [('color', 'red'), ('pet', 'dog')]}, {'same_house': [('color', 'green'), ('pet', 'fox')]}]
+CONTRADICTION = [{'in_house': [('color', 'red')], 'houses': [1]}, {'in_house': [('color', 'green')], 'houses': [1]}]
+
+
+def test_ratings_agree_with_solution_counts():
+    for (attributes, constraints), num_houses in small_puzzles(satisfiable=False):
+        solutions = len(brute_force(attributes, constraints, num_houses))
+        rating = rate_puzzle(attributes, constraints, num_houses)
+        assert rating.solutions == min(solutions, 2)
+        assert (rating.tier == UNSOLVABLE) == (solutions == 0)
+
+
+def test_unsolvable_puzzles_sort_last(tmp_path):
+    assert rate_puzzle(ATTRIBUTES, SOLVED, 3).tier == PROPAGATION
+    assert rate_puzzle(ATTRIBUTES, CONTRADICTION, 3).name == 'unsolvable'
+    source, target = str(tmp_path / 'source.zpb'), str(tmp_path / 'target.zpb')
+    with PuzzleBankWriter(source, ATTRIBUTES) as writer:
+        writer.append(CONTRADICTION, 3)
+        writer.append([], 3)
+        writer.append(SOLVED, 3)
+    assert sort_puzzle_bank(source, target) == 3
+    with PuzzleBank(target) as bank:
+        tiers = [bank.rating(index)[0] for index in range(len(bank))]
+        assert tiers == [PROPAGATION, SEARCH, UNSOLVABLE]
+        assert bank[2][0] == CONTRADICTION
+
+
+def test_rating_cache_is_bounded(monkeypatch):
+    monkeypatch.setattr(difficultyRater, 'CACHE_SIZE', 3)
+    difficultyRater._rating_cache.clear()
+    for (attributes, constraints), num_houses in small_puzzles(10):
+        rate_puzzle(attributes, constraints, num_houses)
+    assert len(difficultyRater._rating_cache) <= 3
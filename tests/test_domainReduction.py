@@ -0,0 +1,46 @@
+# test_domainReduction.py
+
+from backtrackingRandom import ZebraRandomSolver
+from constraintPropagation import CompiledPuzzle
+from domainReduction import reduce_domains, house_domains, same_house_classes
+from tests.puzzles import brute_force, houses_tuple, small_puzzles
+
+
+def test_reduced_domains_keep_every_solution():
+    for (attributes, constraints), num_houses in small_puzzles(satisfiable=False):
+        solutions = brute_force(attributes, constraints, num_houses)
+        value_houses = reduce_domains(attributes, constraints, num_houses)
+        if value_houses is None:
+            assert not solutions
+            continue
+        order = CompiledPuzzle(attributes, constraints, num_houses).variables
+        for solution in solutions:
+            for pair, house in zip(order, solution):
+                assert house in value_houses[pair]
+        per_house = house_domains(attributes, value_houses, num_houses)
+        for attr, values in attributes.items():
+            assert len(per_house[attr]) == num_houses
+            for house, allowed in enumerate(per_house[attr], 1):
+                assert allowed == [val for val in values if house in value_houses[(attr, val)]]
+
+
+def test_same_house_classes_share_a_house():
+    for (attributes, constraints), num_houses in small_puzzles(satisfiable=False):
+        classes = same_house_classes(attributes, constraints)
+        order = CompiledPuzzle(attributes, constraints, num_houses).variables
+        for solution in brute_force(attributes, constraints, num_houses):
+            house = dict(zip(order, solution))
+            assert all(house[pair] == house[representative] for pair, representative in classes.items())
+        for pair, representative in classes.items():
+            assert pair == representative or pair[0] != representative[0]
+
+
+def test_presolve_keeps_the_solutions():
+    for presolve in (True, False):
+        for (attributes, constraints), num_houses in small_puzzles(satisfiable=False):
+            solutions = brute_force(attributes, constraints, num_houses)
+            houses = ZebraRandomSolver(attributes, constraints, num_houses, presolve=presolve).solve()
+            if solutions:
+                assert houses_tuple(attributes, constraints, num_houses, houses) in solutions
+            else:
+                assert houses is False
@@ -0,0 +1,59 @@
+# test_hintEngine.py
+
+from backTracking import ZebraPuzzleSolver
+from constraintPropagation import CompiledPuzzle, propagate
+from hintEngine import next_hint
+from puzzleAssets import load_attributes, load_clues, load_solution
+from tests.puzzles import brute_force, small_puzzles
+
+
+def test_propagation_keeps_every_solution():
+    for (attributes, constraints), num_houses in small_puzzles(satisfiable=False):
+        solutions = brute_force(attributes, constraints, num_houses)
+        puzzle = CompiledPuzzle(attributes, constraints, num_houses)
+        domains = puzzle.initial_domains()
+        if not propagate(puzzle, domains):
+            assert not solutions
+            continue
+        for solution in solutions:
+            assert all(mask >> (house - 1) & 1 for mask, house in zip(domains, solution))
+
+
+def original_puzzle():
+    attributes = load_attributes()
+    puzzle = CompiledPuzzle(attributes, ZebraPuzzleSolver(attributes, load_clues()).constraints)
+    solution = [{attr: house[attr] for attr in attributes} for house in load_solution()]
+    return puzzle, solution
+
+
+def test_hints_agree_with_the_solution():
+    puzzle, solution = original_puzzle()
+    grid = [{} for _ in solution]
+    hint = next_hint(puzzle, grid)
+    while hint.kind == 'place':
+        assert hint.constraints
+        assert solution[hint.house - 1][hint.attribute] == hint.value
+        grid[hint.house - 1][hint.attribute] = hint.value
+        hint = next_hint(puzzle, grid)
+    assert any(grid)
+    if hint.kind == 'exclude':
+        house = next(number for number, house in enumerate(solution, 1) if house[hint.attribute] == hint.value)
+        assert house in hint.houses
+    else:
+        assert hint.kind == 'none'
+    # A finished grid leaves nothing to deduce
+    assert next_hint(puzzle, solution).kind == 'none'
+
+
+def test_conflict_names_the_contradicting_cells():
+    puzzle, solution = original_puzzle()
+    grid = [dict(house) for house in solution]
+    grid[0]['color'], grid[1]['color'] = grid[1]['color'], grid[0]['color']
+    hint = next_hint(puzzle, grid)
+    assert hint.kind == 'conflict'
+    subgrid = [{} for _ in grid]
+    for house, attr, value in hint.cells:
+        subgrid[house - 1][attr] = value
+    domains = puzzle.grid_domains(subgrid)
+    assert domains is None or not propagate(puzzle, domains)
+    assert len(hint.cells) < sum(len(house) for house in grid)
@@ -0,0 +1,48 @@
+# test_houseGrid.py
+
+import random
+from houseGrid import HouseGrid
+
+ATTRIBUTES = {'color': ['red', 'green', 'blue', 'white'], 'pet': ['dog', 'cat', 'fox', 'owl']}
+
+
+def test_random_edits_match_house_dictionaries():
+    rng = random.Random(0)
+    grid = HouseGrid(ATTRIBUTES, 4)
+    model = [{} for _ in range(4)]
+    for step in range(3000):
+        house, attr = rng.randrange(4), rng.choice(list(ATTRIBUTES))
+        # Mostly known values, sometimes an empty cell or a value the schema does not list
+        value = rng.choice(ATTRIBUTES[attr] + [None, 'other'])
+        if rng.random() < 0.5:
+            grid.set(house, attr, value)
+        else:
+            grid[house][attr] = value
+        if value is None:
+            model[house].pop(attr, None)
+        else:
+            model[house][attr] = value
+        assert grid.to_dicts() == model
+        assert grid.filled() == sum(len(cells) for cells in model)
+        for attr, values in ATTRIBUTES.items():
+            for value in values + ['other']:
+                holders = [number for number, cells in enumerate(model) if cells.get(attr) == value]
+                assert grid.where(attr, value) in (holders or [None])
+                for exclude in range(4):
+                    others = [number for number in holders if number != exclude]
+                    assert grid.where(attr, value, exclude) in (others or [None])
+        if step % 500 == 0:
+            copy = grid.copy()
+            copy.clear()
+            assert grid.to_dicts() == model and copy.filled() == 0
+
+
+def test_rows_behave_like_dictionaries():
+    houses = [{'number': '1', 'color': 'red'}, {'pet': 'dog'}]
+    grid = HouseGrid.from_dicts(ATTRIBUTES, houses)
+    assert len(grid) == 2 and grid.to_dicts() == [{'color': 'red'}, {'pet': 'dog'}]
+    row = grid[-1]
+    assert dict(row) == {'pet': 'dog'} and 'color' not in row and row.get('color') is None
+    row['color'] = 'blue'
+    del row['pet']
+    assert grid.house(1) == {'color': 'blue'} and grid.where('pet', 'dog') is None
@@ -0,0 +1,21 @@
+# test_houseSweep.py
+
+from backtrackingRandom import ZebraRandomSolver
+from constraintPropagation import CompiledPuzzle
+from houseSweep import HouseSweep, count_sweep
+from tests.puzzles import brute_force, houses_of, houses_tuple, small_puzzles
+
+
+def test_sweep_lists_and_counts_every_solution():
+    for (attributes, constraints), num_houses in small_puzzles(satisfiable=False):
+        solutions = brute_force(attributes, constraints, num_houses)
+        puzzle = CompiledPuzzle(attributes, constraints, num_houses)
+        found = [houses_of(domains) for domains in HouseSweep(puzzle).iter_solutions()]
+        assert len(found) == len(set(found))
+        assert set(found) == solutions
+        assert count_sweep(puzzle) == len(solutions)
+        houses = ZebraRandomSolver(attributes, constraints, num_houses, method='sweep').solve()
+        if solutions:
+            assert houses_tuple(attributes, constraints, num_houses, houses) in solutions
+        else:
+            assert houses is False
@@ -0,0 +1,24 @@
+# test_localSearch.py
+
+import random
+from constraintPropagation import CompiledPuzzle
+from localSearch import LocalSearch, solve_local
+from tests.puzzles import brute_force, houses_of, small_puzzles
+
+
+def test_local_search_finds_solutions():
+    for (attributes, constraints), num_houses in small_puzzles():
+        puzzle = CompiledPuzzle(attributes, constraints, num_houses)
+        domains = solve_local(puzzle, time_limit=None, rng=random.Random(0))
+        assert houses_of(domains) in brute_force(attributes, constraints, num_houses)
+
+
+def test_seeded_runs_are_reproducible():
+    for (attributes, constraints), num_houses in small_puzzles(10, satisfiable=False):
+        runs = []
+        for _ in range(2):
+            # Fresh compilations, so nothing depends on the objects' addresses
+            search = LocalSearch(CompiledPuzzle(attributes, constraints, num_houses), random.Random(7))
+            domains, violations = search.solve(time_limit=None, max_restarts=2)
+            runs.append((domains, violations, search.stats))
+        assert runs[0] == runs[1]
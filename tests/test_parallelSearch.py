@@ -0,0 +1,93 @@
+# test_parallelSearch.py
+
+import multiprocessing
+import signal
+import time
+from backtrackingRandom import ZebraRandomSolver
+from constraintPropagation import CompiledPuzzle, propagate
+from parallelSearch import split_units, parallel_solutions, is_unique_parallel, default_sigterm, hold_sigterm, release_sigterm
+from propagationSearch import iter_solutions
+from searchBudget import SearchBudget
+from tests.puzzles import brute_force, houses_of, houses_tuple, random_puzzle, small_puzzles
+
+
+def test_units_partition_the_solutions():
+    for (attributes, constraints), num_houses in small_puzzles(satisfiable=False):
+        puzzle = CompiledPuzzle(attributes, constraints, num_houses)
+        domains = puzzle.initial_domains()
+        found = []
+        if propagate(puzzle, domains):
+            for unit in split_units(puzzle, domains, 8):
+                found += [houses_of(solution) for solution in iter_solutions(puzzle, unit)]
+        assert len(found) == len(set(found))
+        assert set(found) == brute_force(attributes, constraints, num_houses)
+
+
+def test_pool_finds_every_solution():
+    pooled = 0
+    for (attributes, constraints), num_houses in small_puzzles(8, satisfiable=False):
+        solutions = brute_force(attributes, constraints, num_houses)
+        stats = {}
+        found = [houses_of(domains) for domains in
+                 parallel_solutions(attributes, constraints, num_houses, limit=10 ** 6, processes=2, stats=stats)]
+        pooled += stats.get('units', 0) > 0
+        assert len(found) == len(set(found))
+        assert set(found) == solutions
+        stopped = [houses_of(domains) for domains in parallel_solutions(attributes, constraints, num_houses, 2, 2)]
+        assert len(stopped) == min(2, len(solutions)) and set(stopped) <= solutions
+        assert is_unique_parallel(attributes, constraints, num_houses, processes=2) == (len(solutions) == 1)
+        houses = ZebraRandomSolver(attributes, constraints, num_houses, method='parallel').solve()
+        if solutions:
+            assert houses_tuple(attributes, constraints, num_houses, houses) in solutions
+        else:
+            assert houses is False
+    assert pooled
+
+
+def test_workers_stop_when_parent_handles_sigterm():
+    # pygame catches SIGTERM in the game process; the workers must still be terminated
+    attributes, constraints = random_puzzle(4, 3, 4, 5)
+    previous = signal.signal(signal.SIGTERM, signal.SIG_IGN)
+    try:
+        stats = {}
+        found = parallel_solutions(attributes, constraints, 4, 2, 2, stats)
+    finally:
+        signal.signal(signal.SIGTERM, previous)
+    assert stats['units'] > 0 and len(found) == 2
+    assert {houses_of(domains) for domains in found} <= brute_force(attributes, constraints, 4)
+
+
+def test_budget_stops_the_pool():
+    # A loose puzzle with far too many solutions to list within either budget
+    attributes, constraints = random_puzzle(5, 4, 3, 2)
+    puzzle = CompiledPuzzle(attributes, constraints, 5)
+    start = time.monotonic()
+    for budget in (SearchBudget.within(0.5), SearchBudget(max_nodes=200)):
+        found = parallel_solutions(attributes, constraints, 5, 10 ** 6, 2, budget=budget)
+        assert budget.expired and len(found) < 10 ** 6
+        assert all(best & ~initial == 0 for best, initial in zip(budget.best, puzzle.initial_domains()))
+    assert time.monotonic() - start < 10
+
+
+def _slow_worker():
+    time.sleep(0.5)
+    default_sigterm()
+    time.sleep(30)
+
+
+def test_terminate_before_the_worker_is_ready():
+    # The worker inherits SIG_IGN and is terminated before it restores the default action
+    previous = signal.signal(signal.SIGTERM, signal.SIG_IGN)
+    held = hold_sigterm()
+    try:
+        worker = multiprocessing.Process(target=_slow_worker, daemon=True)
+        worker.start()
+    finally:
+        release_sigterm(held)
+        signal.signal(signal.SIGTERM, previous)
+    worker.terminate()
+    worker.join(5)
+    alive = worker.is_alive()
+    if alive:
+        worker.kill()
+    assert not alive and worker.exitcode == -signal.SIGTERM
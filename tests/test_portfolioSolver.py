@@ -0,0 +1,47 @@
+# test_portfolioSolver.py
+
+import signal
+import time
+from portfolioSolver import solve_portfolio, winner_counts, DEFAULT_PORTFOLIO
+from tests.puzzles import brute_force, houses_tuple, random_puzzle, small_puzzles
+
+
+def test_portfolio_answers_match_brute_force(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    for (attributes, constraints), num_houses in small_puzzles(6, satisfiable=False):
+        solutions = brute_force(attributes, constraints, num_houses)
+        result = solve_portfolio(attributes, constraints, num_houses)
+        assert result.winner in DEFAULT_PORTFOLIO
+        if solutions:
+            assert houses_tuple(attributes, constraints, num_houses, result.houses) in solutions
+        else:
+            assert result.houses is False
+    # Every race is logged to PORTFOLIO_LOG in the working directory
+    assert sum(winner_counts().values()) == 6
+
+
+def test_winner_log(tmp_path):
+    log_path = str(tmp_path / 'log.jsonl')
+    (attributes, constraints), num_houses = next(small_puzzles(1))
+    for _ in range(2):
+        winner = solve_portfolio(attributes, constraints, num_houses, log_path=log_path).winner
+    assert sum(winner_counts(log_path).values()) == 2
+    assert winner in winner_counts(log_path)
+
+
+def test_workers_stop_when_parent_handles_sigterm(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    # pygame catches SIGTERM in the game process; the losing local search must still be terminated
+    attributes, constraints = random_puzzle(4, 3, 10, 0, satisfiable=False)
+    assert not brute_force(attributes, constraints, 4)
+    previous = signal.signal(signal.SIGTERM, signal.SIG_IGN)
+    try:
+        start = time.perf_counter()
+        result = solve_portfolio(attributes, constraints, 4, configs={'sat': {'method': 'sat'},
+                                                                      'local': {'method': 'local'}})
+        elapsed = time.perf_counter() - start
+    finally:
+        signal.signal(signal.SIGTERM, previous)
+    assert result.winner == 'sat' and result.houses is False
+    # The local search runs until its 10 second limit unless it is terminated
+    assert elapsed < 5
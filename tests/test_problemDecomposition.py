@@ -0,0 +1,48 @@
+# test_problemDecomposition.py
+
+import random
+from constraint import Problem, AllDifferentConstraint
+from problemDecomposition import ProblemGraph
+
+
+def random_graph(seed):
+    """ Random small CSP: several chains or cycles of binary constraints, some fixed variables and an AllDifferent. """
+    rng = random.Random(seed)
+    problem, graph = Problem(), ProblemGraph()
+    variables = [f"x{i}" for i in range(rng.randint(3, 7))]
+    for var in variables:
+        domain = [rng.randint(1, 3)] if rng.random() < 0.2 else list(range(1, rng.randint(2, 4) + 1))
+        problem.addVariable(var, domain)
+        graph.addVariable(var, domain)
+    relations = [lambda a, b: a != b, lambda a, b: a < b, lambda a, b: abs(a - b) == 1, lambda a, b: a + b > 3]
+    for _ in range(rng.randint(0, len(variables))):
+        first, second = rng.sample(variables, 2)
+        relation = rng.choice(relations)
+        problem.addConstraint(relation, [first, second])
+        graph.addConstraint(relation, [first, second])
+    if rng.random() < 0.3:
+        scope = rng.sample(variables, 3)
+        problem.addConstraint(AllDifferentConstraint(), scope)
+        graph.addConstraint(AllDifferentConstraint(), scope)
+    return problem, graph
+
+
+def test_components_and_trees_count_every_solution():
+    tree_components = 0
+    for seed in range(200):
+        problem, graph = random_graph(seed)
+        solutions = problem.getSolutions()
+        solution = graph.solve()
+        assert graph.stats['solutions'] == len(solutions)
+        assert (solution is None) == (not solutions)
+        if solution is not None:
+            assert solution in solutions
+        tree_components += graph.stats['tree_components']
+    assert tree_components > 0
+
+
+def test_unsplit_graph_is_one_problem():
+    problem, graph = random_graph(5)
+    graph.solve(split=False)
+    assert graph.stats['components'] == 1 and graph.stats['tree_components'] == 0
+    assert graph.stats['solutions'] == len(problem.getSolutions())
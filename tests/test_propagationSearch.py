@@ -0,0 +1,40 @@
+# test_propagationSearch.py
+
+from constraintPropagation import CompiledPuzzle, propagate
+from propagationSearch import house_bits, iter_solutions, solve_domains
+from searchBudget import SearchBudget
+from tests.puzzles import brute_force, houses_of, small_puzzles
+
+
+def test_search_enumerates_every_solution_once():
+    for (attributes, constraints), num_houses in small_puzzles(satisfiable=False):
+        puzzle = CompiledPuzzle(attributes, constraints, num_houses)
+        stats = {}
+        found = [houses_of(domains) for domains in iter_solutions(puzzle, stats=stats)]
+        assert len(found) == len(set(found))
+        assert set(found) == brute_force(attributes, constraints, num_houses)
+        assert stats.get('branches', 0) >= len(found) - 1
+        first = solve_domains(puzzle)
+        assert (first is None) == (not found) and (first is None or houses_of(first) in found)
+
+
+def test_budget_stops_the_search():
+    (attributes, constraints), num_houses = next(small_puzzles(1))
+    budget = SearchBudget(max_nodes=0)
+    assert solve_domains(CompiledPuzzle(attributes, constraints, num_houses), budget=budget) is None
+    assert budget.expired and budget.best is not None
+
+
+def test_search_from_a_fixpoint_only_reduces_the_queue():
+    for (attributes, constraints), num_houses in small_puzzles(satisfiable=False):
+        puzzle = CompiledPuzzle(attributes, constraints, num_houses)
+        fixpoint = puzzle.initial_domains()
+        if not propagate(puzzle, fixpoint):
+            continue
+        for var, mask in enumerate(fixpoint):
+            for bit in house_bits(mask):
+                domains = list(fixpoint)
+                domains[var] = bit
+                expected = {houses_of(solution) for solution in iter_solutions(puzzle, domains)}
+                found = [houses_of(solution) for solution in iter_solutions(puzzle, domains, queue=[var])]
+                assert len(found) == len(set(found)) and set(found) == expected
@@ -0,0 +1,51 @@
+# test_puzzleAssets.py
+
+import json
+import pytest
+from puzzleAssets import AssetCache, parse_attributes, parse_clues, parse_solution, load_attributes, \
+    load_clues, load_solution, _load_attributes
+
+
+def write(path, data):
+    path.write_text(json.dumps(data))
+
+
+def test_files_are_read_once_until_they_change(tmp_path):
+    cache = AssetCache()
+    path = tmp_path / 'Attributes.JSON'
+    write(path, {'attributes': {'color': ['red', 'blue']}})
+    # Found despite the different case, as the repository's own *.JSON files are
+    lookup = str(tmp_path / 'attributes.json')
+    first = cache.load(lookup, _load_attributes)
+    assert cache.load(lookup, _load_attributes) is first and cache.loads == 1
+    write(path, {'attributes': {'color': ['red', 'blue', 'green']}})
+    assert cache.load(lookup, _load_attributes) == {'color': ['red', 'blue', 'green']} and cache.loads == 2
+    # A broken file raises and is not cached; fixing it is picked up on the next lookup
+    write(path, {'attributes': {'color': ['red', 'red']}})
+    with pytest.raises(ValueError):
+        cache.load(lookup, _load_attributes)
+    write(path, {'attributes': {'color': ['white']}})
+    assert cache.load(lookup, _load_attributes) == {'color': ['white']}
+    path.unlink()
+    with pytest.raises(FileNotFoundError):
+        cache.load(lookup, _load_attributes)
+
+
+def test_validation():
+    with pytest.raises(ValueError):
+        parse_attributes({'attributes': {'color': []}})
+    with pytest.raises(ValueError):
+        parse_clues({'clues': [{'id': 1, 'description': 'a'}, {'id': 1, 'description': 'b'}]})
+    with pytest.raises(ValueError):
+        parse_solution({'original_attributes': [{'color': 'red'}, {'color': 'red'}]})
+    with pytest.raises(ValueError):
+        parse_solution({'original_attributes': [{'color': 'red'}, {'pet': 'dog'}]})
+
+
+def test_game_files_load():
+    attributes = load_attributes()
+    assert load_attributes() is attributes
+    assert len(load_clues()) > 0
+    solution = load_solution()
+    for attr, values in attributes.items():
+        assert sorted(house[attr] for house in solution) == sorted(values)
@@ -0,0 +1,55 @@
+# test_puzzleFormat.py
+
+import pytest
+from puzzleFormat import PuzzleSchema, PuzzleBankWriter, PuzzleBank
+
+ATTRIBUTES = {'color': ['red', 'green', 'blue'], 'pet': ['dog', 'fox', 'zebra']}
+SOLUTION = [{'color': 'green', 'pet': 'fox'}, {'color': 'red', 'pet': 'zebra'}, {'color': 'blue', 'pet': 'dog'}]
+CONSTRAINTS = [
+    {'same_house': [('color', 'red'), ('pet', 'zebra')], 'houses': [2]},
+    {'next_to': [('color', 'green'), ('pet', 'zebra')], 'houses': [1, 2]},
+    {'left_of': [('color', 'red'), ('color', 'blue')], 'houses': [2, 3]},
+    {'in_house': [('pet', 'dog')], 'houses': [3]},
+    {'in_house': [('color', 'green')], 'houses': [1, 2]},
+    {'before': [('pet', 'fox'), ('pet', 'dog')]},
+]
+
+
+def test_record_round_trip():
+    schema = PuzzleSchema(ATTRIBUTES)
+    record = schema.encode(CONSTRAINTS, 3, SOLUTION, (2, 17))
+    assert schema.decode(record) == (CONSTRAINTS, SOLUTION, 3)
+    assert schema.decode_rating(record) == (2, 17)
+    # Without a solution the house count is still the one given, not inferred from the clues
+    assert schema.decode(schema.encode(CONSTRAINTS[:1], 7)) == (CONSTRAINTS[:1], None, 7)
+    assert schema.decode_num_houses(schema.encode([], 4)) == 4
+
+
+def test_clue_with_more_houses_than_the_record_holds_is_rejected():
+    schema = PuzzleSchema(ATTRIBUTES)
+    with pytest.raises(ValueError):
+        schema.encode([{'in_house': [('pet', 'dog')], 'houses': [1, 2, 3]}], 3)
+
+
+def test_house_count_must_match_the_puzzle():
+    schema = PuzzleSchema(ATTRIBUTES)
+    with pytest.raises(ValueError):
+        schema.encode(CONSTRAINTS, 4, SOLUTION)
+    with pytest.raises(ValueError):
+        schema.encode([{'in_house': [('pet', 'dog')], 'houses': [4]}], 3)
+    with pytest.raises(ValueError):
+        schema.encode([], 0)
+
+
+def test_bank_round_trip(tmp_path):
+    path = str(tmp_path / 'bank.zpb')
+    with PuzzleBankWriter(path, ATTRIBUTES) as writer:
+        writer.append(CONSTRAINTS, 3, SOLUTION, (1, 3))
+        writer.append(CONSTRAINTS[:2], 6)
+    with PuzzleBank(path) as bank:
+        assert len(bank) == 2
+        assert bank[0] == (CONSTRAINTS, SOLUTION, 3)
+        assert bank[-1] == (CONSTRAINTS[:2], None, 6)
+        assert bank.num_houses(1) == 6
+        assert bank.rating(0) == (1, 3)
+        assert bank.rating(1) is None
@@ -0,0 +1,83 @@
+# test_puzzleSymmetry.py
+
+import itertools
+import math
+import random
+from backtrackingRandom import ZebraRandomSolver
+from puzzleSymmetry import canonical_form, canonical_key, deduplicate, clue_key, break_symmetries, interchangeable_values
+from tests.puzzles import brute_force, random_puzzle, small_puzzles
+
+
+def relabel(attributes, constraints, mapping):
+    """ Rename values by mapping (attr, value) -> value and shuffle the clue order. """
+    def rename(pair):
+        return (pair[0], mapping[tuple(pair)])
+    renamed = []
+    for constraint in constraints:
+        renamed.append({key: [rename(pair) for pair in value] if key != 'houses' else value
+                        for key, value in constraint.items()})
+    return renamed
+
+
+def random_mapping(attributes, rng):
+    mapping = {}
+    for attr, values in attributes.items():
+        mapping.update(zip(((attr, val) for val in values), rng.sample(values, len(values))))
+    return mapping
+
+
+def same_clues(constraints, others):
+    return sorted(map(clue_key, constraints)) == sorted(map(clue_key, others))
+
+
+def test_relabelings_share_a_form():
+    rng = random.Random(3)
+    for seed in range(30):
+        num_houses = 4 if seed % 4 == 0 else 5
+        attributes, constraints = random_puzzle(num_houses, num_houses - 1, seed % 12, seed, satisfiable=seed % 3 != 0)
+        form = canonical_form(attributes, constraints)
+        assert len(form) == len(constraints)
+        for _ in range(3):
+            relabeled = relabel(attributes, constraints, random_mapping(attributes, rng))
+            rng.shuffle(relabeled)
+            assert canonical_form(attributes, relabeled) == form
+        # The form is a relabeling of the puzzle, so it has as many solutions
+        if num_houses == 4:
+            assert len(brute_force(attributes, form, 4)) == len(brute_force(attributes, constraints, 4))
+
+
+def test_forms_differ_for_puzzles_that_are_not_relabelings():
+    puzzles = [random_puzzle(3, 2, 1 + seed % 4, seed, satisfiable=False) for seed in range(40)]
+    attributes = puzzles[0][0]
+    for (_, first), (_, second) in itertools.combinations(puzzles, 2):
+        isomorphic = any(same_clues(relabel(attributes, first, dict(zip(
+            [(attr, val) for attr, values in attributes.items() for val in values],
+            [val for attr_perm in perms for val in attr_perm]))), second)
+            for perms in itertools.product(*(itertools.permutations(values) for values in attributes.values())))
+        assert (canonical_form(attributes, first) == canonical_form(attributes, second)) == isomorphic
+
+
+def test_deduplicate_without_solving():
+    attributes, constraints = random_puzzle(5, 5, 6, 1)
+    # A contradiction and a puzzle with a vast number of solutions both get a form
+    contradiction = [{'in_house': [('a0', 'v0_0')], 'houses': [1]}, {'in_house': [('a0', 'v0_1')], 'houses': [1]}]
+    relabeled = relabel(attributes, contradiction, random_mapping(attributes, random.Random(0)))
+    puzzles = [constraints, [], contradiction, relabel(attributes, constraints, random_mapping(attributes, random.Random(1))),
+               relabeled, []]
+    assert deduplicate(attributes, puzzles) == [0, 1, 2]
+    assert canonical_key(attributes, []) is not None
+
+
+def test_symmetry_breaking_keeps_one_solution_per_class():
+    for (attributes, constraints), num_houses in small_puzzles(satisfiable=False):
+        solutions = brute_force(attributes, constraints, num_houses)
+        broken = break_symmetries(attributes, constraints)
+        kept = brute_force(attributes, broken, num_houses)
+        assert kept <= solutions and bool(kept) == bool(solutions)
+        # Renaming within each class of interchangeable values maps every solution onto exactly one kept solution
+        classes = interchangeable_values(attributes, constraints)
+        size = 1
+        for attr, members in classes:
+            size *= math.factorial(len(members))
+        assert len(solutions) == size * len(kept)
+        assert ZebraRandomSolver(attributes, constraints, num_houses, break_symmetry=True).count_solutions() == len(kept)
@@ -0,0 +1,142 @@
+# test_satSolver.py
+
+import io
+import itertools
+import satSolver
+from backtrackingRandom import ZebraRandomSolver
+from constraintPropagation import CompiledPuzzle
+from satSolver import CdclSolver, iter_sat_solutions, luby, puzzle_to_dimacs
+from tests.puzzles import brute_force, houses_of, houses_tuple, small_puzzles
+
+
+def parse_dimacs(text):
+    """ Read a DIMACS CNF file written by puzzle_to_dimacs: (variable count, clauses, variable -> (attr, value, house)). """
+    names = {}
+    header = None
+    clauses = []
+    for line in text.splitlines():
+        fields = line.split()
+        if fields[0] == 'c':
+            attr, val = fields[2].split('=')
+            names[int(fields[1])] = (attr, val, int(fields[3].split('=')[1]))
+        elif fields[0] == 'p':
+            assert fields[1] == 'cnf' and header is None
+            header = int(fields[2]), int(fields[3])
+        else:
+            literals = [int(field) for field in fields]
+            assert literals[-1] == 0 and 0 not in literals[:-1]
+            assert all(1 <= abs(lit) <= header[0] for lit in literals[:-1])
+            clauses.append(literals[:-1])
+    assert header is not None and len(clauses) == header[1]
+    return header[0], clauses, names
+
+
+def all_models(num_vars, clauses, project):
+    """ Every model of the clauses, restricted to the variables of project, by blocking each one found. """
+    solver = CdclSolver(num_vars)
+    if not all(solver.add_clause(clause) for clause in clauses):
+        return []
+    models = []
+    while True:
+        model = solver.solve()
+        if not model:
+            return models
+        true = [var for var in project if model[var]]
+        models.append(true)
+        if not solver.add_clause([-var for var in true]):
+            return models
+
+
+def test_dimacs_export_parses_and_has_the_puzzle_solutions():
+    for (attributes, constraints), num_houses in small_puzzles(satisfiable=False):
+        file = io.StringIO()
+        puzzle_to_dimacs(attributes, constraints, file, num_houses)
+        num_vars, clauses, names = parse_dimacs(file.getvalue())
+        order = CompiledPuzzle(attributes, constraints, num_houses).variables
+        assert num_vars == len(names) == len(order) * num_houses
+        found = set()
+        for true in all_models(num_vars, clauses, sorted(names)):
+            house = {(names[var][0], names[var][1]): names[var][2] for var in true}
+            found.add(tuple(house[pair] for pair in order))
+        assert found == brute_force(attributes, constraints, num_houses)
+
+
+def test_sat_enumeration_matches_brute_force():
+    for (attributes, constraints), num_houses in small_puzzles(satisfiable=False):
+        puzzle = CompiledPuzzle(attributes, constraints, num_houses)
+        found = [houses_of(domains) for domains in iter_sat_solutions(puzzle)]
+        assert len(found) == len(set(found))
+        assert set(found) == brute_force(attributes, constraints, num_houses)
+        houses = ZebraRandomSolver(attributes, constraints, num_houses, method='sat').solve()
+        if found:
+            assert houses_tuple(attributes, constraints, num_houses, houses) in found
+        else:
+            assert houses is False
+
+
+def pigeonhole(pigeons, holes):
+    """ Solver loaded with the clauses putting every pigeon in a hole, no two in the same one. """
+    var = {(p, h): p * holes + h + 1 for p in range(pigeons) for h in range(holes)}
+    solver = CdclSolver(pigeons * holes)
+    for p in range(pigeons):
+        solver.add_clause([var[(p, h)] for h in range(holes)])
+    for h in range(holes):
+        for p, q in itertools.combinations(range(pigeons), 2):
+            solver.add_clause([-var[(p, h)], -var[(q, h)]])
+    return solver
+
+
+def test_cdcl_refutes_pigeonhole():
+    # Five pigeons in four holes: only refuted after learning, not by unit propagation alone
+    solver = pigeonhole(5, 4)
+    assert solver.solve() is None
+    assert solver.stats['conflicts'] > 0
+
+
+def test_branching_takes_the_most_active_unassigned_variable():
+    solver = CdclSolver(8)
+    # Conflict analysis bumps variables while they are assigned
+    solver.trail_lim.append(0)
+    for var in range(1, 9):
+        solver._enqueue(var, None)
+    for var, bumps in ((6, 3), (3, 2), (8, 2)):
+        for _ in range(bumps):
+            solver._bump(var)
+    solver._cancel_until(0)
+
+    def picks():
+        order = []
+        lit = solver._pick_branch()
+        while lit:
+            order.append(lit)
+            solver._enqueue(lit, None)
+            lit = solver._pick_branch()
+        return order
+
+    # Equal activities go to the lowest variable, as the first decisions of a fresh solver do
+    assert picks() == [6, 3, 8, 1, 2, 4, 5, 7]
+    # Rescaling the activities rebuilds the heap without losing any variable or reordering the rest
+    solver.trail_lim.append(0)
+    solver.var_inc = 1e100
+    solver._bump(5)
+    solver._bump(5)
+    solver._cancel_until(0)
+    assert picks() == [5, 6, 3, 8, 1, 2, 4, 7]
+
+
+def test_learned_clause_reduction_keeps_answers(monkeypatch):
+    # Reduce after a handful of learned clauses and restart often, so deletion happens on small formulas
+    monkeypatch.setattr(satSolver, 'FIRST_REDUCE', 10)
+    monkeypatch.setattr(satSolver, 'REDUCE_GROWTH', 5)
+    monkeypatch.setattr(satSolver, 'RESTART_BASE', 4)
+    solver = pigeonhole(7, 6)
+    assert solver.solve() is None
+    assert solver.stats['deleted'] > 0
+    for (attributes, constraints), num_houses in small_puzzles(12, satisfiable=False):
+        found = [houses_of(domains) for domains in iter_sat_solutions(CompiledPuzzle(attributes, constraints, num_houses))]
+        assert len(found) == len(set(found))
+        assert set(found) == brute_force(attributes, constraints, num_houses)
+
+
+def test_luby_sequence():
+    assert [luby(i) for i in range(1, 16)] == [1, 1, 2, 1, 1, 2, 4, 1, 1, 2, 1, 1, 2, 4, 8]
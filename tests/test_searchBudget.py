@@ -0,0 +1,63 @@
+# test_searchBudget.py
+
+import random
+import time
+import pytest
+from backTracking import ZebraPuzzleSolver
+from backtrackingRandom import ZebraRandomSolver
+from puzzleAssets import load_attributes, load_clues
+from searchBudget import SearchBudget, BudgetExpired
+from tests.puzzles import brute_force, houses_tuple, random_puzzle
+
+METHODS = ['constraint', 'cbj', 'sat', 'local', 'sweep', 'parallel']
+
+
+def test_budget_counts_nodes_and_keeps_the_best_state():
+    budget = SearchBudget(max_nodes=2)
+    budget.offer(1, 10, lambda: 'first')
+    budget.offer(2, 12, lambda: 'more placed')
+    budget.offer(2, 15, lambda: 'more choices left')
+    budget.tick()
+    budget.tick()
+    with pytest.raises(BudgetExpired):
+        budget.tick()
+    assert budget.expired and budget.best == 'more placed'
+    with pytest.raises(BudgetExpired):
+        SearchBudget(deadline=time.monotonic()).tick()
+
+
+@pytest.mark.parametrize('method', METHODS)
+def test_expired_search_returns_a_partial_assignment(method):
+    # Five attributes and twenty clues: no engine finishes in three nodes (local search starts from a seeded grid)
+    attributes, constraints = random_puzzle(5, 5, 20, 11)
+    random.seed(0)
+    solver = ZebraRandomSolver(attributes, constraints, method=method)
+    houses = solver.solve(max_nodes=3)
+    assert solver.expired
+    assert set(solver.remaining) == set(solver.value_attributes)
+    for number, house in enumerate(houses, 1):
+        for attr, val in house.items():
+            assert solver.value_attributes[val] == attr
+            assert solver.solution[val] == number and solver.remaining[val] == [number]
+    assert len(solver.solution) < len(solver.value_attributes)
+
+
+@pytest.mark.parametrize('method', METHODS)
+def test_sufficient_budget_solves(method):
+    attributes, constraints = random_puzzle(4, 3, 8, 5)
+    solver = ZebraRandomSolver(attributes, constraints, 4, method=method)
+    houses = solver.solve(deadline=time.monotonic() + 60, max_nodes=100000)
+    assert not solver.expired
+    assert houses_tuple(attributes, constraints, 4, houses) in brute_force(attributes, constraints, 4)
+
+
+def test_original_puzzle_partial_assignment():
+    solver = ZebraPuzzleSolver(load_attributes(), load_clues(), presolve=False)
+    houses = solver.solve(max_nodes=3)
+    assert solver.expired
+    for house in houses:
+        number = house['number']
+        for attr, val in house.items():
+            if attr != 'number':
+                assert solver.remaining[f"{attr}_{number}"] == [val]
+    assert solver.solve()[0]['number'] == '1' and not solver.expired
@@ -0,0 +1,82 @@
+# test_searchTrace.py
+
+import random
+from constraint import Problem, BacktrackingSolver
+from backTracking import ZebraPuzzleSolver
+from backtrackingRandom import ZebraRandomSolver
+from puzzleAssets import load_attributes, load_clues
+from searchTrace import SearchTrace, TraceCursor, TracingBacktrackingSolver, ASSIGN, BACKTRACK, PRUNE, SOLUTION, CHECKPOINT_INTERVAL
+from tests.puzzles import random_puzzle
+
+
+def test_tracing_does_not_change_the_search():
+    rng = random.Random(1)
+    for _ in range(50):
+        variables = [f"x{i}" for i in range(rng.randint(2, 6))]
+        trace = SearchTrace({'x': list(range(4))}, num_houses=len(variables))
+        problems = [Problem(BacktrackingSolver()),
+                    Problem(TracingBacktrackingSolver(trace, lambda var, value: (int(var[1:]) + 1, 'x', value)))]
+        scopes = [rng.sample(variables, 2) for _ in range(rng.randint(1, 5))]
+        for problem in problems:
+            problem.addVariables(variables, range(4))
+            for scope in scopes:
+                problem.addConstraint(lambda a, b: a < b, scope)
+        assert problems[1].getSolutions() == problems[0].getSolutions()
+        assert sum(trace.counts().values()) == len(trace)
+
+
+def test_cursor_replays_the_solution():
+    attributes = load_attributes()
+    trace = SearchTrace(attributes)
+    # Without the pre-solve pass the search has to backtrack, giving a long trace
+    solution = ZebraPuzzleSolver(attributes, load_clues(), trace=trace, presolve=False).solve()
+    assert trace.counts()['backtrack'] > 0 and len(trace) > CHECKPOINT_INTERVAL
+    cursor = TraceCursor(trace)
+    cursor.next_solution()
+    assert cursor.current_event()[0] == SOLUTION
+    assert cursor.grid == [{attr: value for attr, value in house.items() if attr != 'number'} for house in solution]
+
+
+def test_seeking_matches_a_linear_replay():
+    # A traced solve lists every solution, so the puzzle is clued tightly enough to have few
+    attributes, constraints = random_puzzle(5, 4, 14, 3)
+    trace = SearchTrace(attributes)
+    ZebraRandomSolver(attributes, constraints, trace=trace, presolve=False).solve()
+    assert len(trace) > 4 * CHECKPOINT_INTERVAL
+    rng = random.Random(0)
+    cursor = TraceCursor(trace)
+    for _ in range(40):
+        position = rng.randint(0, len(trace))
+        cursor.seek(position)
+        replay = TraceCursor(trace)
+        replay.step(position)
+        assert (cursor.grid, cursor.prunes) == (replay.grid, replay.prunes)
+
+
+def test_events_follow_the_assignment_stack():
+    rng = random.Random(2)
+    for _ in range(50):
+        variables = [f"x{i}" for i in range(rng.randint(2, 6))]
+        trace = SearchTrace({'x': list(range(4))}, num_houses=len(variables))
+        problem = Problem(TracingBacktrackingSolver(trace, lambda var, value: (int(var[1:]) + 1, 'x', value)))
+        problem.addVariables(variables, range(4))
+        for _ in range(rng.randint(1, 6)):
+            problem.addConstraint(lambda a, b: a < b, rng.sample(variables, 2))
+        solutions = problem.getSolutions()
+        stack = []
+        found = 0
+        for index in range(len(trace)):
+            op, house, attr, value = trace.event(index)
+            if op == ASSIGN:
+                assert house not in [cell[0] for cell in stack]
+                stack.append((house, value))
+            elif op == BACKTRACK:
+                assert stack.pop() == (house, value)
+            elif op == PRUNE:
+                # Forward checking only prunes values of variables that are not assigned
+                assert house not in [cell[0] for cell in stack]
+            else:
+                assert len(stack) == len(variables)
+                assert {f"x{h - 1}": v for h, v in stack} in solutions
+                found += 1
+        assert found == len(solutions) and stack == []
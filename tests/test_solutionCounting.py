@@ -0,0 +1,59 @@
+# test_solutionCounting.py
+
+from math import factorial
+from backTracking import ZebraPuzzleSolver
+from backtrackingRandom import ZebraRandomSolver
+from constraintPropagation import CompiledPuzzle
+from puzzleAssets import load_attributes, load_clues
+from solutionCounting import count_solutions
+from tests.puzzles import brute_force, random_puzzle, small_puzzles
+
+
+def test_counts_match_brute_force():
+    for (attributes, constraints), num_houses in small_puzzles(satisfiable=False):
+        expected = len(brute_force(attributes, constraints, num_houses))
+        puzzle = CompiledPuzzle(attributes, constraints, num_houses)
+        stats = {}
+        assert count_solutions(puzzle, stats) == expected
+        assert set(stats) == {'nodes', 'cache_hits', 'splits'}
+        # A cache too small to hold anything only costs time
+        assert count_solutions(puzzle, cache_size=0) == expected
+        assert ZebraRandomSolver(attributes, constraints, num_houses).count_solutions() == expected
+
+
+def test_unclued_grid_count():
+    attributes = {'color': ['red', 'green', 'blue', 'white'], 'pet': ['dog', 'cat', 'fox', 'owl'],
+                  'drink': ['tea', 'milk', 'beer', 'water']}
+    assert count_solutions(CompiledPuzzle(attributes, [], 4)) == 24 ** 3
+
+
+def test_original_puzzle_has_one_solution():
+    assert ZebraPuzzleSolver(load_attributes(), load_clues()).count_solutions() == 1
+
+
+def test_clue_free_8x8_grid_is_counted_by_attribute():
+    attributes = {f"attr{i}": [f"v{i}{j}" for j in range(8)] for i in range(8)}
+    stats = {}
+    assert count_solutions(CompiledPuzzle(attributes, [], 8), stats) == factorial(8) ** 8
+    # The eight attributes are counted apart, and equal subproblems only once
+    assert stats['splits'] >= 1 and stats['nodes'] < 5000
+
+
+def test_original_clue_prefixes():
+    counts = [ZebraPuzzleSolver(load_attributes(), load_clues()[:size]).count_solutions() for size in range(1, 9)]
+    # "There are five houses." adds nothing; each of the next three ties two free values together
+    assert counts[:4] == [factorial(5) ** 5 // 5 ** tied for tied in range(4)]
+    # python-constraint lists the same 300672 solutions for the first eight clues (in about 35 s)
+    assert counts[7] == 300672
+
+
+def test_unrelated_clues_multiply():
+    for seed in range(10):
+        first, first_clues = random_puzzle(4, 2, 3, seed, satisfiable=False)
+        second, second_clues = random_puzzle(4, 2, 3, seed + 100, satisfiable=False)
+        rename = {attr: f"other_{attr}" for attr in second}
+        second = {rename[attr]: values for attr, values in second.items()}
+        second_clues = [{kind: [(rename[attr], value) for attr, value in values] if kind != 'houses' else values
+                         for kind, values in clue.items()} for clue in second_clues]
+        combined = count_solutions(CompiledPuzzle({**first, **second}, first_clues + second_clues, 4))
+        assert combined == (len(brute_force(first, first_clues, 4)) * len(brute_force(second, second_clues, 4)))
@@ -0,0 +1,34 @@
+# test_zebra.py
+
+import zebra
+from zebra import ZebraPuzzleSolver, clue_from_constraint
+from puzzleAssets import load_attributes, load_clues
+
+
+def test_solver_builds_from_clues_file():
+    attributes = load_attributes()
+    solver = ZebraPuzzleSolver(attributes, load_clues())
+    # The text clues cannot be checked, so none are indexed
+    assert solver.clues == []
+    assert solver.is_valid_assignment(0, 'color', 'red')
+
+
+def test_constraint_dicts_are_indexed_by_value():
+    attributes = load_attributes()
+    constraints = [{'same_house': [('nationality', 'Englishman'), ('color', 'red')]},
+                   {'in_house': [('nationality', 'Norwegian')], 'houses': [1]}]
+    solver = ZebraPuzzleSolver(attributes, constraints)
+    assert set(solver.clues_by_value) == {('nationality', 'Englishman'), ('color', 'red'), ('nationality', 'Norwegian')}
+    assert not solver.general_clues
+    assert not solver.is_valid_assignment(1, 'nationality', 'Norwegian')
+    assert solver.is_valid_assignment(0, 'nationality', 'Norwegian')
+    solver.houses[0]['color'] = 'red'
+    assert not solver.is_valid_assignment(1, 'nationality', 'Englishman')
+    assert solver.is_valid_assignment(0, 'nationality', 'Englishman')
+
+
+def test_declared_ignores_dict_methods():
+    clue = clue_from_constraint({'next_to': [('pet', 'fox'), ('cigarette', 'Chesterfields')]})
+    assert zebra.declared(clue, 'mentions') == (('pet', 'fox'), ('cigarette', 'Chesterfields'))
+    assert zebra.declared({'id': 1, 'description': 'There are five houses.'}, 'values') is None
+    assert zebra.declared(lambda *args: True, 'mentions') is None
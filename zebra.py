@@ -1,19 +1,79 @@
 import time
 import random
 import json
+import puzzleAssets
+from searchTrace import ASSIGN, BACKTRACK, SOLUTION
+from searchBudget import SearchBudget, BudgetExpired
+from houseGrid import HouseGrid, cell_property
+from constraintPropagation import RELATIONS, UNARY_KINDS, constraint_kind
+def clue_from_constraint(constraint, num_houses=5):
+    """
+    Turn a constraint dictionary ('same_house', 'next_to', 'left_of', 'before', 'in_house') into a clue
+    callable for ZebraPuzzleSolver.
+
+    The callable lists the (attr, value) pairs it mentions in its `mentions` attribute, so the solver
+    only consults it when one of them is assigned.
+    """
+    kind = constraint_kind(constraint)
+    full = (1 << num_houses) - 1
+    if kind in UNARY_KINDS:
+        (attr1, val1), = constraint[kind]
+        allowed = set(constraint['houses'])
+
+        def clue(houses, house_index, attr, value):
+            return (attr, value) != (attr1, val1) or house_index + 1 in allowed
+        clue.mentions = ((attr1, val1),)
+        return clue
+    (attr1, val1), (attr2, val2) = constraint[kind]
+    forward, backward = RELATIONS[kind]
+
+    def clue(houses, house_index, attr, value):
+        if (attr, value) == (attr1, val1):
+            other, relation = houses.where(attr2, val2), forward
+        elif (attr, value) == (attr2, val2):
+            other, relation = houses.where(attr1, val1), backward
+        else:
+            return True
+        # Only checked once the other value is placed
+        return other is None or bool(relation(1 << house_index, full) >> other & 1)
+    clue.mentions = ((attr1, val1), (attr2, val2))
+    return clue
+def declared(clue, name):
+    """ Collection a clue callable declares under `name` ('mentions' or 'attributes'), or None if it declares none. """
+    collection = getattr(clue, name, None)
+    if callable(clue) and isinstance(collection, (list, tuple, set, frozenset)):
+        return collection
+    return None
 class ZebraPuzzleSolver:
-    def __init__(self, attributes, clues, num_houses=5):
+    def __init__(self, attributes, clues, num_houses=5, trace=None):
         """
         Initialize the Zebra Puzzle Solver.
         
         :param attributes: Dictionary of attribute lists (e.g., colors, nationalities, etc.).
-        :param clues: List of clues as constraint functions.
+        :param clues: List of clues as constraint functions clue(houses, house_index, attr, value), or
+                      constraint dictionaries. A function with a `mentions` attribute ((attr, value) pairs)
+                      or an `attributes` attribute (attribute types) is only called for assignments
+                      of those; other functions are called for every assignment. Clues that are
+                      neither (such as the text clues of clues.json) cannot be checked and are skipped.
         :param num_houses: Number of houses (default is 5).
+        :param trace: Optional SearchTrace that records assign/backtrack events during the search.
         """
         self.attributes = {key: random.sample(values, len(values)) for key, values in attributes.items()}
-        self.clues = clues
+        # Constraint dictionaries become declared callables before the clues are indexed
+        self.clues = [clue_from_constraint(clue, num_houses) if isinstance(clue, dict) and constraint_kind(clue)
+                      else clue for clue in clues]
+        skipped = sum(1 for clue in self.clues if not callable(clue))
+        if skipped:
+            print(f"ZebraPuzzleSolver: Skipped {skipped} clues that are neither functions nor constraint dictionaries.")
+            self.clues = [clue for clue in self.clues if callable(clue)]
+        self._index_clues()
         self.num_houses = num_houses
-        self.houses = [{} for _ in range(self.num_houses)]  # Empty houses to start
+        self.houses = HouseGrid(attributes, num_houses)  # Empty houses to start; houses[i] acts as a dictionary
+        self.trace = trace
+        self.budget = None  # SearchBudget of the running search, if any
+        # Set when a search ran out of budget: values still possible for each empty (house number, attribute) cell
+        self.expired = False
+        self.remaining = None
 
     def is_valid_assignment(self, house_index, attr, value):
         """
@@ -21,16 +81,41 @@ class ZebraPuzzleSolver:
         with forward checking based on clues.
         """
         # Ensure value is unique for this attribute across all houses
-        for house in self.houses:
-            if house.get(attr) == value:
-                return False
+        if self.houses.where(attr, value) is not None:
+            return False
 
-        # Check constraints using clues
-        for clue in self.clues:
+        # Check the clues that mention this value or attribute
+        for clue in self._relevant_clues(attr, value):
             if not clue(self.houses, house_index, attr, value):
                 return False
         return True
 
+    def _index_clues(self):
+        """ Index the clues by the values and attributes they declare; undeclared clues apply to everything. """
+        self.clues_by_value = {}
+        self.clues_by_attr = {}
+        self.general_clues = []
+        for position, clue in enumerate(self.clues):
+            mentions = declared(clue, 'mentions')
+            attributes = declared(clue, 'attributes')
+            if mentions is not None:
+                for pair in set(map(tuple, mentions)):
+                    self.clues_by_value.setdefault(pair, []).append(position)
+            elif attributes is not None:
+                for attr in set(attributes):
+                    self.clues_by_attr.setdefault(attr, []).append(position)
+            else:
+                self.general_clues.append(position)
+        self.relevant = {}  # (attr, value) -> clues to check, in their original order
+
+    def _relevant_clues(self, attr, value):
+        clues = self.relevant.get((attr, value))
+        if clues is None:
+            positions = (self.clues_by_value.get((attr, value), []) + self.clues_by_attr.get(attr, [])
+                         + self.general_clues)
+            clues = self.relevant[(attr, value)] = tuple(self.clues[position] for position in sorted(positions))
+        return clues
+
     def backtracking_solve(self, house_index=0):
         """
         Solve the puzzle using backtracking with forward checking.
@@ -38,7 +123,12 @@ class ZebraPuzzleSolver:
         :param house_index: Current house index being processed.
         :return: True if a solution is found, False otherwise.
         """
+        if self.budget is not None:
+            self.budget.offer(self.houses.filled(), 0, self.houses.to_dicts)
+            self.budget.tick()
         if house_index == self.num_houses:
+            if self.trace is not None:
+                self.trace.record(SOLUTION, 0, None, None)
             return True  # All houses filled successfully
 
         # Try assigning each attribute to the current house
@@ -50,54 +140,91 @@ class ZebraPuzzleSolver:
                 if self.is_valid_assignment(house_index, attr, value):
                     # Assign the value and move to the next house
                     self.houses[house_index][attr] = value
+                    if self.trace is not None:
+                        self.trace.record(ASSIGN, house_index + 1, attr, value)
                     if self.backtracking_solve(house_index + 1):
                         return True
                     # Backtrack if assignment didn't lead to solution
                     del self.houses[house_index][attr]
+                    if self.trace is not None:
+                        self.trace.record(BACKTRACK, house_index + 1, attr, value)
 
         return False  # No valid assignment found
 
-    def solve_with_backtracking(self):
+    def solve_with_backtracking(self, deadline=None, max_nodes=None):
         """
         Solve with backtracking and measure time taken.
+
+        With a deadline or node limit the search stops when the budget runs out; self.houses then holds
+        the fullest partial assignment reached, self.expired is set and self.remaining lists the values
+        still valid for every empty cell.
+
+        :param deadline: time.monotonic() value by which to return (default is no deadline).
+        :param max_nodes: Maximum number of search nodes (default is no limit).
         :return: Time taken to solve in seconds.
         """
+        self.expired = False
+        self.remaining = None
+        if deadline is not None or max_nodes is not None:
+            self.budget = SearchBudget(deadline, max_nodes)
         start_time = time.time()
-        success = self.backtracking_solve()
+        try:
+            success = self.backtracking_solve()
+        except BudgetExpired:
+            success = False
+            self._keep_partial(self.budget.best)
+        finally:
+            self.budget = None
         end_time = time.time()
         if success:
             print("Puzzle solved with backtracking.")
+        elif self.expired:
+            print("Search budget ran out; kept the best partial assignment.")
         else:
             print("No solution found with backtracking.")
         return end_time - start_time
 
-    def solve_with_forward_checking(self):
+    def _keep_partial(self, houses):
+        """
+        Load the best partial assignment of an expired search and work out what each empty cell may still hold.
+        """
+        self.houses.load(houses or [])
+        self.expired = True
+        self.remaining = {}
+        for house_index, house in enumerate(self.houses):
+            for attr, values in self.attributes.items():
+                if attr not in house:
+                    self.remaining[(house_index + 1, attr)] = [
+                        value for value in values if self.is_valid_assignment(house_index, attr, value)]
+
+    def solve_with_forward_checking(self, deadline=None, max_nodes=None):
         """
         Solve with forward checking and measure time taken.
+        :param deadline: See solve_with_backtracking.
+        :param max_nodes: See solve_with_backtracking.
         :return: Time taken to solve in seconds.
         """
         # This function can incorporate additional logic if forward-checking differs from backtracking.
-        return self.solve_with_backtracking()
+        return self.solve_with_backtracking(deadline, max_nodes)
 class House:
-    def __init__(self, number = "",color="", nationality="", beverage="", cigarette="", pet=""):
+    __slots__ = ('number', 'grid', 'index')
+    # Each attribute is a cell of the shared HouseGrid; "" when empty
+    color = cell_property('color')
+    nationality = cell_property('nationality')
+    beverage = cell_property('beverage')
+    cigarette = cell_property('cigarette')
+    pet = cell_property('pet')
+    def __init__(self, number, grid):
         self.number = number
-        self.color = color
-        self.nationality = nationality
-        self.beverage = beverage
-        self.cigarette = cigarette
-        self.pet = pet
+        self.grid = grid
+        self.index = int(number) - 1  # Row of this house in the grid
     def update(self, attributes):
-        self.color = attributes.get('color', self.color)
-        self.nationality = attributes.get('nationality', self.nationality)
-        self.beverage = attributes.get('beverage', self.beverage)
-        self.cigarette = attributes.get('cigarette', self.cigarette)
-        self.pet = attributes.get('pet', self.pet)
+        for attr in self.grid.attributes:
+            if attr in attributes:
+                self.grid.set(self.index, attr, attributes[attr])
     def clear(self):
-        self.color = ""
-        self.nationality = ""
-        self.beverage = ""
-        self.cigarette = ""
-        self.pet = ""
+        for attr in self.grid.attributes:
+            self.grid.set(self.index, attr, None)
     def __str__(self):
         return (f"House {self.number}:\n"
                 f"  Color: {self.color}\n"
@@ -132,14 +259,16 @@ def get_original_attr(houses, og_attributes):
         house.update(og_attributes[i])
 def load_clues(clues):
     try:
-        with open(clues, 'r') as file:
-            return json.load(file)['clues']
+        return puzzleAssets.load_clues(clues)
     except FileNotFoundError:
         print(f"Error: {clues} not found.")
         return []
     except json.JSONDecodeError:
         print(f"Error: JSON decoding failed for {clues}.")
         return []
+    except ValueError as e:
+        print(f"Error: {e}")
+        return []
     
 def show_clues():
     """Displays all clues in a readable format."""
@@ -155,10 +284,12 @@ def user_assign_attribute(houses, house_number, attribute_type, attribute_value)
         return
 
     # Clear the attribute value from any other house that has it
-    for h in houses:
-        if getattr(h, attribute_type) == attribute_value:
-            setattr(h, attribute_type, "")
-            print(f"Cleared {attribute_type} '{attribute_value}' from House {h.number}.")
+    other = house.grid.where(attribute_type, attribute_value)
+    while other is not None:
+        h = houses[other]
+        setattr(h, attribute_type, "")
+        print(f"Cleared {attribute_type} '{attribute_value}' from House {h.number}.")
+        other = house.grid.where(attribute_type, attribute_value)
 
     # Assign or reassign the attribute
     setattr(house, attribute_type, attribute_value)
@@ -224,45 +355,40 @@ def game_loop(houses, attributes, og_attributes, solver):
                     print("Unknown command. Use 'set' to assign attributes.")
             except ValueError:
                 print("Invalid input format. Use: set <house_number> <attribute_type> <attribute_value>")
-#Read in JSON file
-with open('attributes.json', 'r') as file:
-    data = json.load(file)
-with open('og_attributes.json', 'r') as og_file:
-    data1 = json.load(og_file)
-
-#Debug print    
-##print(data)
-##print(data1)
-#Set objects
-#attributes = data['attributes']
-og_attributes = data1['original_attributes']
-clues = load_clues('clues.json')
-##Initialize house numbers
-houses = [House(str(i + 1)) for i in range(5)]
-#Access attributes directly
-attributes = {
-    'color': ['red', 'green', 'ivory', 'yellow', 'blue'],
-    'nationality': ['Englishman', 'Spaniard', 'Ukrainian', 'Norwegian', 'Japanese'],
-    'beverage': ['coffee', 'tea', 'milk', 'orange juice', 'water'],
-    'cigarette': ['Old Gold', 'Kools', 'Chesterfields', 'Lucky Strike', 'Parliaments'],
-    'pet': ['dog', 'snails', 'fox', 'horse', 'zebra']
-}
-solver = ZebraPuzzleSolver(attributes, clues)
-get_random_attr(houses, attributes)
+if __name__ == "__main__":
+    #Read in JSON file
+    #Set objects
+    #attributes = puzzleAssets.load_attributes()
+    og_attributes = puzzleAssets.load_solution()
+    clues = load_clues('clues.json')
+    #Access attributes directly
+    attributes = {
+        'color': ['red', 'green', 'ivory', 'yellow', 'blue'],
+        'nationality': ['Englishman', 'Spaniard', 'Ukrainian', 'Norwegian', 'Japanese'],
+        'beverage': ['coffee', 'tea', 'milk', 'orange juice', 'water'],
+        'cigarette': ['Old Gold', 'Kools', 'Chesterfields', 'Lucky Strike', 'Parliaments'],
+        'pet': ['dog', 'snails', 'fox', 'horse', 'zebra']
+    }
+    ##Initialize house numbers; the houses share one grid
+    house_grid = HouseGrid(attributes)
+    houses = [House(str(i + 1), house_grid) for i in range(5)]
+    solver = ZebraPuzzleSolver(attributes, clues)
+    get_random_attr(houses, attributes)
 
-print("Random Puzzle")
-#Call house print function
-house_print(houses)
-#Clear with clear_all function
-clear_all(houses)
+    print("Random Puzzle")
+    #Call house print function
+    house_print(houses)
+    #Clear with clear_all function
+    clear_all(houses)
 
-#Update the original attributes to houses
-get_original_attr(houses, og_attributes)
-print("Original Puzzle")
-# Print the houses with the original attributes
-house_print(houses)
-##Initialize house numbers
-houses = [House(str(i + 1)) for i in range(5)]
-clear_all(houses)
-house_print(houses)
-game_loop(houses, attributes, og_attributes, solver)
+    #Update the original attributes to houses
+    get_original_attr(houses, og_attributes)
+    print("Original Puzzle")
+    # Print the houses with the original attributes
+    house_print(houses)
+    ##Initialize house numbers; the houses share one grid
+    house_grid = HouseGrid(attributes)
+    houses = [House(str(i + 1), house_grid) for i in range(5)]
+    clear_all(houses)
+    house_print(houses)
+    game_loop(houses, attributes, og_attributes, solver)
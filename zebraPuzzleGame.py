@@ -1,12 +1,17 @@
 # zebraPuzzleGame.py
 import pygame
-import json
 import sys
 import random
 import time
 import copy
 from backTracking import ZebraPuzzleSolver  #Deals with original constraints
 from backtrackingRandom import ZebraRandomSolver #Deals with random dynamically generated constraints
+from searchTrace import SearchTrace, TraceCursor, EVENT_NAMES #Records solver searches for replay
+from clueText import translate_constraints, compile_clue_templates #Renders constraint dictionaries as clue sentences
+from constraintPropagation import CompiledPuzzle, constraint_kind #Propagation engine behind hints
+from hintEngine import next_hint #Finds the next forced deduction for the H key
+from houseGrid import HouseGrid, cell_property #Compact grid state of the houses
+from puzzleAssets import load_attributes, load_clues, load_solution, load_image #Cached, validated game files
 from enum import Enum
 # Initialize Pygame
 pygame.init()
@@ -40,26 +45,21 @@ BUTTON_FONT = pygame.font.SysFont('Arial', 30)
 output_message = ""
 message_time = 0  # Timestamp for when the message was last updated
 MESSAGE_DISPLAY_DURATION = 5  # Duration in seconds for the message to stay
-# Load background image
-try:
-    background_image = pygame.image.load('./albert.png').convert()
-    # Scale the image to fit the screen if necessary
-    background_image = pygame.transform.scale(background_image, (WIDTH, HEIGHT))
-except pygame.error as e:
-    print(f"Unable to load background image: {e}")
-    background_image = None  # Proceed without background
+# Background image, loaded once the display mode is set (see load_background)
+background_image = None
 # Load attributes
-with open('attributes.json', 'r') as file:
-    attributes_data = json.load(file)
-    attributes = attributes_data['attributes']
+attributes = load_attributes()
 
 # Load clues from clues.json
 try:
-    with open('clues.json', 'r') as clues_file:
-        clues = json.load(clues_file)['clues']
-except (FileNotFoundError, json.JSONDecodeError) as e:
+    clues = load_clues()
+except (FileNotFoundError, ValueError) as e:
     print("Error loading clues.json:", e)
     clues = []
+
+# Mapping attribute types to their corresponding plural forms in attributes.json
+# Since attributes.json now uses singular keys, adjust accordingly
+attribute_keys = ['color', 'nationality', 'beverage', 'cigarette', 'pet']
 #Create game state
 class GameState(Enum):
     MAIN_MENU = 1
@@ -70,50 +70,51 @@ class GameState(Enum):
     EXIT = 6
 # Define House class
 class House:
-    def __init__(self, number, color="", nationality="", beverage="", cigarette="", pet=""):
+    __slots__ = ('number', 'grid', 'index', 'option_indices')
+
+    # Each attribute is a cell of the shared HouseGrid; "" when empty
+    color = cell_property('color')
+    nationality = cell_property('nationality')
+    beverage = cell_property('beverage')
+    cigarette = cell_property('cigarette')
+    pet = cell_property('pet')
+
+    def __init__(self, number, grid):
         self.number = number
-        self.color = color
-        self.nationality = nationality
-        self.beverage = beverage
-        self.cigarette = cigarette
-        self.pet = pet
+        self.grid = grid
+        self.index = int(number) - 1  # Row of this house in the grid
         # Store indexes for rotating display of options
         self.option_indices = {'color': 0, 'nationality': 0, 'beverage': 0, 'cigarette': 0, 'pet': 0}
 
     def update(self, attributes):
-        self.color = attributes.get('color', self.color)
-        self.nationality = attributes.get('nationality', self.nationality)
-        self.beverage = attributes.get('beverage', self.beverage)
-        self.cigarette = attributes.get('cigarette', self.cigarette)
-        self.pet = attributes.get('pet', self.pet)
+        for attr in self.grid.attributes:
+            if attr in attributes:
+                self.grid.set(self.index, attr, attributes[attr])
 
     def clear(self):
-        self.color = ""
-        self.nationality = ""
-        self.beverage = ""
-        self.cigarette = ""
-        self.pet = ""
+        for attr in self.grid.attributes:
+            self.grid.set(self.index, attr, None)
         # Reset option indices
         self.option_indices = {'color': 0, 'nationality': 0, 'beverage': 0, 'cigarette': 0, 'pet': 0}
 #Solution class
 class Solution:
     def __init__(self):
-        # A list of dictionaries to store the attributes for each house
-        self.houses = [{ 'color': None, 'nationality': None, 'beverage': None, 'cigarette': None, 'pet': None } for _ in range(5)]
+        # Grid of the attributes of each house; indexing it gives a dictionary view of one house
+        self.houses = HouseGrid(attribute_keys)
 
     def set_attributes(self, index, color, nationality, beverage, cigarette, pet):
         # Store attributes for a specific house at the given index
-        self.houses[index] = {
+        self.houses[index].update({
             'color': color,
             'nationality': nationality,
             'beverage': beverage,
             'cigarette': cigarette,
             'pet': pet
-        }
+        })
 
     def get_attributes(self, index):
         # Return the attributes for a specific house at the given index
-        return self.houses[index]
+        return self.houses.house(index)
 
     def display(self):
         # Print the attributes for all houses
@@ -149,17 +150,18 @@ class Button:
                     self.callback()
                     return True
         return False
-# Initialize houses
-houses = [House(str(i + 1)) for i in range(5)]
-
-# Mapping attribute types to their corresponding plural forms in attributes.json
-# Since attributes.json now uses singular keys, adjust accordingly
-attribute_keys = ['color', 'nationality', 'beverage', 'cigarette', 'pet']
+# Initialize houses; they all share one grid
+house_grid = HouseGrid(attributes)
+houses = [House(str(i + 1), house_grid) for i in range(5)]
 
 # Track the current selection for cycling
 current_selection = None
 cycle_mode = False
 
+# Search trace of the last AI solve, replayed with the V key
+last_trace = None
+REPLAY_EVENTS_PER_SECOND = 5  # Default replay speed
+
 # Functions to manage house attributes
 def clear_all(houses):
     for house in houses:
@@ -238,6 +240,78 @@ def generate_constraints_from_solution(solution):
         })
 
     return constraints
+#Order constraints so that neighbouring clues never mention the same house
+def order_constraints_no_consecutive_same_house(constraints, rng=random):
+    """
+    Build a random ordering of constraints in which no two consecutive constraints involve the same house.
+
+    Constraints are grouped by the set of houses they mention and interleaved greedily:
+    each step takes a clue from the group whose busiest house has the most clues left,
+    breaking ties randomly. Only if the greedy pass paints itself into a corner does it
+    backtrack, remembering dead (remaining counts, previous group) states so the search
+    stays exact without ever revisiting them.
+
+    :param constraints: List of constraint dictionaries, each with a 'houses' key listing house numbers involved.
+    :param rng: Random number generator used for tie-breaking and the order within each group.
+    :return: New ordered list of constraints, or None if no such order exists.
+    """
+    total = len(constraints)
+    if total <= 1:
+        return list(constraints)
+
+    # Group clues by the exact set of houses they mention
+    groups = {}
+    for constraint in constraints:
+        groups.setdefault(frozenset(constraint.get('houses', [])), []).append(constraint)
+    keys = list(groups)
+    for key in keys:
+        rng.shuffle(groups[key])
+    counts = [len(groups[key]) for key in keys]
+    compatible = [[a.isdisjoint(b) for b in keys] for a in keys]
+
+    load = {}  # Remaining clues mentioning each house
+    for key, count in zip(keys, counts):
+        for house in key:
+            load[house] = load.get(house, 0) + count
+    # Clues sharing a house can't be neighbours, so any house may appear in at most every other slot
+    if any(count > (total + 1) // 2 for count in load.values()):
+        return None
+
+    def options(prev):
+        candidates = [i for i in range(len(keys)) if counts[i] and (prev is None or compatible[prev][i])]
+        rng.shuffle(candidates)  # Random tie-break; the sort below is stable
+        candidates.sort(key=lambda i: (max((load[h] for h in keys[i]), default=0), counts[i]), reverse=True)
+        return iter(candidates)
+
+    def take(i, step):
+        counts[i] -= step
+        for house in keys[i]:
+            load[house] -= step
+
+    path = []
+    pending = [options(None)]
+    dead = set()
+    while len(path) < total:
+        prev = path[-1] if path else None
+        choice = next(pending[-1], None)
+        if choice is None:
+            # Every continuation from here fails; remember it and undo the last pick
+            dead.add((tuple(counts), prev))
+            pending.pop()
+            if not path:
+                return None
+            take(path.pop(), -1)
+            continue
+        take(choice, 1)
+        if dead and (tuple(counts), choice) in dead:
+            take(choice, -1)
+            continue
+        path.append(choice)
+        pending.append(options(choice))
+
+    picked = {key: iter(groups[key]) for key in keys}
+    return [next(picked[keys[i]]) for i in path]
+
 #Shuffle constraints for uniqueness
 def shuffle_constraints_no_consecutive_same_house(constraints):
     """
@@ -249,27 +323,14 @@ def shuffle_constraints_no_consecutive_same_house(constraints):
     if not constraints:
         return []
 
-    attempts = 0
-    max_attempts = 1000  # Prevent infinite loops
-
-    while attempts < max_attempts:
+    ordered = order_constraints_no_consecutive_same_house(constraints)
+    if ordered is None:
+        print("Warning: No ordering of these constraints avoids consecutive house references.")
         random.shuffle(constraints)
-        conflict = False
+        return constraints  # Return a plain shuffle since the rule can't be met
 
-        for i in range(len(constraints) - 1):
-            houses_current = set(constraints[i].get('houses', []))
-            houses_next = set(constraints[i + 1].get('houses', []))
-            if houses_current & houses_next:
-                conflict = True
-                break  # Found a conflict; reshuffle
-
-        if not conflict:
-            return constraints
-
-        attempts += 1
-
-    print("Warning: Could not shuffle constraints without consecutive house references after multiple attempts.")
-    return constraints  # Return the last shuffled list even if it has conflicts
+    constraints[:] = ordered
+    return constraints
 
 #Get orignal attributes assigned to houses
 def get_original_attr(houses, og_attributes):
@@ -305,7 +366,6 @@ def check_solution(houses, solution):
     return accuracy
 # Main menu function
 def main_menu(screen):
-    clock = pygame.time.Clock()
     buttons = []
     choice = None  # To store the user's choice
 
@@ -352,8 +412,10 @@ def main_menu(screen):
         #Draw buttons via for loop
         for button in buttons:
             button.draw(screen)
-        #Set loop for game events
-        for event in pygame.event.get():
+        pygame.display.flip()
+
+        #Sleep until input arrives; the menu is only redrawn after events (hover, clicks)
+        for event in wait_for_events():
             if event.type == pygame.QUIT:
                 pygame.quit()
                 sys.exit()
@@ -361,14 +423,10 @@ def main_menu(screen):
                 if button.is_clicked(event):
                     break  # If a button was clicked, skip checking others
 
-        pygame.display.flip()
-        clock.tick(60)
-
     return choice
 
 # Submenu function triggered by pressing Escape
 def sub_menu(screen):
-    clock = pygame.time.Clock()
     buttons = []
     choice = None  # To store the user's choice
 
@@ -422,8 +480,9 @@ def sub_menu(screen):
 
         for button in buttons:
             button.draw(screen)
+        pygame.display.flip()
 
-        for event in pygame.event.get():
+        for event in wait_for_events():
             if event.type == pygame.QUIT:
                 pygame.quit()
                 sys.exit()
@@ -436,14 +495,10 @@ def sub_menu(screen):
                 if button.is_clicked(event):
                     break  # If a button was clicked, skip checking others
 
-        pygame.display.flip()
-        clock.tick(60)
-
     return choice
 
 # Controls info function
 def controls_info_screen(screen):
-    clock = pygame.time.Clock()
     running_controls = True
 
     while running_controls:
@@ -464,6 +519,10 @@ def controls_info_screen(screen):
             "  - Press C to view the clues.",
             "A Key:",
             "  - Press A to let the AI solve the puzzle.",
+            "H Key:",
+            "  - Press H for a hint: the next deduction that follows from the clues.",
+            "V Key:",
+            "  - Press V to replay the AI's last search (Space pause, Left/Right seek, Up/Down speed, N solution, End skip).",
             "R Key:",
             "  - Press R to reset the houses.",
             "Escape Key:",
@@ -480,8 +539,9 @@ def controls_info_screen(screen):
         # Instruction to return
         return_text = FONT.render("Press Escape to return to submenu.", True, BLACK)
         screen.blit(return_text, (WIDTH // 2 - return_text.get_width() // 2, HEIGHT - 100))
+        pygame.display.flip()
 
-        for event in pygame.event.get():
+        for event in wait_for_events():
             if event.type == pygame.QUIT:
                 pygame.quit()
                 sys.exit()
@@ -490,9 +550,6 @@ def controls_info_screen(screen):
                     running_controls = False
                     return 'unpause'
 
-        pygame.display.flip()
-        clock.tick(60)
-
     return 'sub_menu'
 def show_clues(screen, clues_to_display):
     """
@@ -501,7 +558,6 @@ def show_clues(screen, clues_to_display):
     :param screen: Pygame screen object.
     :param clues_to_display: List of clue strings to display.
     """
-    clock = pygame.time.Clock()
     running_clue_menu = True
     back_button = Button("Back to Game", WIDTH//2 - 100, HEIGHT - 150, 200, 50, lambda: None)  # Callback handled below
     
@@ -533,8 +589,9 @@ def show_clues(screen, clues_to_display):
 
         # Draw the Back button
         back_button.draw(screen)
+        pygame.display.flip()
 
-        for event in pygame.event.get():
+        for event in wait_for_events():
             if event.type == pygame.QUIT:
                 pygame.quit()
                 sys.exit()
@@ -550,9 +607,6 @@ def show_clues(screen, clues_to_display):
                 if event.key == pygame.K_DOWN:
                     scroll_y = min(scroll_y + scroll_speed, max_scroll)
 
-        pygame.display.flip()
-        clock.tick(60)
-
 def wrap_text(text, font, max_width):
     """
     Wraps text to fit within a specified width.
@@ -576,161 +630,31 @@ def wrap_text(text, font, max_width):
     return lines
 
 
+def wait_for_events(timeout=None):
+    """
+    Block until input arrives instead of polling, so an idle screen costs no CPU.
+
+    :param timeout: Seconds to wait at most, so screens with timers can wake for them (default is no limit).
+    :return: List of every pending event; empty if the timeout passed first.
+    """
+    if timeout is None:
+        event = pygame.event.wait()
+    else:
+        event = pygame.event.wait(max(1, int(timeout * 1000)))  # A timeout of 0 would wait forever
+    if event.type == pygame.NOEVENT:
+        return []
+    return [event] + pygame.event.get()
+
+
 def wait_for_key():
     waiting = True
     while waiting:
-        for event in pygame.event.get():
+        for event in wait_for_events():
             if event.type == pygame.KEYDOWN or event.type == pygame.MOUSEBUTTONDOWN:
                 waiting = False
             elif event.type == pygame.QUIT:
                 pygame.quit()
                 sys.exit()
-# Define the role of each attribute type
-ATTRIBUTE_ROLES = {
-    'color': 'house',
-    'nationality': 'person',
-    'beverage': 'drink',
-    'cigarette': 'smoker',
-    'pet': 'pet'
-}
-#Translate contraints into clues 
-def translate_constraints(constraints):
-    """
-    Translates a list of constraint dictionaries into readable English sentences.
-
-    :param constraints: List of constraint dictionaries.
-    :return: List of readable English sentences.
-    """
-    # Helper functions
-    def describe_person(nationality):
-        #Returns a descriptive phrase for a person based on nationality.
-        return f"The {nationality} person"
-
-    def describe_house(color):
-        #Returns a descriptive phrase for a house based on its color.
-        return f"the {color.lower()} house"
-
-    def describe_drink(beverage):
-        #Returns the beverage in lowercase.
-        return f"{beverage.lower()}"
-
-    def describe_smoker(cigarette):
-        #Returns a descriptive phrase for a smoker based on the cigarette brand.
-        return f"{cigarette} smoker"
-
-    def describe_pet(pet):
-        #Returns a descriptive phrase for a pet with the correct article.
-        return f"a {pet.lower()}"
-
-    def construct_same_house_sentence(attr1, val1, attr2, val2):
-        #Constructs a sentence for 'same_house' constraints based on attribute roles.
-        role1 = ATTRIBUTE_ROLES.get(attr1)
-        role2 = ATTRIBUTE_ROLES.get(attr2)
-        
-        if role1 == 'person' and role2 == 'house':
-            return f"{describe_person(val1)} lives in {describe_house(val2)}."
-        elif role2 == 'person' and role1 == 'house':
-            return f"{describe_person(val2)} lives in {describe_house(val1)}."
-        elif role1 == 'smoker' and role2 == 'pet':
-            return f"The {describe_smoker(val1)} has {describe_pet(val2)}."
-        elif role2 == 'smoker' and role1 == 'pet':
-            return f"The {describe_smoker(val2)} has {describe_pet(val1)}."
-        elif role1 == 'person' and role2 == 'drink':
-            return f"{describe_person(val1)} drinks {describe_drink(val2)}."
-        elif role2 == 'person' and role1 == 'drink':
-            return f"{describe_person(val2)} drinks {describe_drink(val1)}."
-        elif role1 == 'smoker' and role2 == 'drink':
-            return f"The {describe_smoker(val1)} drinks {describe_drink(val2)}."
-        elif role2 == 'smoker' and role1 == 'drink':
-            return f"The {describe_smoker(val2)} drinks {describe_drink(val1)}."
-        elif role1 == 'drink' and role2 == 'house':
-            return f"{describe_drink(val1).capitalize()} is drunk in {describe_house(val2)}."
-        elif role2 == 'drink' and role1 == 'house':
-            return f"{describe_drink(val2).capitalize()} is drunk in {describe_house(val1)}."
-        elif role1 == 'person' and role2 == 'pet':
-            return f"{describe_person(val1)} has {describe_pet(val2)}."
-        elif role2 == 'person' and role1 == 'pet':
-            return f"{describe_person(val2)} has {describe_pet(val1)}."
-        elif role1 == 'person' and role2 == 'smoker':
-            return f"{describe_person(val1)} is a {describe_smoker(val2)}."
-        elif role2 == 'person' and role1 == 'smoker':
-            return f"{describe_person(val2)} is a {describe_smoker(val1)}."
-        elif role1 == 'pet' and role2 == 'house':
-            return f"The owner with {describe_pet(val1)} is in {describe_house(val2)}."
-        elif role2 == 'pet' and role1 == 'house':
-            return f"The owner with {describe_pet(val2)} is in {describe_house(val1)}."
-        elif role1 == 'smoker' and role2 == 'house':
-            return f"The {describe_smoker(val1)} is in {describe_house(val2)}."
-        elif role2 == 'smoker' and role1 == 'house':
-            return f"The {describe_smoker(val2)} is in {describe_house(val1)}."
-        elif role1 == 'beverage' and role2 == 'pet':
-            return f"The house with {describe_pet(val2)} enjoys {describe_drink(val1)}."
-        elif role2 == 'beverage' and role1 == 'pet':
-            return f"The house with {describe_pet(val1)} enjoys {describe_drink(val2)}."
-        else:
-            return f"The {val1.lower()} is in the same house as the {val2.lower()}."
-
-    def construct_left_of_sentence(attr1, val1, attr2, val2):
-        """Constructs a sentence for 'left_of' constraints based on attribute roles."""
-        role1 = ATTRIBUTE_ROLES.get(attr1)
-        role2 = ATTRIBUTE_ROLES.get(attr2)
-        if role1 == 'house' and role2 == 'house':
-            return f"{describe_house(val1)} is immediately to the left of {describe_house(val2)}."
-        else:
-            return f"The {val1.lower()} {attr1} is immediately to the left of the {val2.lower()} {attr2}."
-
-    def construct_next_to_sentence(attr1, val1, attr2, val2):
-        """Constructs a sentence for 'next_to' constraints based on attribute roles."""
-        role1 = ATTRIBUTE_ROLES.get(attr1)
-        role2 = ATTRIBUTE_ROLES.get(attr2)
-        
-        if role1 == 'smoker' and role2 == 'pet':
-            return f"The {describe_smoker(val1)} is next to the house with {describe_pet(val2)}."
-        elif role2 == 'smoker' and role1 == 'pet':
-            return f"The {describe_smoker(val2)} is next to the house with {describe_pet(val1)}."
-        elif role1 == 'person' and role2 == 'pet':
-            return f"The {val1} person is next to the house with {describe_pet(val2)}."
-        elif role2 == 'person' and role1 == 'pet':
-            return f"The {val2} person is next to the house with {describe_pet(val1)}."
-        else:
-            return f"The {val1.lower()} {attr1} is next to the {val2.lower()} {attr2}."
-
-    translated = []
-    previous_houses = set()  # Track houses referenced in the previous clue
-
-    for constraint in constraints:
-        if 'same_house' in constraint:
-            (attr1, val1), (attr2, val2) = constraint['same_house']
-            sentence = construct_same_house_sentence(attr1, val1, attr2, val2)
-            current_houses = set(constraint.get('houses', []))
-        elif 'left_of' in constraint:
-            (attr1, val1), (attr2, val2) = constraint['left_of']
-            sentence = construct_left_of_sentence(attr1, val1, attr2, val2)
-            current_houses = set(constraint.get('houses', []))
-        elif 'next_to' in constraint:
-            (attr1, val1), (attr2, val2) = constraint['next_to']
-            sentence = construct_next_to_sentence(attr1, val1, attr2, val2)
-            current_houses = set(constraint.get('houses', []))
-        else:
-            continue  # Handle other constraint types if any
-        
-        # Check if current houses overlap with previous houses
-        if current_houses & previous_houses:
-            # If overlap exists, skip adding this clue to avoid consecutive mentions
-            continue
-        
-        if sentence not in translated:
-            translated.append(sentence)
-            previous_houses = current_houses  # Update previous houses
-        else:
-            # If the sentence is already in translated, skip to avoid duplicates
-            continue
-
-    return translated
-
-
-
-
 # Draw grid and houses
 def draw_grid(screen):
     # Drawing the grid with margins for space around it
@@ -769,18 +693,35 @@ def draw_houses(screen, houses):
             text_x = GRID_MARGIN_LEFT + col * CELL_WIDTH + (CELL_WIDTH - text_surface.get_width()) // 2
             text_y = GRID_MARGIN_TOP + row * CELL_HEIGHT + (CELL_HEIGHT - text_surface.get_height()) // 2
             screen.blit(text_surface, (text_x, text_y))
+#Load (or reuse the cached) background image scaled to the screen; needs the display mode to be set
+def load_background():
+    global background_image
+    try:
+        background_image = load_image('albert.png', (WIDTH, HEIGHT))
+    except (FileNotFoundError, pygame.error) as e:
+        print(f"Unable to load background image: {e}")
+        background_image = None  # Proceed without background
 #Update the output box below(think of as print to console)
 def update_output_box(screen, message):
     global output_message, message_time
     output_message = message  # Update the global message variable
     message_time = time.time()  # Set the current time as the last update time
+#Seconds until the output box message expires, or None if there is nothing to clear
+def output_box_timeout():
+    if not output_message:
+        return None
+    return max(0, message_time + MESSAGE_DISPLAY_DURATION - time.time())
+#True once the output box message should be cleared
+def output_expired(current_time=None):
+    current_time = time.time() if current_time is None else current_time
+    return bool(output_message) and current_time - message_time > MESSAGE_DISPLAY_DURATION
 #Draw the output box
 def draw_output_box(screen):
     global output_message
     current_time = time.time()
 
     # Check if the duration for the message display has expired
-    if current_time - message_time > MESSAGE_DISPLAY_DURATION:
+    if output_expired(current_time):
         output_message = ""  # Clear the message after the delay
 
     # Draw the output box area below the grid
@@ -790,9 +731,12 @@ def draw_output_box(screen):
     pygame.draw.rect(screen, WHITE, output_box_rect)  # Clear the output box area
     pygame.draw.rect(screen, BLACK, output_box_rect, 2)  # Draw border
 
-    # Render and display the current message
-    text_surface = FONT.render(output_message, True, BLACK)
-    screen.blit(text_surface, (10, HEIGHT - OUTPUT_BOX_HEIGHT + 10))
+    # Render and display the current message, wrapped to the width of the box
+    y_offset = HEIGHT - OUTPUT_BOX_HEIGHT + 10
+    for line in wrap_text(output_message, FONT, WIDTH - 20):
+        text_surface = FONT.render(line, True, BLACK)
+        screen.blit(text_surface, (10, y_offset))
+        y_offset += FONT_SIZE + 5
 
 # Handle attribute assignments with rotating options
 def handle_click(pos, houses, attributes, screen):
@@ -840,7 +784,8 @@ def finalize_selection(screen):
     if current_selection:
         house, attr_type, _ = current_selection
         selected_value = getattr(house, attr_type)
-        duplicate_house = next((h for h in houses if h is not house and getattr(h, attr_type) == selected_value), None)
+        duplicate_index = house.grid.where(attr_type, selected_value, exclude=house.index)
+        duplicate_house = houses[duplicate_index] if duplicate_index is not None else None
         if duplicate_house:
             response = prompt_clear_or_cancel(screen, selected_value)
             if response == "clear":
@@ -869,7 +814,7 @@ def prompt_clear_or_cancel(screen, selected_value):
 
     waiting = True
     while waiting:
-        for event in pygame.event.get():
+        for event in wait_for_events():
             if event.type == pygame.KEYDOWN:
                 if event.key == pygame.K_c:
                     return "clear"
@@ -879,35 +824,115 @@ def prompt_clear_or_cancel(screen, selected_value):
                 pygame.quit()
                 sys.exit()
 
-# Draw solution visualization (optional). This function displays the solution given by the backtracking w/forward checking heuristic in the game's puzzle
-def visualize_solution(screen, houses, solver):
-    def backtrack_visual(house_index=0):
-        if house_index == 5:
-            return True
-
-        for attribute in solver.attributes:
-            for value in solver.attributes[attribute]:
-                if solver.is_valid_assignment(house_index, attribute, value):
-                    houses[house_index].__dict__[attribute] = value
-                    solver.houses[house_index][attribute] = value
-
-                    # Draw updated houses
-                    screen.fill(WHITE)
-                    draw_grid(screen)
-                    draw_houses(screen, houses)
-                    pygame.display.flip()
-                    pygame.time.delay(200)  # Delay to visualize solving
+# Draw solution visualization (optional). Replays the search trace recorded during the last AI solve on the game's grid
+def visualize_solution(screen, houses, trace, events_per_second=REPLAY_EVENTS_PER_SECOND):
+    """
+    Replay a recorded solver search on the grid.
 
-                    if backtrack_visual(house_index + 1):
-                        return True
+    The solve has already finished at full speed; this only steps through its trace.
+    Space pauses/resumes, Left/Right seek one event (ten with Shift), Up/Down change
+    the speed, Home restarts, N jumps to the next solution found, End skips to the
+    final state and Escape returns to the game with the grid as it was before the replay.
 
-                    # Undo the assignment if it leads to a dead end
-                    houses[house_index].__dict__[attribute] = None
-                    solver.houses[house_index][attribute] = None
+    :param screen: Pygame screen object.
+    :param houses: List of house objects to display the replayed cells in.
+    :param trace: SearchTrace recorded by a solver.
+    :param events_per_second: Initial replay speed.
+    """
+    clock = pygame.time.Clock()
+    cursor = TraceCursor(trace)
+    speed = events_per_second
+    playing = True
+    position = 0.0  # Fractional replay position so slow speeds still advance
+    redraw = True
+    saved = houses_to_grid(houses)
+
+    while True:
+        # While playing, wake for the next replay step (at most 60 times a second); otherwise sleep until input
+        timeout = max(1 / speed, 1 / 60) if playing and not cursor.at_end() else None
+        for event in wait_for_events(timeout):
+            if event.type == pygame.QUIT:
+                pygame.quit()
+                sys.exit()
+            if event.type == pygame.KEYDOWN:
+                step = 10 if event.mod & pygame.KMOD_SHIFT else 1
+                if event.key == pygame.K_ESCAPE:
+                    for house, cells in zip(houses, saved):
+                        house.clear()
+                        house.update(cells)
+                    return
+                elif event.key == pygame.K_SPACE:
+                    playing = not playing
+                elif event.key == pygame.K_RIGHT:
+                    position = cursor.step(step)
+                elif event.key == pygame.K_LEFT:
+                    position = cursor.step(-step)
+                elif event.key == pygame.K_UP:
+                    speed = min(speed * 2, 10000)
+                elif event.key == pygame.K_DOWN:
+                    speed = max(speed / 2, 0.5)
+                elif event.key == pygame.K_HOME:
+                    position = cursor.seek(0)
+                elif event.key == pygame.K_n:
+                    position = cursor.next_solution()
+                elif event.key == pygame.K_END:
+                    position = cursor.skip_to_end()
+                redraw = True
+
+        elapsed = clock.tick() / 1000
+        if playing and not cursor.at_end():
+            position += elapsed * speed
+            if int(position) != cursor.position:
+                cursor.seek(int(position))
+                redraw = True
+
+        if redraw:
+            for house, cells in zip(houses, cursor.grid):
+                house.clear()
+                house.update(cells)
+            current = cursor.current_event()
+            if current is None:
+                description = "start"
+            elif current[2] is None:
+                description = EVENT_NAMES[current[0]]
+            else:
+                description = f"{EVENT_NAMES[current[0]]} {current[3]} ({current[2]}) in house {current[1]}"
+            state = "playing" if playing and not cursor.at_end() else "paused"
+            status = f"Replay {cursor.position}/{len(cursor)} [{state}, {speed:g} ev/s, {cursor.prunes} pruned]: {description}"
 
-        return False
+            screen.fill(WHITE)
+            draw_grid(screen)
+            draw_houses(screen, houses)
+            output_box_rect = pygame.Rect(0, HEIGHT - OUTPUT_BOX_HEIGHT, WIDTH, OUTPUT_BOX_HEIGHT)
+            pygame.draw.rect(screen, BLACK, output_box_rect, 2)
+            screen.blit(FONT.render(status, True, BLACK), (10, HEIGHT - OUTPUT_BOX_HEIGHT + 10))
+            pygame.display.flip()
+            redraw = False
+#Convert house objects to the house dictionaries used by the solvers and the hint engine
+def houses_to_grid(houses):
+    return [house.grid.house(house.index) for house in houses]
+
+#Describe a constraint dictionary as clue text for the output box
+def describe_constraint(constraint):
+    if 'clue_id' in constraint:
+        # Original puzzle constraints point back to the clue they were parsed from
+        return next((clue['description'] for clue in clues if clue['id'] == constraint['clue_id']), "")
+    kind = constraint_kind(constraint)
+    if kind in ('same_house', 'next_to', 'left_of'):
+        pair1, pair2 = constraint[kind]
+        return compile_clue_templates().render(kind, tuple(pair1), tuple(pair2))
+    return str(constraint)
+
+#Show the next forced deduction for the current grid in the output box
+def show_hint(screen, houses, puzzle):
+    hint = next_hint(puzzle, houses_to_grid(houses))
+    message = f"Hint: {hint}"
+    if hint.constraints:
+        message += " Because: " + " ".join(describe_constraint(c) for c in hint.constraints)
+    if hint.kind in ('place', 'exclude') and hint.cells:
+        message += " (using your entries)"
+    update_output_box(screen, message)
 
-    backtrack_visual()
 #Solver test for randomly assigned attributes
 def run_solver_test(screen, houses, solver):
     """
@@ -933,12 +958,13 @@ def run_solver_test(screen, houses, solver):
         update_output_box(screen, "No solution found by the solver.")
 
 def main():
-    global current_selection, cycle_mode #sets current selection between options
+    global current_selection, cycle_mode, last_trace #sets current selection between options
     game_state = GameState.MAIN_MENU  # Initialize game state
     screen = pygame.display.set_mode((WIDTH, HEIGHT)) #game screen
     pygame.display.set_caption("Zebra Puzzle")
-    clock = pygame.time.Clock()
+    load_background()
     running = True #flag for game running
+    redraw = True #gameplay screen is only redrawn after input or when the output box expires
     random_solution = None #store a blank random solution
 
 
@@ -949,12 +975,12 @@ def main():
             if choice == 'original':
                 use_original = True
                 try:
-                    with open('og_attributes.json', 'r') as og_file:
-                        og_attributes = json.load(og_file)['original_attributes']
+                    og_attributes = load_solution()
                     #get_original_attr(houses, og_attributes)
-                except (FileNotFoundError, json.JSONDecodeError) as e:
+                except (FileNotFoundError, ValueError) as e:
                     update_output_box(screen, "Original attributes not found or invalid.")
                     print("Error loading og_attributes.json:", e)
+                hint_puzzle = CompiledPuzzle(attributes, ZebraPuzzleSolver(attributes, clues).constraints)
                 game_start_time = time.time()  # Set the start time
                 game_state = GameState.GAMEPLAY
             elif choice == 'random':
@@ -968,6 +994,7 @@ def main():
                 print("\nGenerated Constraints:")
                 for constraint in generated_constraints:
                     print(constraint)
+                hint_puzzle = CompiledPuzzle(attributes, generated_constraints)
                 update_output_box(screen, "Using randomly assigned attributes.")
                 game_start_time = time.time()  # Set the start time
                 game_state = GameState.GAMEPLAY
@@ -975,15 +1002,20 @@ def main():
                 game_state = GameState.EXIT
 
         elif game_state == GameState.GAMEPLAY:
-            # Blit the background image first
-            if background_image:
-                screen.blit(background_image, (0, 0))
-            else:
-                screen.fill(WHITE)  # Fallback to white background if image isn't loaded
-            draw_grid(screen)
-            draw_houses(screen, houses)
-            draw_output_box(screen)
-            for event in pygame.event.get():
+            if redraw:
+                # Blit the background image first
+                if background_image:
+                    screen.blit(background_image, (0, 0))
+                else:
+                    screen.fill(WHITE)  # Fallback to white background if image isn't loaded
+                draw_grid(screen)
+                draw_houses(screen, houses)
+                draw_output_box(screen)
+                pygame.display.flip()
+            # Sleep until input or until the output box message is due to be cleared
+            events = wait_for_events(output_box_timeout())
+            redraw = bool(events) or output_expired()
+            for event in events:
                 if event.type == pygame.QUIT:
                     running = False
                     pygame.quit()
@@ -1006,8 +1038,7 @@ def main():
                     elif event.key == pygame.K_s:
                         accuracy = 0
                         try:
-                            with open('og_attributes.json', 'r') as og_file:
-                                og_attributes = json.load(og_file)['original_attributes']
+                            og_attributes = load_solution()  # Cached; only re-read if the file changed
                             if use_original:
                                 accuracy = check_solution(houses, og_attributes)
                                 update_output_box(screen, f"You are {accuracy:.2f}% accurate.")
@@ -1021,17 +1052,18 @@ def main():
                                     update_output_box(screen, "Congratulations! You've solved the puzzle correctly!")
                                 else:
                                     update_output_box(screen, f"You are {accuracy:.2f}% accurate.")
-                        except (FileNotFoundError, json.JSONDecodeError):
+                        except (FileNotFoundError, ValueError):
                             update_output_box(screen, "Original attributes not found or invalid.")
                     elif event.key == pygame.K_a:  # Press 'a' to solve the puzzle
                         print("AI solving puzzle now ...")
+                        last_trace = SearchTrace(attributes)
                         
                         if use_original:
                             # Solve using the original attributes
-                            solver = ZebraPuzzleSolver(attributes, clues, debug=True)
+                            solver = ZebraPuzzleSolver(attributes, clues, debug=True, trace=last_trace)
                         else:
                             # Solve using the randomly assigned attributes
-                            solver = ZebraRandomSolver(attributes, constraints=generated_constraints)
+                            solver = ZebraRandomSolver(attributes, constraints=generated_constraints, trace=last_trace)
 
                         # Run the solver and display the result
                         start_solver = time.time()
@@ -1051,14 +1083,21 @@ def main():
                         else:
                             update_output_box(screen, f"No solution found. Solver time: {solver_time:.9f}s. Total time elapsed: {total_time_elapsed:.9f}s.")
 
+                    elif event.key == pygame.K_h and not cycle_mode:
+                        # Offer the next deduction that follows from the clues
+                        show_hint(screen, houses, hint_puzzle)
+                    elif event.key == pygame.K_v:
+                        # Replay the recorded search of the last AI solve
+                        if last_trace is not None and len(last_trace):
+                            visualize_solution(screen, houses, last_trace)
+                        else:
+                            update_output_box(screen, "Press A to solve first; there is no search to replay.")
                     elif event.key == pygame.K_r:
                         update_output_box(screen, "Houses reset!")
                         clear_all(houses)
                     elif event.key ==pygame.K_ESCAPE:
                         # Trigger the submenu when Escape is pressed
                         game_state = GameState.SUBMENU
-            pygame.display.flip()
-            clock.tick(60)
         elif game_state == GameState.SUBMENU:
             submenu_choice = sub_menu(screen)
             if submenu_choice == 'main_menu':